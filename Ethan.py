@@ -1,84 +1,439 @@
-import os, re
+import argparse, contextlib, copy, functools, glob, hashlib, io, mmap, os, shutil, subprocess, sys, threading, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from cache import Cache, CACHE_DIR, CACHE_SIZE
+from codegen import CGenerator, Transpiler
+from languages import PACKS, DEFAULT
+import optimizer
+
+VERSION = '0.1'
+C_COMPILER = os.environ.get('CC', 'gcc')
+OPT_LEVELS = (0, 2, 3)
+MMAP_THRESHOLD = 4 * 1024 * 1024
+# file headers of the languages, and the language each one selects
+HEADERS = [(header.encode('utf8'), name) for name, pack in PACKS.items() for header in pack['headers']]
+# names of unused variables listed in the optimizer's report
+UNUSED_SHOWN = 10
+
+_fingerprint = None
+
+def engine_fingerprint():
+    # hash of the transpiler's own sources, so cached output is dropped whenever they change
+    global _fingerprint
+    if _fingerprint is None:
+        h = hashlib.sha256()
+        for fn in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*.py'))):
+            with open(fn, 'rb') as f: h.update(f.read())
+        _fingerprint = h.hexdigest()
+    return _fingerprint
 
 class Ethan:
-    def __init__(self, fn):
+    def __init__(self, fn, opt_level=2, cache=None, optimize=True, stdout_buffer=None, fast_input=False, counters=False, incremental=None, profile=False):
         self.file_name = fn
         self.only_file_name = self.file_name.split("/")[-1].replace(".ethan", '')
         self.extra_paths = "/".join(self.file_name.split("/")[:-1])
         if self.extra_paths: self.extra_paths += '/'
         self.file_c = self.only_file_name + '.c'
-        self.file_exe = self.only_file_name + '.exe'
-        self.lang = self.dt_language()
-        self.script = self.read()
+        self.file_exe = self.only_file_name + ('.exe' if os.name == 'nt' else '')
+        self.opt_level = opt_level
+        self.cache = cache
+        self.optimize = optimize
+        self.stdout_buffer = stdout_buffer
+        self.fast_input = fast_input
+        # the JSON file the program's counters are written to, if it counts
+        self.counts_file = os.path.abspath(self.extra_paths + self.only_file_name + '.counts.json') if counters else None
+        # an incremental.Incremental holding the last version of this file, if any
+        self.incremental = incremental
+        # the Program the last C was written from, optimized unless turned off
+        self.program = None
+        self.build_time = None
+        self.run_time = None
+        # a profiling.Profile the stages are recorded in, with profile; 'memory' traces the
+        # memory they allocate too
+        self.profile = None
+        if profile:
+            import profiling
+            self.profile = profiling.Profile(fn, memory=profile == 'memory')
+        with self.stage('load') as _counts:
+            self.lang, self.script = self.load()
+            if self.profile and self.script is not None:
+                _counts['chars'] = len(self.script)
+                _counts['lines'] = self.script.count('\n') + 1
 
-    def dt_language(self):
-        try:
-            with open(self.file_name, 'r', encoding='utf8') as _file: #, encoding='uft-8'
-                _1stline = _file.readline()
-                _file.close()
-                if re.match('#!English',_1stline) or re.match('#!english',_1stline): return 'en'
-                elif re.match('#!বাংলা',_1stline): return 'bn'
-                else: return 'en'
-        except Exception as e:
-            print("Error: Cann't read this file.\n\t" + str(e))
-            return None
+    def stage(self, name):
+        # times the stage in a with block when profiling; the block adds its counts to the
+        # dict it gets
+        if self.profile is None: return contextlib.nullcontext({})
+        return self.profile.stage(name)
+
+    def write_profile(self):
+        # prints the profile and writes it as a Chrome trace next to the C file
+        if self.profile is None: return
+        self.profile.report()
+        _path = self.extra_paths + self.only_file_name + '.trace.json'
+        if self.profile.write(_path): print("Profile written to " + _path)
 
-    def read(self):
+    def dt_language(self, _data):
+        # the keyword pack the engine reads the file with
+        for _header, _lang in HEADERS:
+            if _data.startswith(_header): return _lang
+        return DEFAULT
+
+    def load(self):
+        # reads the file once, returns its language and its text
         try:
-            with open(self.file_name, 'r', encoding='utf8') as _file: #, encoding='uft-8'
-                _script = _file.read()
-                _file.close()
-                return _script
+            with open(self.file_name, 'rb') as _file:
+                if os.fstat(_file.fileno()).st_size < MMAP_THRESHOLD:
+                    _data = _file.read()
+                    _lang = self.dt_language(_data)
+                    _script = _data.decode('utf8')
+                else:
+                    # big files are decoded straight out of the page cache
+                    with mmap.mmap(_file.fileno(), 0, access=mmap.ACCESS_READ) as _data:
+                        _lang = self.dt_language(_data[:64])
+                        _script = str(_data, 'utf8')
         except Exception as e:
             print("Error: Cann't read this file.\n\t" + str(e))
-            return None
+            return None, None
+        # same newlines as reading in text mode
+        if '\r' in _script: _script = _script.replace('\r\n', '\n').replace('\r', '\n')
+        return _lang, _script
 
     def execute(self):
-        if self.lang == 'en':
-            self.exe_en()
-        elif self.lang == 'bn':
-            self.exe_bn()
+        # transpiles the source into self.file_c, returns True on success
+        if self.lang not in PACKS: return False
+        if self.cache is not None:
+            _key = self.source_key()
+            if self.cache.fetch(_key, '.c', self.extra_paths + self.file_c):
+                print("Using cached " + self.file_c)
+                return True
+
+        _ok = self.exe()
+
+        if _ok and self.cache is not None: self.cache.store(_key, '.c', self.extra_paths + self.file_c)
+        return _ok
+
+    def source_key(self):
+        # the cache key of everything the C is made from
+        return self.cache.key(VERSION, engine_fingerprint(), self.lang, str(self.optimize), str(self.stdout_buffer), str(self.fast_input), str(self.counts_file), self.script)
+
+    def write_c(self, program):
+        # program None: the C is spliced together from the units of self.incremental
+        if program is not None and self.optimize: self.run_optimizer(program)
+        self.program = program
+        transpiler = Transpiler(self.extra_paths + self.file_c)
+        generator = CGenerator(transpiler, self.stdout_buffer, self.fast_input, self.counts_file)
+        with self.stage('codegen') as _counts:
+            if program is None: _stats = self.incremental.generate(generator, self.optimize)
+            else: generator.generate(program)
+            _counts['fragments'] = len(transpiler.header) + len(transpiler.other) + len(transpiler.main)
+        if program is None and self.optimize:
+            print("Optimized %d unit(s), kept the optimized C of %d" % (self.incremental.reoptimized, len(self.incremental.units) - self.incremental.reoptimized))
+            self.report_optimizer(_stats)
+        with self.stage('transpile') as _counts:
+            _error = transpiler.transpile()
+            if self.profile and not _error: _counts['bytes'] = os.path.getsize(transpiler.fn)
+        if _error:
+            print(_error)
+            return False
+        return True
+
+    def run_optimizer(self, program):
+        with self.stage('optimize') as _counts:
+            _stats = optimizer.optimize(program)
+            _counts.update((key, len(value) if key == 'unused' else value) for key, value in _stats.items())
+        self.report_optimizer(_stats)
+
+    def report_optimizer(self, _stats):
+        print("Folded %d node(s), propagated %d constant(s)" % (_stats['folded'], _stats['propagated']))
+        print("Removed %d unreachable branch(es), %d dead store(s) and %d unused variable(s)" % (_stats['branches'], _stats['stores'], len(_stats['unused'])))
+        if _stats['unused']:
+            _names = _stats['unused'][:UNUSED_SHOWN]
+            _more = len(_stats['unused']) - len(_names)
+            print("Unused: " + ', '.join(_names) + (" and %d more" % _more if _more else ''))
+        print("Hoisted %d loop-invariant expression(s), reused %d repeated one(s)" % (_stats['hoisted'], _stats['reused']))
+
+    def parse(self):
+        # the source's nodes.Program, or None after an error
+        import engine
+
+        lexer = engine.Lexer(self.script, self.lang)
+        if self.profile is None:
+            # the source is lexed a chunk at a time as the parser gets to it
+            parser = engine.Parser(lexer.stream())
+            program = parser.parse()
         else:
+            import profiling
+            # lexed whole first, so the two stages are timed apart
+            with self.stage('lex') as _counts:
+                tokens = lexer.tokenize()
+                _counts['tokens'] = len(tokens)
+            with self.stage('parse') as _counts:
+                parser = profiling.Parser(tokens, self.profile)
+                program = parser.parse()
+                _counts['statements'] = self.profile.statements()
+        if lexer.error or parser.error: return None
+        return program
+
+    def optimized(self):
+        # the source's nodes.Program, optimized unless turned off; None after an error
+        program = self.parse()
+        if program is not None and self.optimize: self.run_optimizer(program)
+        return program
+
+    def exe(self):
+        if self.incremental is not None: return self.exe_incremental()
+        program = self.parse()
+        return program is not None and self.write_c(program)
+
+    def exe_incremental(self):
+        # only what changed since the last version is lexed and parsed again
+        if self.incremental.lang != self.lang: self.incremental.reset(self.lang)
+        with self.stage('parse') as _counts:
+            _ok = self.incremental.update(self.script)
+            _counts.update(kept=self.incremental.kept, parsed=self.incremental.parsed)
+        if not _ok: return False
+        print("Kept %d unit(s), parsed %d" % (self.incremental.kept, self.incremental.parsed))
+        return self.write_c(None)
+
+    def exe_key(self, say=print):
+        # the cache key of the executable built from the generated C, None if it can't be read
+        try:
+            with open(self.extra_paths + self.file_c, 'rb') as f:
+                return self.cache.key(f.read(), C_COMPILER, '-O' + str(self.opt_level))
+        except OSError as e:
+            say("Error: Cann't read " + self.file_c + ".\n\t" + str(e))
             return None
 
-    def exe_en(self):
-        import transpiler_en as en
-
-        lexer = en.Lexer(self.script)
-        tokens = lexer.tokenizer()
-        transpiler = en.Transpiler(self.extra_paths + self.file_c)
-        parser = en.Parser(tokens, transpiler)
-        parser.parse()
-        transpiler.transpile()
-
-    def exe_bn(self):
-        import transpiler_bn as bn
-
-        lexer = bn.Lexer(self.script)
-        tokens = lexer.tokenizer()
-        transpiler = bn.Transpiler(self.extra_paths + self.file_c)
-        parser = bn.Parser(tokens, transpiler)
-        parser.parse()
-        transpiler.transpile()
-
-    """
-    def build(self):
-        print("Building...")
-        _commmand = "gcc " + self.file_c + " -o " + self.file_exe
-        os.system(_commmand)
-        print("Building Completed!")
+    def cached_exe(self, _key, say=print):
+        # copies the cached executable into place, returns False when there is none
+        start = time.perf_counter()
+        if not self.cache.fetch(_key, '.bin', self.extra_paths + self.file_exe): return False
+        self.build_time = time.perf_counter() - start
+        say("Using cached executable. (%.3fs)" % self.build_time)
+        return True
+
+    def build(self, say=print):
+        # compiles the generated C with the system C compiler, returns True on success; the
+        # messages go to say, and so does what the C compiler prints when say isn't print
+        _flags = ['-O' + str(self.opt_level)]
+        _command = [C_COMPILER] + _flags + [self.extra_paths + self.file_c, '-o', self.extra_paths + self.file_exe]
+        say("Building...")
+        start = time.perf_counter()
+        if self.cache is not None:
+            _key = self.exe_key(say)
+            if _key is None: return False
+            if self.cached_exe(_key, say): return True
+        _output = {} if say is print else {'stdout': subprocess.PIPE, 'stderr': subprocess.STDOUT}
+        try:
+            with self.stage('build') as _counts:
+                _result = subprocess.run(_command, **_output)
+                if self.profile and _result.returncode == 0: _counts['bytes'] = os.path.getsize(self.extra_paths + self.file_exe)
+        except OSError as e:
+            say("Error: Cann't run the C compiler '" + C_COMPILER + "'.\n\t" + str(e))
+            return False
+        self.build_time = time.perf_counter() - start
+        if _result.stdout: say(_result.stdout.decode('utf8', 'replace').rstrip('\n'))
+        if _result.returncode != 0:
+            say("Error: Building failed.")
+            return False
+        say("Building Completed! (%.3fs)" % self.build_time)
+        if self.cache is not None: self.cache.store(_key, '.bin', self.extra_paths + self.file_exe)
+        return True
 
     def run(self):
-        self.build()
-        _command = self.only_file_name
-        os.system(_command)
-        print('\nExecuted!')
-    """
-
-while True:
-    file_name = input("Enter the file name: ")
-    if file_name:
-        ethan = Ethan(file_name)
-        ethan.execute()
-    if file_name == '--exit':
-        break
\ No newline at end of file
+        # transpiles, builds and runs the program, returns its exit code (None if it couldn't be built)
+        if shutil.which(C_COMPILER) is None:
+            print("C compiler '" + C_COMPILER + "' not found, running the program on the interpreter.")
+            return self.interpret()
+        if not self.execute() or not self.build(): return None
+        return self.run_exe()
+
+    def run_exe(self):
+        # runs the built program, returns its exit code
+        sys.stdout.flush()
+        start = time.perf_counter()
+        # the program inherits our stdout, so its output shows up as it's printed
+        _result = subprocess.run([os.path.abspath(self.extra_paths + self.file_exe)])
+        self.run_time = time.perf_counter() - start
+        print('\nExecuted! (exit code %d)' % _result.returncode)
+        print("Compile: %.3fs, Run: %.3fs" % (self.build_time, self.run_time))
+        return _result.returncode
+
+    def interpret(self, program=None):
+        # runs program (the source's by default) in-process on the bytecode interpreter (vm.py)
+        # instead of building it, returns its exit code (None if it couldn't be compiled)
+        import vm
+
+        if self.lang not in PACKS: return None
+        if self.counts_file: print("Warning: The interpreter doesn't count, " + self.counts_file + " isn't written.")
+        start = time.perf_counter()
+        if program is None: program = self.optimized()
+        if program is None: return None
+        try:
+            with self.stage('bytecode') as _counts:
+                code = vm.compile_program(program)
+                _counts['words'] = len(code.ops)
+        except vm.CompileError as e:
+            print("Error: " + str(e))
+            return None
+        self.build_time = time.perf_counter() - start
+        sys.stdout.flush()
+        start = time.perf_counter()
+        try:
+            _code = code.run(fast_input=self.fast_input)
+        except vm.Trap as e:
+            # as a shell shows the C program stopped by the signal
+            print("\nError: " + str(e))
+            _code = -e.signal
+        self.run_time = time.perf_counter() - start
+        print('\nExecuted! (exit code %d)' % _code)
+        print("Compile: %.3fs, Run: %.3fs" % (self.build_time, self.run_time))
+        return _code
+
+    def tiered(self):
+        # runs the program on the tier tiers.choose() picks for it, or on the executable kept
+        # in the cache from an earlier run; returns its exit code (None if it couldn't be built)
+        import tiers
+
+        if shutil.which(C_COMPILER) is None:
+            print("C compiler '" + C_COMPILER + "' not found, running the program on the interpreter.")
+            return self.interpret()
+        if not self.execute(): return None
+        runs = 0
+        if self.cache is not None:
+            runs = self.cache.bump(self.source_key())
+            _key = self.exe_key()
+            if _key is None: return None
+            if self.cached_exe(_key): return self.run_exe()
+        program = self.program or self.optimized()
+        if program is None: return None
+        # only the executable counts
+        tier = tiers.NATIVE if self.counts_file else tiers.choose(program, runs)
+        # without the cache, the next run wouldn't find the executable
+        if tier == tiers.TIERED and self.cache is None: tier = tiers.INTERPRETED
+        print("Tier: " + tier)
+        if tier == tiers.NATIVE:
+            if not self.build(): return None
+            return self.run_exe()
+        if tier == tiers.INTERPRETED: return self.interpret(program)
+
+        # the C compiler runs while the program is interpreted; its messages wait until the
+        # program is done, and the copy keeps its build_time and its profile apart
+        messages = []
+        background = copy.copy(self)
+        if self.profile is not None:
+            import profiling
+            background.profile = profiling.Profile(self.file_name, self.profile.origin)
+        builder = threading.Thread(target=background.build, args=(messages.append,))
+        builder.start()
+        _code = self.interpret(program)
+        if builder.is_alive(): print("Waiting for the background build...")
+        builder.join()
+        for message in messages: print(message)
+        if self.profile is not None: self.profile.merge(background.profile)
+        return _code
+
+def process(file_name, opt_level=2, action='transpile', cache=None, say=print, **options):
+    # transpiles, builds or runs one file, returns an exit code; options go to Ethan, and
+    # the build's messages to say
+    ethan = Ethan(file_name, opt_level, cache, **options)
+    try:
+        if action in ('run', 'interpret', 'tiered'):
+            _code = ethan.run() if action == 'run' else ethan.interpret() if action == 'interpret' else ethan.tiered()
+            return 1 if _code is None else _code
+        if not ethan.execute(): return 1
+        if action == 'build' and not ethan.build(say): return 1
+        return 0
+    finally:
+        ethan.write_profile()
+
+def process_captured(file_name, opt_level, action, cache_config, options):
+    # runs in a worker process of the batch mode; the compiler's messages are returned instead of printed
+    _out = io.StringIO()
+    start = time.perf_counter()
+    # not print itself, so the build captures what the C compiler prints too
+    say = functools.partial(print, file=_out)
+    with contextlib.redirect_stdout(_out):
+        cache = Cache(*cache_config) if cache_config else None
+        try:
+            _code = process(file_name, opt_level, action, cache, say, **options)
+        except Exception as e:
+            print("Error: " + type(e).__name__ + ": " + str(e))
+            _code = 1
+    return file_name, _code, time.perf_counter() - start, _out.getvalue()
+
+def expand_sources(patterns):
+    # files, directories (searched for .ethan files) and glob patterns, in order and without repeats
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            files += sorted(glob.glob(os.path.join(pattern, '**', '*.ethan'), recursive=True))
+        elif glob.has_magic(pattern):
+            files += sorted(glob.glob(pattern, recursive=True))
+        else:
+            files.append(pattern)
+    return list(dict.fromkeys(files))
+
+def batch(files, opt_level, action, cache_config, jobs, options):
+    print("Processing %d file(s) with %d worker(s)..." % (len(files), jobs))
+    start = time.perf_counter()
+    failed = 0
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(process_captured, fn, opt_level, action, cache_config, options) for fn in files]
+        for future in as_completed(futures):
+            file_name, _code, seconds, messages = future.result()
+            print("%-6s %8.3fs  %s" % ('ok' if _code == 0 else 'exit %d' % _code, seconds, file_name))
+            if _code != 0:
+                failed += 1
+                for line in messages.splitlines(): print('        ' + line)
+    print("%d file(s), %d failed, %.3fs" % (len(files), failed, time.perf_counter() - start))
+    return 1 if failed else 0
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='Ethan', description="Transpile Ethan programs to C, and optionally build and run them.")
+    ap.add_argument('files', nargs='*', help=".ethan files, directories or glob patterns (asks for file names when left out)")
+    ap.add_argument('-O', dest='opt_level', type=int, choices=OPT_LEVELS, default=2, help="C compiler optimization level")
+    mode = ap.add_mutually_exclusive_group()
+    mode.add_argument('--build', action='store_true', help="compile the generated C into an executable")
+    mode.add_argument('--run', action='store_true', help="build the program and run it")
+    mode.add_argument('--interpret', action='store_true', help="run the program in-process on the bytecode interpreter, without a C compiler")
+    mode.add_argument('--tiered', action='store_true', help="interpret or build the program, whichever gives results first, and build it in the background for later runs")
+    ap.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help="worker processes used for more than one file")
+    ap.add_argument('--no-optimize', dest='optimize', action='store_false', help="transpile the program as written, without constant folding or loop optimization")
+    ap.add_argument('--stdout-buffer', type=int, metavar='KIB', help="give the program a fully buffered stdout of this size, flushed at exit and before each get")
+    ap.add_argument('--fast-input', action='store_true', help="read get input in large blocks and parse numbers without scanf")
+    ap.add_argument('--counters', action='store_true', help="make the program count loop iterations, branches taken, prints and gets, and write the counts next to the C file at exit")
+    ap.add_argument('--no-cache', action='store_true', help="always transpile and build from scratch")
+    ap.add_argument('--profile', action='store_true', help="time every stage and kind of statement and write a Chrome trace next to the C file")
+    ap.add_argument('--profile-memory', dest='profile', action='store_const', const='memory', help="--profile, also tracing the memory each stage allocates (which slows the stages down)")
+    ap.add_argument('--cache-dir', default=CACHE_DIR, help="where cached C files and executables are kept")
+    ap.add_argument('--cache-size', type=int, default=CACHE_SIZE // (1024 * 1024), help="cache size limit in MiB")
+    args = ap.parse_args(argv)
+    if args.stdout_buffer is not None and args.stdout_buffer <= 0: ap.error("--stdout-buffer must be a positive size")
+    cache_config = None if args.no_cache else (args.cache_dir, args.cache_size * 1024 * 1024)
+    cache = Cache(*cache_config) if cache_config else None
+    action = 'run' if args.run else 'interpret' if args.interpret else 'tiered' if args.tiered else 'build' if args.build else 'transpile'
+    options = {'optimize': args.optimize, 'stdout_buffer': args.stdout_buffer * 1024 if args.stdout_buffer else None, 'fast_input': args.fast_input, 'counters': args.counters, 'profile': args.profile}
+
+    if not args.files:
+        while True:
+            file_name = input("Enter the file name: ")
+            if file_name == '--exit':
+                break
+            # each file is transpiled, built or run as the mode given says
+            if file_name: process(file_name, args.opt_level, action, cache, **options)
+        return 0
+
+    files = expand_sources(args.files)
+    if not files:
+        print("Error: No .ethan files found.")
+        return 1
+    if len(files) == 1:
+        return process(files[0], args.opt_level, action, cache, **options)
+    # the programs would share the terminal, their output mixed with the report
+    if action in ('run', 'interpret', 'tiered'): ap.error("--run, --interpret and --tiered take a single file")
+    return batch(files, args.opt_level, action, cache_config, args.jobs, options)
+
+if __name__ == '__main__':
+    sys.exit(main())
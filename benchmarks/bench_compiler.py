@@ -0,0 +1,135 @@
+# Stage by stage benchmark of the Ethan compiler
+#
+#   python benchmarks/bench_compiler.py [--lines 20000 100000] [--lang en bn] [-o results.json] [--compare old.json]
+#
+# Every program from generate.py is put through Lexer.tokenizer, Parser.parse, optimize,
+# CGenerator.generate and Transpiler.transpile separately. The optimizer works on a copy, and
+# the C is generated from the program as parsed (with --optimized, from the optimized copy,
+# which on generated programs is much smaller). Times are the best of --repeat runs; peak memory is
+# measured (as the peak of what the stage itself allocates) in a separate run under
+# tracemalloc, which would otherwise skew the times.
+
+import argparse, contextlib, io, json, os, platform, subprocess, sys, tempfile, time, tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from generate import generate
+import engine
+from codegen import CGenerator, Transpiler
+from optimizer import optimize
+
+STAGES = ('lex', 'parse', 'optimize', 'codegen', 'transpile')
+
+def run_stages(lang, source, out_file, measure=None, optimized=False):
+    # runs the stages one by one, returns {stage: value of measure()} and the token count
+    results = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        measure.start()
+        tokens = engine.Lexer(source, lang).tokenizer()
+        results['lex'] = measure.stop()
+
+        measure.start()
+        parser = engine.Parser(tokens)
+        program = parser.parse()
+        results['parse'] = measure.stop()
+        if parser.error: raise RuntimeError("the generated program doesn't compile")
+
+        copy = program.copy()
+        measure.start()
+        optimize(copy)
+        results['optimize'] = measure.stop()
+        if optimized: program = copy
+
+        measure.start()
+        transpiler = Transpiler(out_file)
+        CGenerator(transpiler).generate(program)
+        results['codegen'] = measure.stop()
+
+        measure.start()
+        transpiler.transpile()
+        results['transpile'] = measure.stop()
+    return results, len(tokens)
+
+class Timer:
+    def start(self):
+        self.t = time.perf_counter()
+
+    def stop(self):
+        return time.perf_counter() - self.t
+
+class PeakMemory:
+    def start(self):
+        tracemalloc.start()
+
+    def stop(self):
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak
+
+def bench(lang, lines, repeat, optimized):
+    source = generate(lang, lines)
+    n_lines = source.count('\n')
+    with tempfile.TemporaryDirectory() as tmp:
+        out_file = os.path.join(tmp, 'bench.c')
+        best = None
+        for _ in range(repeat):
+            times, n_tokens = run_stages(lang, source, out_file, Timer(), optimized)
+            if best is None: best = times
+            else: best = {s: min(best[s], times[s]) for s in STAGES}
+        peaks, _ = run_stages(lang, source, out_file, PeakMemory(), optimized)
+        c_bytes = os.path.getsize(out_file)
+
+    stages = {}
+    for s in STAGES:
+        stages[s] = {
+            'seconds': best[s],
+            'tokens_per_s': n_tokens / best[s],
+            'lines_per_s': n_lines / best[s],
+            'peak_kib': peaks[s] // 1024,
+        }
+    return {'lang': lang, 'lines': n_lines, 'tokens': n_tokens, 'optimized': optimized, 'c_bytes': c_bytes, 'stages': stages}
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def report(result, baseline=None):
+    print(f"{result['lang']}: {result['lines']} lines, {result['tokens']} tokens, {result['c_bytes']} bytes of {'optimized ' if result['optimized'] else ''}C")
+    for s in STAGES:
+        r = result['stages'][s]
+        line = f"  {s:<10} {r['seconds']:8.3f}s {r['tokens_per_s']:12,.0f} tokens/s {r['lines_per_s']:10,.0f} lines/s {r['peak_kib']:9,} KiB peak"
+        if baseline and s in baseline['stages']:
+            line += f"   {baseline['stages'][s]['seconds'] / r['seconds']:5.2f}x"
+        print(line)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Time the lexer, parser and transpiler on generated programs.")
+    ap.add_argument('--lang', nargs='+', choices=('en', 'bn'), default=['en', 'bn'])
+    ap.add_argument('--lines', nargs='+', type=int, default=[20000])
+    ap.add_argument('--repeat', type=int, default=3)
+    ap.add_argument('--optimized', action='store_true', help="generate the C from the optimized program")
+    ap.add_argument('-o', '--output', help="write the results to this JSON file")
+    ap.add_argument('--compare', help="a JSON file from an earlier run; prints the speedup of each stage")
+    args = ap.parse_args(argv)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding='utf8') as f:
+            for r in json.load(f)['results']: baseline[(r['lang'], r['lines'], r.get('optimized', False))] = r
+
+    results = []
+    for lang in args.lang:
+        for lines in args.lines:
+            result = bench(lang, lines, args.repeat, args.optimized)
+            report(result, baseline.get((result['lang'], result['lines'], result['optimized'])))
+            results.append(result)
+
+    if args.output:
+        data = {'commit': git_commit(), 'python': platform.python_version(), 'results': results}
+        with open(args.output, 'w', encoding='utf8') as f: json.dump(data, f, indent=2)
+
+if __name__ == '__main__':
+    main()
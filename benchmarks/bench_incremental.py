@@ -0,0 +1,81 @@
+# Incremental compilation benchmark for Ethan
+#
+#   python benchmarks/bench_incremental.py [--lines 50000] [--lang en] [--edits 5]
+#
+# Makes --edits small edits (a number changed, a line added) at different places of a
+# generated program and times the C for every edited version made from scratch and by
+# an incremental.Incremental that has seen the version before: first with the optimizer,
+# as Ethan compiles by default, then without it. Also checks that both give the same C,
+# and counts the edits after which the whole program was optimized again.
+
+import argparse, contextlib, io, os, random, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from generate import generate, KEYWORDS
+import engine
+from codegen import CGenerator, Transpiler
+from incremental import Incremental
+from optimizer import optimize
+
+def c_of(generator_of):
+    transpiler = Transpiler(None)
+    generator_of(CGenerator(transpiler))
+    return ''.join(transpiler.header + transpiler.other + transpiler.main)
+
+def from_scratch(source, lang, optimized):
+    program = engine.Parser(engine.Lexer(source, lang).tokenize()).parse()
+    if optimized: optimize(program)
+    return c_of(lambda generator: generator.generate(program))
+
+def incrementally(incremental, source, optimized):
+    if not incremental.update(source): raise RuntimeError("the edited program doesn't compile")
+    return c_of(lambda generator: incremental.generate(generator, optimized))
+
+def edits(source, lang, count, rng):
+    # versions of source, each one a small edit of the one before
+    let = KEYWORDS[lang]['let']
+    for i in range(count):
+        lines = source.split('\n')
+        at = len(lines) * (i + 1) // (count + 1)
+        if i % 2:
+            # in front of a top-level let, where a statement can go (not before an else)
+            while not lines[at].startswith(let + ' '): at += 1
+            lines.insert(at, '%s edited%d = %d' % (let, i, i))
+        else:
+            while not any(c.isdigit() for c in lines[at]): at += 1
+            digit = max(p for p, c in enumerate(lines[at]) if c.isdigit())
+            lines[at] = lines[at][:digit] + str(rng.randrange(1, 10)) + lines[at][digit + 1:]
+        source = '\n'.join(lines)
+        yield source
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Time incremental against full compiles of edited programs.")
+    ap.add_argument('--lines', type=int, default=50000)
+    ap.add_argument('--lang', choices=('en', 'bn'), default='en')
+    ap.add_argument('--edits', type=int, default=5)
+    args = ap.parse_args(argv)
+
+    source = generate(args.lang, args.lines)
+    for optimized in (True, False):
+        incremental = Incremental(args.lang)
+        full = part = whole = 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            incrementally(incremental, source, optimized)
+            for edited in edits(source, args.lang, args.edits, random.Random(1)):
+                start = time.perf_counter()
+                expected = from_scratch(edited, args.lang, optimized)
+                middle = time.perf_counter()
+                got = incrementally(incremental, edited, optimized)
+                part += time.perf_counter() - middle
+                full += middle - start
+                if got != expected: raise RuntimeError("the incremental C differs")
+                whole += optimized and incremental.reoptimized == len(incremental.units)
+        name = 'optimized' if optimized else 'plain'
+        line = f'{name:>9}: {1000 * full / args.edits:8.1f} ms from scratch, {1000 * part / args.edits:8.1f} ms incremental   {full / part:6.1f}x'
+        if optimized: line += f'   ({whole} of {args.edits} edit(s) optimized the whole program again)'
+        print(line)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+# Lexer throughput benchmark for Ethan
+#
+#   python benchmarks/bench_lexer.py [--lines N] [--lang en|bn] [--baseline path/to/engine.py]
+#
+# --baseline loads another copy of the engine module (e.g. one taken with
+# `git show <rev>:engine.py`, or `<rev>:transpiler_en.py` from before the languages shared
+# one) and reports both lexers side by side.
+
+import argparse, importlib.util, os, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from generate import generate
+
+def load_module(path, name):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def bench(module, source, lang, repeat):
+    # the old per-language modules' Lexer only takes the source
+    args = (source, lang) if hasattr(module, 'LANGUAGES') else (source,)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tokens = module.Lexer(*args).tokenizer()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best: best = elapsed
+    return len(tokens), best
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Measure Lexer.tokenizer throughput.")
+    ap.add_argument('--lines', type=int, default=50000)
+    ap.add_argument('--lang', choices=('en', 'bn'), default='en')
+    ap.add_argument('--repeat', type=int, default=3)
+    ap.add_argument('--baseline', help="another engine module to compare against")
+    args = ap.parse_args(argv)
+
+    source = generate(args.lang, args.lines)
+    subjects = [('current', load_module(os.path.join(ROOT, 'engine.py'), 'current'))]
+    if args.baseline: subjects.append(('baseline', load_module(args.baseline, 'baseline')))
+
+    results = {}
+    for name, module in subjects:
+        count, seconds = bench(module, source, args.lang, args.repeat)
+        results[name] = count / seconds
+        print(f'{name:>9}: {count} tokens in {seconds:.3f}s = {count / seconds:,.0f} tokens/s')
+    if 'baseline' in results:
+        print(f'  speedup: {results["current"] / results["baseline"]:.2f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+# Compile server benchmark for Ethan
+#
+#   python benchmarks/bench_server.py [--compiles 50] [--lines 20]
+#
+# Transpiles one small program --compiles times, editing it before each compile so no cache
+# can answer: with a new `python Ethan.py` process per compile, with a `python client.py`
+# process per compile talking to a compile server, and with requests sent straight to the
+# server from this process, as an editor integration would. Reports the mean latency of each.
+
+import argparse, os, subprocess, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from generate import generate
+import client
+
+def edit(path, source, i):
+    with open(path, 'w', encoding='utf8') as f: f.write(source + 'let edit%d = %d\nprint edit%d\n' % (i, i, i))
+
+def timed(path, source, compiles, compile_once):
+    total = 0
+    for i in range(compiles):
+        edit(path, source, i)
+        start = time.perf_counter()
+        compile_once()
+        total += time.perf_counter() - start
+    return total / compiles
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Compare compile latency with and without the compile server.")
+    ap.add_argument('--compiles', type=int, default=50)
+    ap.add_argument('--lines', type=int, default=20, help="lines of the compiled program")
+    args = ap.parse_args(argv)
+
+    source = generate('en', args.lines)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'edited.ethan')
+        sock = os.path.join(tmp, 'server.sock')
+        env = dict(os.environ, ETHAN_CACHE_DIR=os.path.join(tmp, 'cache'))
+        quiet = {'stdout': subprocess.DEVNULL, 'env': env, 'check': True}
+        server = subprocess.Popen([sys.executable, os.path.join(ROOT, 'server.py'), '--socket', sock], stdout=subprocess.DEVNULL, env=env)
+        try:
+            while not os.path.exists(sock):
+                if server.poll() is not None: raise RuntimeError("the server didn't start")
+                time.sleep(0.05)
+            results = [
+                ('Ethan.py', timed(path, source, args.compiles, lambda: subprocess.run([sys.executable, os.path.join(ROOT, 'Ethan.py'), path], **quiet))),
+                ('client.py', timed(path, source, args.compiles, lambda: subprocess.run([sys.executable, os.path.join(ROOT, 'client.py'), '--socket', sock, path], **quiet))),
+                ('request', timed(path, source, args.compiles, lambda: client.request({'action': 'transpile', 'file': path}, sock))),
+            ]
+            stats = client.request({'action': 'shutdown'}, sock)
+        finally:
+            server.wait(10)
+    baseline = results[0][1]
+    for name, seconds in results:
+        print(f'{name:>9}: {1000 * seconds:8.2f} ms per compile   {baseline / seconds:6.2f}x')
+    print(f"server p50 {stats['actions']['transpile']['p50_ms']} ms, p95 {stats['actions']['transpile']['p95_ms']} ms")
+
+if __name__ == '__main__':
+    main()
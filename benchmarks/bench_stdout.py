@@ -0,0 +1,80 @@
+# Output buffering benchmark for programs built by Ethan
+#
+#   python benchmarks/bench_stdout.py [--lines 500000] [--buffer 64 256] [--repeat 3]
+#
+# Builds one print-heavy program with the default stdout and with each --stdout-buffer size,
+# then runs them with their output going into a pipe, as it does in batch jobs. Reports the
+# best run time and, where the kernel counts them (/proc/self/io on Linux, which includes
+# waited-for children), the write system calls each run made.
+
+import argparse, contextlib, io, os, subprocess, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from Ethan import Ethan
+
+PROGRAM = '''declare i as int
+i = 0
+while i < {lines} repeat
+    print "line", i, "of", {lines}, "half:", i * 0.5
+    i = i + 1
+end
+'''
+
+def write_syscalls():
+    try:
+        with open('/proc/self/io') as f:
+            for line in f:
+                if line.startswith('syscw:'): return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+def build(directory, lines, stdout_buffer):
+    os.makedirs(directory)
+    path = os.path.join(directory, 'prints.ethan')
+    with open(path, 'w') as f: f.write(PROGRAM.format(lines=lines))
+    ethan = Ethan(path, stdout_buffer=stdout_buffer)
+    with contextlib.redirect_stdout(io.StringIO()):
+        if not ethan.execute() or not ethan.build(): raise RuntimeError("the benchmark program doesn't build")
+    return os.path.abspath(ethan.extra_paths + ethan.file_exe)
+
+def run(exe):
+    # returns seconds, bytes read from the pipe and write syscalls (None when unknown)
+    before = write_syscalls()
+    start = time.perf_counter()
+    size = 0
+    with subprocess.Popen([exe], stdout=subprocess.PIPE) as p:
+        for chunk in iter(lambda: p.stdout.read(1 << 16), b''): size += len(chunk)
+    seconds = time.perf_counter() - start
+    after = write_syscalls()
+    return seconds, size, None if before is None else after - before
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Compare generated programs with and without --stdout-buffer.")
+    ap.add_argument('--lines', type=int, default=500000, help="lines the program prints")
+    ap.add_argument('--buffer', nargs='+', type=int, default=[64, 256], help="--stdout-buffer sizes in KiB")
+    ap.add_argument('--repeat', type=int, default=3)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        subjects = [('default', None)] + [('%d KiB' % kib, kib * 1024) for kib in args.buffer]
+        baseline = None
+        for name, stdout_buffer in subjects:
+            exe = build(os.path.join(tmp, name.replace(' ', '')), args.lines, stdout_buffer)
+            best = None
+            for _ in range(args.repeat):
+                result = run(exe)
+                if best is None or result[0] < best[0]: best = result
+            seconds, size, writes = best
+            if baseline is None: baseline = best
+            line = f'{name:>9}: {seconds:7.3f}s for {size:,} bytes'
+            if writes is not None: line += f', {writes:,} write calls'
+            if best is not baseline:
+                line += f'   {baseline[0] / seconds:5.2f}x'
+                if writes: line += f', {baseline[2] / writes:,.0f}x fewer writes'
+            print(line)
+
+if __name__ == '__main__':
+    main()
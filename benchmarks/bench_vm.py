@@ -0,0 +1,59 @@
+# Interpreter benchmark for Ethan
+#
+#   python benchmarks/bench_vm.py [--lines 20 200 2000] [--iterations 1000 100000] [--runs 3]
+#
+# Runs generated programs of --lines lines and a loop of --iterations iterations with
+# `python Ethan.py --interpret` and with `python Ethan.py --run --no-cache`, which pays for
+# the C compiler every time, and reports the mean wall-clock latency of both. Also checks
+# that both print the same.
+
+import argparse, os, subprocess, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from generate import generate
+
+LOOP = '''let i = 0
+let total = 0
+while i < %d repeat
+    total = total + i %% 7
+    i = i + 1
+end
+print total
+'''
+
+def output(stdout):
+    # what the program printed, without Ethan's messages around it
+    text = stdout.decode('utf8', 'replace')
+    start = max(text.find(message) for message in ("Compiling finished!", "Hoisted ", "Building Completed!"))
+    return text[text.index('\n', start) + 1:text.rindex("\nExecuted!")]
+
+def timed(path, mode, runs):
+    total = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, os.path.join(ROOT, 'Ethan.py'), mode, '--no-cache', path], stdout=subprocess.PIPE, check=True)
+        total += time.perf_counter() - start
+    return total / runs, output(result.stdout)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Compare the latency of interpreting and of building and running programs.")
+    ap.add_argument('--lines', type=int, nargs='+', default=[20, 200, 2000])
+    ap.add_argument('--iterations', type=int, nargs='+', default=[1000, 100000])
+    ap.add_argument('--runs', type=int, default=3)
+    args = ap.parse_args(argv)
+
+    programs = [('%d lines' % lines, generate('en', lines)) for lines in args.lines]
+    programs += [('%d loops' % iterations, LOOP % iterations) for iterations in args.iterations]
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, source in programs:
+            path = os.path.join(tmp, 'program.ethan')
+            with open(path, 'w', encoding='utf8') as f: f.write(source)
+            interpreted, expected = timed(path, '--interpret', args.runs)
+            compiled, got = timed(path, '--run', args.runs)
+            if got != expected: raise RuntimeError("the interpreter and the C program print differently: " + name)
+            print(f'{name:>13}: {1000 * interpreted:9.1f} ms interpreted, {1000 * compiled:9.1f} ms built and run   {compiled / interpreted:6.2f}x')
+
+if __name__ == '__main__':
+    main()
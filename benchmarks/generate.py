@@ -0,0 +1,75 @@
+# Synthetic Ethan programs for the benchmarks
+#
+#   python benchmarks/generate.py [--lang en|bn] [--lines N] [-o out.ethan]
+#
+# A program is a run of blocks, each exercising one thing the compiler has to chew on:
+# many 'let' declarations, wide print lists, deep if / else if chains and long while bodies.
+# The Bangla keywords are spelled with the precomposed letters (U+09DC, U+09DF) the lexer knows.
+
+import argparse, sys
+
+KEYWORDS = {
+    'en': {
+        'header': '#!English', 'declare': 'declare', 'as': 'as', 'let': 'let', 'int': 'int',
+        'if': 'if', 'then': 'then', 'else': 'else', 'end': 'end', 'while': 'while',
+        'repeat': 'repeat', 'and': 'and', 'print': 'print', 'separator': 'separator',
+        'var': 'v',
+    },
+    'bn': {
+        'header': '#!বাংলা', 'declare': 'চলক', 'as': 'যেন', 'let': 'ধরি', 'int': 'পূর্ণসংখ্যা',
+        'if': 'যদি', 'then': 'তবে', 'else': 'এছা\u09dcা', 'end': 'শেষ', 'while': 'যতক্ষণ',
+        'repeat': 'হ\u09df ততক্ষণ', 'and': 'এবং', 'print': 'দেখাও', 'separator': 'পৃথককারী',
+        'var': 'চ',
+    },
+}
+
+def lets(k, i, size):
+    return ['{let} {var}%d_%d = %d * 60 + %d - (%d + 1.5) * 2' % (i, j, j, i, j) for j in range(size)]
+
+def wide_print(k, i, size):
+    items = ', '.join('{var}%d_%d * %d, "|"' % (i, j % 8, j) for j in range(size))
+    return ['{print} %s !{separator} " "' % items]
+
+def if_chain(k, i, size):
+    out = ['{if} {var}%d_0 == 0 {then}' % i, '    {print} "zero"', '{end}']
+    for j in range(1, size):
+        out += ['{else} {if} {var}%d_0 > %d {and} {var}%d_1 != %d {then}' % (i, j * 10, i, j), '    {print} %d' % j, '{end}']
+    out += ['{else}', '    {print} "many"', '{end}']
+    return out
+
+def while_body(k, i, size):
+    out = ['{declare} n%d {as} {int}' % i, 'n%d = 100' % i, '{while} n%d > 0 {repeat}' % i, '    n%d = n%d - 1' % (i, i)]
+    for j in range(size):
+        out.append('    {var}%d_%d = {var}%d_%d + n%d * %d' % (i, j % 8, i, (j + 1) % 8, i, j))
+    out.append('{end}')
+    return out
+
+BLOCKS = (lets, wide_print, if_chain, while_body)
+
+def generate(lang='en', lines=10000, width=8):
+    k = KEYWORDS[lang]
+    out = [k['header'], '']
+    i = 0
+    while len(out) < lines:
+        # every block declares the 8 variables the other blocks use
+        block = lets(k, i, 8) + [line for make in BLOCKS[1:] for line in make(k, i, width)]
+        out += [line.format(**k) for line in block]
+        out.append('')
+        i += 1
+    return '\n'.join(out) + '\n'
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Write a synthetic Ethan program.")
+    ap.add_argument('--lang', choices=tuple(KEYWORDS), default='en')
+    ap.add_argument('--lines', type=int, default=10000)
+    ap.add_argument('--width', type=int, default=8, help="items per print, arms per if chain, lines per while body")
+    ap.add_argument('-o', '--output', help="file to write (stdout when left out)")
+    args = ap.parse_args(argv)
+    source = generate(args.lang, args.lines, args.width)
+    if args.output:
+        with open(args.output, 'w', encoding='utf8') as f: f.write(source)
+    else:
+        sys.stdout.write(source)
+
+if __name__ == '__main__':
+    main()
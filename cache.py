@@ -0,0 +1,166 @@
+# Compilation cache for Ethan
+#
+# Entries are files named by a hash of everything that went into making them, so a key
+# never goes stale. The cache is bounded in size: when it grows past max_size the least
+# recently used entries (oldest mtime; a hit touches its entry) are removed first.
+# A MemoryCache keeps entries in memory in front of it, for a long running compile server.
+
+import hashlib, os, shutil, tempfile, threading
+from collections import OrderedDict
+
+CACHE_DIR = os.environ.get('ETHAN_CACHE_DIR') or os.path.join(os.path.expanduser('~'), '.ethan_cache')
+CACHE_SIZE = 256 * 1024 * 1024
+MEMORY_CACHE_SIZE = 64 * 1024 * 1024
+
+class Cache:
+    def __init__(self, path=CACHE_DIR, max_size=CACHE_SIZE):
+        self.path = path
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(*parts):
+        h = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, str): part = part.encode('utf8')
+            h.update(len(part).to_bytes(8, 'little'))
+            h.update(part)
+        return h.hexdigest()
+
+    def entry(self, key, ext):
+        return os.path.join(self.path, key + ext)
+
+    def fetch(self, key, ext, dest):
+        # copies the entry to dest, returns False when there is no such entry
+        entry = self.entry(key, ext)
+        try:
+            shutil.copy(entry, dest)
+            os.utime(entry)
+        except OSError:
+            self.misses += 1
+            return False
+        self.hits += 1
+        return True
+
+    def store(self, key, ext, src):
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+            os.close(fd)
+            shutil.copy(src, tmp)
+            # a reader never sees a half written entry
+            os.replace(tmp, self.entry(key, ext))
+        except OSError as e:
+            print("Warning: Cann't write to the cache.\n\t" + str(e))
+            return False
+        self.evict()
+        return True
+
+    def bump(self, key):
+        # counts one more run of what key stands for, returns how many came before it
+        entry = self.entry(key, '.runs')
+        try:
+            with open(entry) as f: runs = int(f.read())
+        except (OSError, ValueError):
+            runs = 0
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f: f.write(str(runs + 1))
+            os.replace(tmp, entry)
+        except OSError as e:
+            print("Warning: Cann't write to the cache.\n\t" + str(e))
+        return runs
+
+    def evict(self):
+        entries = []
+        total = 0
+        with os.scandir(self.path) as it:
+            for e in it:
+                if e.name.endswith('.tmp'): continue
+                try: st = e.stat()
+                except OSError: continue
+                entries.append((st.st_mtime, st.st_size, e.path))
+                total += st.st_size
+        if total <= self.max_size: return
+        entries.sort()
+        for _, size, path in entries:
+            try: os.remove(path)
+            except OSError: continue
+            total -= size
+            if total <= self.max_size: break
+
+    def clear(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+class MemoryCache:
+    # Same interface as Cache, with the entries (contents and file mode) held in memory, up to
+    # max_size bytes in least recently used order. Misses go on to backing, a Cache or None,
+    # and what it has is kept in memory from then on. Safe to share between threads.
+    key = staticmethod(Cache.key)
+
+    def __init__(self, backing=None, max_size=MEMORY_CACHE_SIZE):
+        self.backing = backing
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.size = 0
+        # run counts, when there is no backing to keep them
+        self.runs = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def fetch(self, key, ext, dest):
+        with self.lock:
+            entry = self.entries.get((key, ext))
+            if entry is None: self.misses += 1
+            else:
+                self.entries.move_to_end((key, ext))
+                self.hits += 1
+        if entry is None:
+            if self.backing is None or not self.backing.fetch(key, ext, dest): return False
+            self.keep(key, ext, dest)
+            return True
+        data, mode = entry
+        try:
+            with open(dest, 'wb') as f: f.write(data)
+            os.chmod(dest, mode)
+        except OSError:
+            return False
+        return True
+
+    def store(self, key, ext, src):
+        if not self.keep(key, ext, src): return False
+        return self.backing is None or self.backing.store(key, ext, src)
+
+    def bump(self, key):
+        if self.backing is not None: return self.backing.bump(key)
+        with self.lock:
+            runs = self.runs.get(key, 0)
+            self.runs[key] = runs + 1
+        return runs
+
+    def keep(self, key, ext, src):
+        try:
+            with open(src, 'rb') as f: data = f.read()
+            mode = os.stat(src).st_mode & 0o777
+        except OSError as e:
+            print("Warning: Cann't read " + src + " into the cache.\n\t" + str(e))
+            return False
+        if len(data) > self.max_size: return True
+        with self.lock:
+            old = self.entries.pop((key, ext), None)
+            if old is not None: self.size -= len(old[0])
+            self.entries[(key, ext)] = (data, mode)
+            self.size += len(data)
+            while self.size > self.max_size:
+                _, (dropped, _) = self.entries.popitem(last=False)
+                self.size -= len(dropped)
+        return True
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+        if self.backing is not None: self.backing.clear()
@@ -0,0 +1,102 @@
+# Thin client of the Ethan compile server (server.py)
+#
+#   python client.py [--build | --run] [-O 2] program.ethan ...
+#   python client.py --stats | --shutdown
+#
+# Sends the files to a running server and prints what it reports, so a compile costs a
+# small interpreter start and a round trip instead of loading the transpiler. With --run
+# the server builds the program and the client runs it, with the client's own stdin and
+# stdout. Imports nothing of Ethan's, to stay quick to start.
+
+import argparse, json, os, socket, subprocess, sys, time
+
+SOCKET_PATH = os.environ.get('ETHAN_SOCKET') or os.path.join(os.path.expanduser('~'), '.ethan.sock')
+# files sent to the server before the first reply is waited for
+WINDOW = 32
+
+def connect(path=SOCKET_PATH):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+def send(sock, message):
+    # one request per connection, as a line of JSON
+    sock.sendall(json.dumps(message).encode('utf8') + b'\n')
+
+def receive(sock):
+    with sock, sock.makefile('rb') as f:
+        line = f.readline()
+    if not line: raise ConnectionError("the server closed the connection")
+    return json.loads(line)
+
+def request(message, path=SOCKET_PATH):
+    sock = connect(path)
+    send(sock, message)
+    return receive(sock)
+
+def compile_files(files, action, opt_level, options, path):
+    # sends up to WINDOW requests ahead so the server works on them at the same time,
+    # yields (file name, reply) in order
+    pending = []
+    files = list(files)
+    while files or pending:
+        while files and len(pending) < WINDOW:
+            file_name = files.pop(0)
+            sock = connect(path)
+            send(sock, {'action': action, 'file': os.path.abspath(file_name), 'opt_level': opt_level, 'options': options})
+            pending.append((file_name, sock))
+        file_name, sock = pending.pop(0)
+        yield file_name, receive(sock)
+
+def run_exe(exe):
+    sys.stdout.flush()
+    start = time.perf_counter()
+    _result = subprocess.run([exe])
+    print('\nExecuted! (exit code %d)' % _result.returncode)
+    print("Run: %.3fs" % (time.perf_counter() - start))
+    return _result.returncode
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='Ethan client', description="Transpile, build or run Ethan programs on a running compile server.")
+    ap.add_argument('files', nargs='*', help=".ethan files")
+    ap.add_argument('-O', dest='opt_level', type=int, choices=(0, 2, 3), default=2, help="C compiler optimization level")
+    mode = ap.add_mutually_exclusive_group()
+    mode.add_argument('--build', action='store_true', help="compile the generated C into an executable")
+    mode.add_argument('--run', action='store_true', help="build the program and run it here")
+    mode.add_argument('--stats', action='store_true', help="print the server's request and cache statistics")
+    mode.add_argument('--shutdown', action='store_true', help="stop the server")
+    ap.add_argument('--no-optimize', dest='optimize', action='store_false', help="transpile the program as written")
+    ap.add_argument('--stdout-buffer', type=int, metavar='KIB', help="give the program a fully buffered stdout of this size")
+    ap.add_argument('--fast-input', action='store_true', help="read get input in large blocks and parse numbers without scanf")
+    ap.add_argument('--counters', action='store_true', help="make the program count loop iterations, branches taken, prints and gets, and write the counts next to the C file at exit")
+    ap.add_argument('--socket', default=SOCKET_PATH, help="the server's socket")
+    args = ap.parse_args(argv)
+    if args.stdout_buffer is not None and args.stdout_buffer <= 0: ap.error("--stdout-buffer must be a positive size")
+    if not (args.files or args.stats or args.shutdown): ap.error("no files given")
+
+    try:
+        if args.stats or args.shutdown:
+            print(json.dumps(request({'action': 'stats' if args.stats else 'shutdown'}, args.socket), indent=2))
+            return 0
+        action = 'run' if args.run else 'build' if args.build else 'transpile'
+        options = {'optimize': args.optimize, 'stdout_buffer': args.stdout_buffer * 1024 if args.stdout_buffer else None, 'fast_input': args.fast_input, 'counters': args.counters}
+        failed = 0
+        for file_name, reply in compile_files(args.files, action, args.opt_level, options, args.socket):
+            if len(args.files) > 1: print("%s (%.3fs)" % (file_name, reply['seconds']))
+            sys.stdout.write(reply['output'])
+            if reply['code'] != 0:
+                failed = reply['code']
+            elif action == 'run':
+                _code = run_exe(reply['exe'])
+                if _code: failed = _code
+        return failed
+    except OSError as e:
+        print("Error: No compile server at " + args.socket + " (start one with: python server.py).\n\t" + str(e))
+        return 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,233 @@
+# C code generator for scripting language : Ethan
+#
+# Walks the nodes.Program built by a Parser and writes the C for it through a Transpiler.
+# Shared by the English and the Bangla transpilers, which only differ in their front ends.
+
+from nodes import If, Str, Num, Var, Unary, BinOp, Compare, Logical, Not
+from semantics import INT_LIMITS
+import runtime
+
+C_TYPES = {'int': 'int', 'long': 'long long int', 'float': 'float', 'double': 'double', 'exp': 'double'}
+PRINTF_SPECIFIERS = {'int': '%d', 'long': '%lld', 'float': '%f', 'double': '%lf', 'exp': '%E'}
+SCANF_SPECIFIERS = {'int': '%d', 'long': '%lld', 'float': '%f', 'double': '%lf', 'exp': '%lE'}
+# functions of runtime.READER
+READER_FUNCTIONS = {'int': 'ethan_get_int', 'long': 'ethan_get_long', 'float': 'ethan_get_float', 'double': 'ethan_get_double', 'exp': 'ethan_get_double'}
+# pieces of runtime.py and the headers each one needs
+RUNTIME = {'reader': (runtime.READER, ('stdlib',)), 'counters': (runtime.COUNTERS, ('stdio', 'stdlib'))}
+
+# C precedence of the arithmetic operators, higher binds tighter
+PRECEDENCE = {'+': 1, '-': 1, '*': 2, '/': 2, '%': 2}
+LOGICAL_OPERATORS = {'and': ' && ', 'or': ' || '}
+
+class Transpiler:
+    def __init__(self, fn='out.c'):
+        self.fn = fn
+        # the C source is collected as lists of fragments and joined only once, by transpile()
+        self.header = []
+        self.main = []
+        self.other = []
+
+    def wHead(self, head):
+        self.header.append(head + '\n\n')
+
+    def wMain(self, code):
+        self.main.append(code)
+
+    def wOther(self, code):
+        self.other.append(code)
+
+    def transpile(self):
+        try:
+            with open(self.fn, 'w', encoding='utf8', newline='') as f:
+                f.writelines(self.header)
+                f.writelines(self.other)
+                f.writelines(self.main)
+        except Exception as e:
+            return "Error: " + str(e)
+
+class CGenerator:
+    def __init__(self, transpiler, stdout_buffer=None, fast_input=False, counters=None):
+        self.transpiler = transpiler
+        # size in bytes of a fully buffered stdout, flushed only at exit and before a get
+        self.stdout_buffer = stdout_buffer
+        # get reads through runtime.READER instead of scanf
+        self.fast_input = fast_input
+        # the JSON file the program writes its runtime.COUNTERS to at exit, if it counts
+        self.counters = counters
+        # (line, kind): counter, in the order they were first needed
+        self.counts = {}
+        # in the order they were first needed
+        self.headers = {}
+        self.runtime = {}
+
+    def generate(self, program):
+        self.start()
+        self.block(program.body)
+        self.finish()
+
+    def start(self):
+        self.transpiler.wMain("int main() {\n")
+        if self.stdout_buffer:
+            self.include('stdio')
+            self.transpiler.wOther('static char ethan_stdout_buffer[' + str(self.stdout_buffer) + '];\n\n')
+            self.transpiler.wMain('setvbuf(stdout, ethan_stdout_buffer, _IOFBF, sizeof ethan_stdout_buffer);\n')
+        if self.counters is not None: self.transpiler.wMain('atexit(ethan_dump_counts);\n')
+
+    def finish(self):
+        if self.counters is not None:
+            # the sites in line order, for the dump
+            sites = sorted(self.counts.items())
+            path = self.counters.replace('\\', '\\\\').replace('"', '\\"')
+            self.transpiler.wOther('#define ETHAN_COUNTS_FILE "' + path + '"\n#define ETHAN_COUNT_SITES ' + str(len(sites)) + '\n')
+            self.transpiler.wOther('static unsigned long long ethan_counts[' + str(len(sites) or 1) + '];\n')
+            self.transpiler.wOther('static const int ethan_count_lines[] = {' + (', '.join(str(line) for (line, _), _ in sites) or '0') + '};\n')
+            self.transpiler.wOther('static const char *const ethan_count_kinds[] = {' + (', '.join('"' + kind + '"' for (_, kind), _ in sites) or '0') + '};\n')
+            self.transpiler.wOther('static const int ethan_count_index[] = {' + (', '.join(str(index) for _, index in sites) or '0') + '};\n\n')
+            self.use('counters')
+        self.transpiler.wMain("return 0;\n}")
+
+    def splice(self, headers, runtime, main):
+        # adds the C that another CGenerator wrote for some of the statements, as its
+        # headers, runtime and the joined transpiler.main
+        for header in headers: self.include(header)
+        for name in runtime: self.use(name)
+        self.transpiler.wMain(main)
+
+    def include(self, header):
+        if header not in self.headers:
+            self.headers[header] = True
+            self.transpiler.wHead('#include <' + header + '.h>')
+
+    def use(self, name):
+        # copies a piece of runtime.py into the program the first time it's needed
+        if name not in self.runtime:
+            self.runtime[name] = True
+            code, headers = RUNTIME[name]
+            for header in headers: self.include(header)
+            self.transpiler.wOther(code)
+
+    def count(self, line, kind):
+        # counts the runs of the C written next, as kind on line, when the program counts
+        if self.counters is None: return
+        index = self.counts.setdefault((line, kind), len(self.counts))
+        self.transpiler.wMain('ethan_counts[' + str(index) + ']++;\n')
+
+    def block(self, body):
+        for node in body:
+            getattr(self, 'stmt_' + type(node).__name__)(node)
+
+    # Statements
+
+    def stmt_Declare(self, node):
+        self.transpiler.wMain(C_TYPES[node.type] + ' ' + ','.join(node.names) + ';\n')
+
+    def stmt_Let(self, node):
+        self.transpiler.wMain(C_TYPES[node.type] + ' ' + node.name + ' = ' + self.expr(node.value) + ';\n')
+
+    def stmt_Assign(self, node):
+        self.transpiler.wMain(node.name + ' = ' + self.expr(node.value) + ';\n')
+
+    def stmt_If(self, node, kind='if'):
+        self.transpiler.wMain('if (' + self.cond(node.cond) + ') {\n')
+        self.count(node.line, kind)
+        self.block(node.body)
+        self.transpiler.wMain('}\n')
+        if node.orelse is None: return
+        if len(node.orelse) == 1 and type(node.orelse[0]) is If:
+            self.transpiler.wMain('else ')
+            self.stmt_If(node.orelse[0], 'else if')
+        else:
+            self.transpiler.wMain('else {\n')
+            self.count(node.line if node.else_line is None else node.else_line, 'else')
+            self.block(node.orelse)
+            self.transpiler.wMain('}\n')
+
+    def stmt_While(self, node):
+        self.transpiler.wMain('while (' + self.cond(node.cond) + ') {\n')
+        self.count(node.line, 'while')
+        self.block(node.body)
+        self.transpiler.wMain('}\n')
+
+    def stmt_Print(self, node):
+        # one call per print: fputs when everything is known, else printf with one format
+        self.include('stdio')
+        self.count(node.line, 'print')
+        texts = []
+        specifiers = set()
+        args = []
+        last = len(node.items) - 1
+        for i, item in enumerate(node.items):
+            if type(item) is Str:
+                texts.append(item.value)
+            elif type(item) is Num and item.ctype in INT_LIMITS:
+                texts.append(str(item.value))
+            else:
+                specifiers.add(len(texts))
+                texts.append(PRINTF_SPECIFIERS[item.type])
+                args.append(self.expr(item))
+            texts.append(node.separator if i < last else node.end)
+        if args:
+            for i in range(len(texts)):
+                if i not in specifiers: texts[i] = texts[i].replace('%', '%%')
+            self.transpiler.wMain('printf("' + ''.join(texts) + '", ' + ', '.join(args) + ');\n')
+        elif any(texts):
+            self.transpiler.wMain('fputs("' + ''.join(texts) + '", stdout);\n')
+
+    def stmt_Get(self, node):
+        self.include('stdio')
+        if node.new: self.transpiler.wMain(C_TYPES[node.type] + ' ' + ','.join(node.new) + ';\n')
+        self.count(node.line, 'get')
+        if self.fast_input:
+            # the reader flushes stdout itself whenever it has to wait for input
+            self.use('reader')
+            self.transpiler.wMain(' '.join(READER_FUNCTIONS[node.type] + '(&' + var + ');' for var in node.names) + '\n')
+            return
+        # so a prompt printed just before shows up
+        if self.stdout_buffer: self.transpiler.wMain('fflush(stdout);\n')
+        self.transpiler.wMain('scanf("' + SCANF_SPECIFIERS[node.type] * len(node.names) + '", ' + ', '.join('&' + var for var in node.names) + ');\n')
+
+    # Expressions
+
+    def expr(self, node):
+        t = type(node)
+        if t is Num: return self.literal(node)
+        if t is Var: return node.name
+        if t is Unary:
+            operand = self.expr(node.operand)
+            if operand[0] in '+-' or type(node.operand) not in (Num, Var): operand = '(' + operand + ')'
+            return node.op + operand
+        if t is BinOp:
+            prec = PRECEDENCE[node.op]
+            left = self.expr(node.left)
+            if type(node.left) is BinOp and PRECEDENCE[node.left.op] < prec: left = '(' + left + ')'
+            right = self.expr(node.right)
+            # a - (b - c), and no 'a--b' for a - -b
+            if (type(node.right) is BinOp and PRECEDENCE[node.right.op] <= prec) or right[0] in '+-': right = '(' + right + ')'
+            return left + node.op + right
+        # a bare truth value, as in 'not x'
+        return self.cond(node)
+
+    def literal(self, node):
+        # written so that C reads it back as the same value of the same type
+        if node.ctype in INT_LIMITS:
+            suffix = 'LL' if node.ctype == 'long long' else ''
+            # -2147483648 would be the negation of a long long
+            if node.value == INT_LIMITS[node.ctype][0]: return '(' + str(node.value + 1) + suffix + '-1)'
+            return str(node.value) + suffix
+        if node.ctype == 'float': return repr(node.value) + 'f'
+        return repr(node.value)
+
+    def cond(self, node):
+        t = type(node)
+        if t is Compare:
+            return self.expr(node.left) + ' ' + node.op + ' ' + self.expr(node.right)
+        if t is Logical:
+            left = self.cond(node.left)
+            right = self.cond(node.right)
+            if node.op == 'and':
+                if type(node.left) is Logical and node.left.op == 'or': left = '(' + left + ')'
+                if type(node.right) is Logical and node.right.op == 'or': right = '(' + right + ')'
+            return left + LOGICAL_OPERATORS[node.op] + right
+        if t is Not:
+            return '!(' + self.cond(node.operand) + ')'
+        return self.expr(node)
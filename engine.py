@@ -0,0 +1,761 @@
+# Transpiler for scripting language : Ethan
+#
+# One Lexer and Parser for every language: the Lexer turns each keyword into the English
+# keyword its pack (languages.py) maps it to, and the Parser only ever sees those.
+
+# Imports
+import re, sys
+from array import array
+from languages import PACKS, DEFAULT
+from symbols import SymbolTable, ASSIGNABLE
+from nodes import Program, Declare, Let, Assign, If, While, Print, Get, Num, Str, Var, Unary, BinOp, Compare, Logical, Not
+
+# Tokens Type
+
+__INT__ = {
+    'name': 'int32',
+    'type' : 'int',
+    'range' : range(-2147483648, 2147483648),
+    'specifier' : '%d'
+}
+
+__LONG__ = {
+    'name': 'int64',
+    'type' : 'long',
+    'range' : range(-9223372036854775808, 9223372036854775808),
+    'specifier' : '%lld'
+}
+
+__FLOAT__ = {
+    #range: -3.4e-38 to 3.4e38
+    'name': 'float',
+    'type' : 'float',
+    'min': -3.4e-38,
+    'max': 3.4e38,
+    'specifier' : '%f'
+}
+
+__DOUBLE__ = {
+    #range: -1.7e-308 to 1.7e308
+    'name': 'double',
+    'type' : 'double',
+    'min': -1.7e-308,
+    'max': 1.7e308,
+    'specifier' : '%lf'
+}
+
+TT_INT = {
+    'int': __INT__,
+    'long': __LONG__,
+
+}
+
+TT_FLOAT = {
+    'float': __FLOAT__,
+    'double': __DOUBLE__
+}
+
+TT_EXP = 'EXP'
+TT_STRING = 'STRING'
+TT_PLUS = 'PLUS'
+TT_MINUS = 'MINUS'
+TT_MUL = 'MULTIPLY'
+TT_DIV = 'DIVIDE'
+TT_MOD = 'MOD'
+TT_IDX = 'IDX'
+TT_EXC = 'EXC'
+TT_EQ = 'EQ'
+TT_EE = 'EE'
+TT_NE = 'NE'
+TT_GT = 'GT'
+TT_GTE = 'GTE'
+TT_LT = 'LT'
+TT_LTE = 'LTE'
+TT_LPAREN = 'LPAREN'
+TT_RPAREN = 'RPAREN'
+TT_LSQB = 'LSQB'
+TT_RSQB = 'RSQB'
+TT_COMMA = 'COMMA'
+TT_NEWLINE = 'NEWLINE'
+TT_EOF = 'EOF'
+TT_KEYWORD = 'KEYWORD'
+TT_IDENTIFIRE = 'IDENTIFIRE'
+
+# Integer codes of the token types, which the TokenBuffer stores and the Parser compares.
+# Number literals come first (their type is the Ethan type of the literal), then the
+# comparison operators, so that each of the two is a range of codes.
+TOKEN_TYPES = (
+    'int', 'long', 'float', 'double', 'exp',
+    TT_GT, TT_GTE, TT_LT, TT_LTE, TT_EE, TT_NE,
+    TT_PLUS, TT_MINUS, TT_MUL, TT_DIV, TT_MOD, TT_EQ, TT_EXC, TT_COMMA, TT_LPAREN, TT_RPAREN,
+    TT_IDX, TT_LSQB, TT_RSQB, TT_EXP, TT_STRING, TT_KEYWORD, TT_IDENTIFIRE, TT_NEWLINE, TT_EOF,
+)
+CODES = {type_: code for code, type_ in enumerate(TOKEN_TYPES)}
+
+C_LAST_NUMBER = CODES['exp']
+C_GT, C_NE = CODES[TT_GT], CODES[TT_NE]
+C_PLUS, C_MINUS, C_MUL, C_DIV, C_MOD = CODES[TT_PLUS], CODES[TT_MINUS], CODES[TT_MUL], CODES[TT_DIV], CODES[TT_MOD]
+C_EQ, C_EXC, C_COMMA, C_LPAREN, C_RPAREN = CODES[TT_EQ], CODES[TT_EXC], CODES[TT_COMMA], CODES[TT_LPAREN], CODES[TT_RPAREN]
+C_IDX, C_STRING, C_KEYWORD, C_IDENTIFIRE = CODES[TT_IDX], CODES[TT_STRING], CODES[TT_KEYWORD], CODES[TT_IDENTIFIRE]
+C_NEWLINE, C_EOF = CODES[TT_NEWLINE], CODES[TT_EOF]
+
+# Tokens in each TokenBuffer of Lexer.stream(), give or take a line
+CHUNK_TOKENS = 1 << 13
+
+# Type keywords of 'declare' and 'get' and the types they stand for
+DECLARE_TYPES = {'int': 'int', 'long': 'long', 'float': 'float', 'double': 'double'}
+GET_TYPES = dict(DECLARE_TYPES, exp='exp')
+
+# Lexer rules, tried in order at every position of the source by one master regex.
+# A number may only take an exponent right after a digit ('5.e3' is '5.' then 'e3'),
+# and '//' is lexed as IDX followed by '/', just like the old character scanner did.
+# The language's pack gives the rule for words.
+def lexer_rules(word):
+    return [
+        ('SKIP', r'[ \t]+'),
+        (TT_NEWLINE, r'\n'),
+        ('COMMENT', r'#[^\n]*\n?'),
+        ('NUMBER', r'(?:\d+(?:\.\d*)?|\.\d+)(?:(?<=\d)[eE]-?\d+)?'),
+        (TT_IDENTIFIRE, word),
+        (TT_STRING, r'"[^"]*"?|\'[^\']*\'?'),
+        (TT_IDX, r'/(?=/)'),
+        ('OPERATOR', r'==|!=|>=|<=|[-+*/%,=!><()]'),
+        ('MISMATCH', r'(?s:.)'),
+    ]
+
+class Language:
+    # a keyword pack compiled for the Lexer: its master regex, and one dict from each
+    # keyword to the English one
+    def __init__(self, pack):
+        self.regex = re.compile('|'.join('(?P<%s>%s)' % rule for rule in lexer_rules(pack['word'])))
+        self.keywords = dict(pack['keywords'])
+
+LANGUAGES = {name: Language(pack) for name, pack in PACKS.items()}
+
+OPERATORS = {
+    '+': (TT_PLUS, '+'),
+    '-': (TT_MINUS, '-'),
+    '*': (TT_MUL, '*'),
+    '/': (TT_DIV, '/'),
+    '%': (TT_MOD, '%'),
+    ',': (TT_COMMA,),
+    '=': (TT_EQ, '='),
+    '==': (TT_EE, '=='),
+    '!': (TT_EXC,),
+    '!=': (TT_NE, '!='),
+    '>': (TT_GT, '>'),
+    '>=': (TT_GTE, '>='),
+    '<': (TT_LT, '<'),
+    '<=': (TT_LTE, '<='),
+    '(': (TT_LPAREN, '('),
+    ')': (TT_RPAREN, ')'),
+}
+# the code and value of each operator's token
+OPERATOR_CODES = {op: (CODES[tok[0]], tok[1] if len(tok) > 1 else None) for op, tok in OPERATORS.items()}
+
+class Token:
+    def __init__(self, type_, value=None, line=None):
+        self.type = type_
+        self.value = value
+        self.line = line
+
+    def match(self,type_, value=None):
+        return self.type == type_ and self.value == value
+
+    def __repr__(self):
+        if self.value:
+            return f'{self.type}:{self.value}'
+        else:
+            return f'{self.type}'
+
+class TokenBuffer:
+    # The tokens of a source as parallel arrays rather than Token objects: the type code,
+    # the start and end of the lexeme in the source, the line, and the value as an index
+    # into a table holding each distinct value once. Indexing and iterating it give Token
+    # objects, so it can stand in for a list of tokens.
+    def __init__(self, text=''):
+        offset = 'I' if len(text) < 1 << 32 else 'Q'
+        self.text = text
+        self.types = array('B')
+        self.starts = array(offset)
+        self.ends = array(offset)
+        self.lines = array('I')
+        self.value_ids = array('I')
+        self.values = [None]
+        self.strings = {} # index of each str value
+        self.numbers = {} # index of each number, by class too since 1 == 1.0
+
+    @classmethod
+    def from_tokens(cls, tokens):
+        buffer = cls()
+        for tok in tokens:
+            buffer.append(CODES[tok.type], tok.value, tok.line or 0, 0, 0)
+        if not buffer.types: buffer.append(C_EOF, None, 0, 0, 0)
+        return buffer
+
+    def append(self, code, value, line, start, end):
+        if value is None:
+            value_id = 0
+        else:
+            if value.__class__ is str: index, key = self.strings, value
+            else: index, key = self.numbers, (value.__class__, value)
+            value_id = index.get(key)
+            if value_id is None:
+                value_id = index[key] = len(self.values)
+                self.values.append(value)
+        self.types.append(code)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lines.append(line)
+        self.value_ids.append(value_id)
+
+    def lexeme(self, i):
+        # the source text of token i
+        return self.text[self.starts[i]:self.ends[i]]
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, i):
+        return Token(TOKEN_TYPES[self.types[i]], self.values[self.value_ids[i]], self.lines[i])
+
+    def __iter__(self):
+        for i in range(len(self.types)):
+            yield self[i]
+
+class Lexer:
+    def __init__(self, text, language=DEFAULT):
+        self.text = text
+        self.language = LANGUAGES[language]
+        self.keywords = self.language.keywords
+        self.error = False
+
+    def abort(self, message):
+        print("Error: " + message)
+        self.error = True
+        return None
+
+    def tokenizer(self):
+        tokens = self.tokenize()
+        if self.error: return [], None
+        return tokens
+
+    def tokenize(self, line=1):
+        # Returns the tokens as a TokenBuffer, counting lines from line. A lexing error ends
+        # them with EOF.
+        return next(self.stream(line, None))
+
+    def stream(self, line=1, size=CHUNK_TOKENS):
+        # Yields the tokens of tokenize() as TokenBuffers of about size tokens each (all of
+        # them in one with size None), lexing each only when the one before it is done with.
+        # A buffer ends after a newline, the last one with EOF.
+        limit = size or sys.maxsize
+        buffer = TokenBuffer(self.text)
+        append = buffer.append
+        types = buffer.types
+        keywords = self.keywords
+        for mo in self.language.regex.finditer(self.text):
+            kind = mo.lastgroup
+            if kind == 'SKIP':
+                continue
+            elif kind == TT_IDENTIFIRE:
+                word = mo.group()
+                keyword = keywords.get(word)
+                if keyword is None: append(C_IDENTIFIRE, word, line, mo.start(), mo.end())
+                else: append(C_KEYWORD, keyword, line, mo.start(), mo.end())
+            elif kind == 'OPERATOR':
+                append(*OPERATOR_CODES[mo.group()], line, mo.start(), mo.end())
+            elif kind == TT_NEWLINE:
+                append(C_NEWLINE, None, line, mo.start(), mo.end())
+                line += 1
+                if len(types) >= limit:
+                    yield buffer
+                    buffer = TokenBuffer(self.text)
+                    append = buffer.append
+                    types = buffer.types
+            elif kind == 'COMMENT':
+                if mo.group()[-1] == '\n': line += 1
+            elif kind == 'NUMBER':
+                tok = self.make_number(mo.group())
+                if tok is None: break
+                append(CODES[tok.type], tok.value, line, mo.start(), mo.end())
+            elif kind == TT_STRING:
+                tok = self.make_string(mo.group())
+                append(C_STRING, tok.value, line, mo.start(), mo.end())
+                line += tok.value.count('\n')
+            elif kind == TT_IDX:
+                append(C_IDX, None, line, mo.start(), mo.end())
+            else:
+                self.abort("Unexpected character: " + '"' + mo.group() + '"' + " on line " + str(line))
+                break
+        append(C_EOF, None, line, len(self.text), len(self.text))
+        yield buffer
+
+    def make_number(self, num_str):
+        if '.' not in num_str and 'e' not in num_str and 'E' not in num_str:
+            # int
+            num = int(num_str)
+            if num in TT_INT['int']['range']:
+                return Token(TT_INT['int']['type'], num)
+            else:
+                return Token(TT_INT['long']['type'], num)
+        else:
+            # float
+            num = float(num_str)
+            if 'e' in num_str or 'E' in num_str:
+                return Token('exp', num)
+            else:
+                if num >= TT_FLOAT['float']['min'] and num <= TT_FLOAT['float']['max']:
+                    return Token(TT_FLOAT['float']['type'], num)
+                elif num >= TT_FLOAT['double']['min'] and num <= TT_FLOAT['double']['max']:
+                    return Token(TT_FLOAT['double']['type'], num)
+                else:
+                    return self.abort("Value overflow: " + num_str)
+
+    def make_string(self, lexeme):
+        # the closing quote is optional: an unterminated string runs to the end of the file
+        qt = lexeme[0]
+        if len(lexeme) > 1 and lexeme[-1] == qt: return Token(TT_STRING, lexeme[1:-1])
+        return Token(TT_STRING, lexeme[1:])
+
+class Parser:
+    # Builds a nodes.Program from the tokens; the C is written from it by codegen.CGenerator.
+    # tokens is a TokenBuffer, a list of Token objects (copied into one), or an iterator of
+    # TokenBuffers like Lexer.stream(), the next of which is only taken once the parser is
+    # through the one before, so the source is lexed as it's parsed and only one buffer is
+    # kept. The current token is read out of its buffer into type (a code), value and line;
+    # idx is its index in the buffer, and base the number of tokens in the ones before.
+    def __init__(self, tokens):
+        if isinstance(tokens, TokenBuffer): tokens = iter((tokens,))
+        elif isinstance(tokens, list): tokens = iter((TokenBuffer.from_tokens(tokens),))
+        self.chunks = tokens
+        self.base = 0
+        self.load(next(tokens))
+        self.idx = -1
+        self.error = False
+        self.symbols = SymbolTable()
+        self.scope = 0 # nesting depth of if/else/while bodies
+        self.advance()
+
+    def load(self, buffer):
+        self.buffer = buffer
+        self.types = buffer.types
+        self.lines = buffer.lines
+        self.value_ids = buffer.value_ids
+        self.values = buffer.values
+        self.last = len(buffer) - 1
+
+    def advance(self):
+        i = self.idx
+        if i < self.last: self.idx = i = i + 1
+        elif self.chunks is not None: i = self.next_chunk() # stays on EOF
+        self.type = self.types[i]
+        self.value = self.values[self.value_ids[i]]
+        self.line = self.lines[i]
+
+    def next_chunk(self):
+        # moves on to the first token of the next buffer, returns its index
+        buffer = next(self.chunks, None)
+        if buffer is None:
+            self.chunks = None
+            return self.idx
+        self.base += len(self.buffer)
+        self.load(buffer)
+        self.idx = 0
+        return 0
+
+    def keyword(self, word):
+        # the current token is the (English) keyword word
+        return self.type == C_KEYWORD and self.value == word
+
+    def given(self):
+        # the current token as the source spells it, for messages
+        return self.buffer.lexeme(self.idx) or str(self.value if self.value is not None else TOKEN_TYPES[self.type])
+
+    def parse(self):
+        # returns the Program, or None after an error
+        print("Compiling started...")
+        _body = []
+        for _nodes in self.statements(): _body += _nodes
+        if self.error: return None
+        print("Compiling finished!")
+        return Program(_body)
+
+    def statements(self):
+        # the nodes of each top-level statement in turn, up to EOF or an error
+        while self.type != C_EOF:
+            yield self.statement()
+            if self.error: return
+
+    def abort(self, message):
+        print("Error: " + message)
+        self.error = True
+
+    def declare_var(self, _var, _type=None):
+        self.symbols.declare(_var, _type, self.line, self.scope)
+
+    def type_check_for_reassign(self, _var, _type):
+        if not _type in ASSIGNABLE:
+            self.abort("Unexpected Data-Type: " + str(_type))
+        elif not self.symbols.accepts(_var, _type):
+            self.abort("Worng Type-Casting: " + "'" + _var + "'" + ' is not declared with ' + _type + ' type!')
+
+    def _nl(self):
+        # NewLine
+        while self.type == C_NEWLINE:
+            self.advance()
+
+    def isComparisionOperator(self):
+        return C_GT <= self.type <= C_NE
+
+    def identifire(self):
+        # the name of the current identifire, which is then skipped
+        _name = self.value
+        if self.type != C_IDENTIFIRE:
+            self.abort("Expected: An identifire\nGiven: " + TOKEN_TYPES[self.type])
+        self.advance()
+        return _name
+
+    def is_word(self):
+        # the optional 'is' some languages put between a condition and 'then' or 'repeat'
+        if self.keyword('is'): self.advance()
+
+    def block(self):
+        # statements up to the closing 'end', which is left as the current token
+        _body = []
+        self._nl()
+        while not self.keyword('end') and self.type != C_EOF and not self.error:
+            _body += self.statement()
+        if not self.error and not self.keyword('end'):
+            self.abort("Expected: 'end' keyword\n\tGiven: " + str(self.value))
+        return _body
+
+    def var_declare(self):
+        # declare
+        _line = self.line
+        _vars = []
+        self.advance()
+        while True:
+            if self.value in self.symbols:
+                self.abort("Identifire: '" + self.value + "' has been declared already!\n       Probably want to use 'now' to assign its value.")
+            self.declare_var(self.value)
+            _vars.append(self.identifire())
+            if self.type != C_COMMA: break
+            self.advance()
+
+        if not self.keyword('as'):
+            self.abort("Expected: keyword, 'as'\nGiven: " + str(self.value))
+        self.advance()
+        _type = DECLARE_TYPES.get(self.value) if self.type == C_KEYWORD else None
+        if _type is None:
+            self.abort("Unexpected: " + str(self.value) + "\n\tExpected: 'int', 'long', 'float' or 'double'")
+            return []
+        for var in _vars: self.symbols.set_type(var, _type)
+        self.advance()
+        return [Declare(_vars, _type, _line)]
+
+    def var_assign(self):
+        # let
+        _lets = []
+        self.advance()
+        while True:
+            _line = self.line
+            if self.value in self.symbols:
+                self.abort("Identifire: '" + self.value + "' has been declared already!\n\tProbably want to use 'now' instead of 'let' to change its value.")
+            self.declare_var(self.value)
+            _var = self.identifire()
+            if self.type != C_EQ:
+                self.abort("Expected: '='\nGiven: " + TOKEN_TYPES[self.type])
+            self.advance()
+            _value = self.expression()
+            if _value.type in ASSIGNABLE: self.symbols.set_type(_var, _value.type)
+            else: self.abort("Unexpected Data-Type: " + str(_value.type) + 'for ' + _var)
+            _lets.append(Let(_var, _value, _line))
+            if self.type != C_COMMA: break
+            self.advance()
+        return _lets
+
+    def var_reassign(self):
+        # reassign
+        _assigns = []
+        while True:
+            _line = self.line
+            if self.type == C_IDENTIFIRE and not self.value in self.symbols:
+                self.abort(self.value + " hasn't been declared yet!")
+            _var = self.identifire()
+            if self.type != C_EQ:
+                self.abort("Expected: '='\nGiven: " + TOKEN_TYPES[self.type])
+            self.advance()
+            _value = self.expression()
+            self.type_check_for_reassign(_var, _value.type)
+            _assigns.append(Assign(_var, _value, _line))
+            if self.type != C_COMMA: break
+            self.advance()
+        return _assigns
+
+    def if_stmt(self):
+        # if
+        _line = self.line
+        self.advance()
+        _cond = self.comparision()
+        self.is_word()
+        if not self.keyword('then'):
+            self.abort("Expected: keyword, 'then'\nGiven: " + str(self.value))
+        self.advance()
+        self.scope += 1
+        if self.type != C_NEWLINE:
+            _body = self.statement()
+            self.scope -= 1
+        else:
+            _body = self.block()
+            self.scope -= 1
+            self.advance()
+            if self.type == C_NEWLINE:
+                self._nl()
+        _else_line = self.line if self.keyword('else') else None
+        return [If(_cond, _body, self.else_expr(), _line, _else_line)]
+
+    def else_expr(self):
+        # the statements of an 'else', [If] for an 'else if', or None
+        if not self.keyword('else'): return None
+        self.advance()
+        if self.keyword('if'):
+            # else if
+            return self.if_stmt()
+        # else
+        self.scope += 1
+        if self.type != C_NEWLINE:
+            _body = self.statement()
+        else:
+            _body = self.block()
+            self.advance()
+        self.scope -= 1
+        return _body
+
+    def while_stmt(self):
+        # while
+        _line = self.line
+        self.advance()
+        _cond = self.comparision()
+        self.is_word()
+        if not self.keyword('repeat'):
+            self.abort("Expected: 'repeat' keyword\nGiven: " + str(self.value))
+        self.advance()
+        self.scope += 1
+        if self.type != C_NEWLINE:
+            _body = self.statement()
+        else:
+            _body = self.block()
+            self.advance()
+        self.scope -= 1
+        return [While(_cond, _body, _line)]
+
+    def print_stmt(self):
+        # print
+        _line = self.line
+        _items = []
+        _end = '\\n'
+        _separator = ' '
+        self.advance()
+        while True:
+            if self.type == C_STRING:
+                _items.append(Str(self.value, self.line))
+                self.advance()
+            else:
+                _items.append(self.expression())
+            if self.type != C_COMMA: break
+            self.advance()
+
+        while self.type == C_EXC:
+            self.advance()
+            if self.keyword('separator'):
+                self.advance()
+                if self.type != C_STRING:
+                    self.abort("Expected a string or a '.'")
+                else:
+                    _separator = self.value
+                    self.advance()
+            elif self.keyword('end'):
+                self.advance()
+                if self.type != C_STRING:
+                    self.abort("NEED STRING")
+                else:
+                    _end = self.value
+                    self.advance()
+        return [Print(_items, _separator, _end, _line)]
+
+    def get_stmt(self):
+        # get
+        _line = self.line
+        _vars = []
+        _undeclared_vars = []
+        self.advance()
+        while True:
+            if self.type == C_IDENTIFIRE and not self.value in self.symbols and not self.value in _undeclared_vars:
+                _undeclared_vars.append(self.value)
+            _vars.append(self.identifire())
+            if self.type != C_COMMA: break
+            self.advance()
+        if not self.keyword('as'):
+            self.abort("Expected: keyword, 'as'\nGiven: " + str(self.value))
+        self.advance()
+        _type = GET_TYPES.get(self.value) if self.type == C_KEYWORD else None
+        if _type is None:
+            self.abort("Expected 'int', 'long', 'float' or 'double'")
+            return []
+        for var in _undeclared_vars: self.declare_var(var, _type)
+        self.advance()
+        return [Get(_vars, _type, _undeclared_vars, _line)]
+
+    def comparision(self):
+        # or
+        _node = self.and_expr()
+        while self.keyword('or'):
+            _line = self.line
+            self.advance()
+            _node = Logical('or', _node, self.and_expr(), _line)
+        return _node
+
+    def and_expr(self):
+        # and
+        _node = self.comp_expr()
+        while self.keyword('and'):
+            _line = self.line
+            self.advance()
+            _node = Logical('and', _node, self.comp_expr(), _line)
+        return _node
+
+    def comp_expr(self, _negated=False):
+        # comparision; after a 'not' a bare expression is taken as its truth value
+        _line = self.line
+        if self.keyword('not'):
+            self.advance()
+            return Not(self.comp_expr(True), _line)
+        _left = self.expression()
+        if self.isComparisionOperator():
+            _op = self.value
+            self.advance()
+            return Compare(_op, _left, self.expression(), _line)
+        if not _negated: self.abort("Expected < or > or =< or <=")
+        return _left
+
+    def expression(self):
+        # expression
+        _node = self.term()
+        while self.type in (C_PLUS, C_MINUS):
+            _op = self.value
+            _line = self.line
+            self.advance()
+            _node = BinOp(_op, _node, self.term(), _line)
+        return _node
+
+    def term(self):
+        # term
+        _node = self.unary()
+        while self.type in (C_MUL, C_DIV, C_MOD):
+            _op = self.value
+            _line = self.line
+            self.advance()
+            _node = BinOp(_op, _node, self.unary(), _line)
+        return _node
+
+    def unary(self):
+        # unary
+        if self.type in (C_PLUS, C_MINUS):
+            _op = self.value
+            _line = self.line
+            self.advance()
+            return Unary(_op, self.primary(), _line)
+        return self.primary()
+
+    def primary(self):
+        _type = self.type
+        _value = self.value
+        _line = self.line
+        if _type <= C_LAST_NUMBER:
+            self.advance()
+            return Num(_value, TOKEN_TYPES[_type], _line)
+        elif _type == C_IDENTIFIRE:
+            _symbol = self.symbols.lookup(_value)
+            if _symbol is None:
+                self.abort(_value + " hasn't been declared yet!")
+            self.advance()
+            if _symbol is None: return Var(_value, 'int', _line)
+            # a variable used in its own 'let' has no type yet
+            return Var(_value, _symbol.type or 'int', _line)
+        elif _type == C_LPAREN:
+            self.advance()
+            _node = self.expression()
+            if self.type != C_RPAREN:
+                self.abort("Expected: A ')'\nGiven: " + str(self.buffer[self.idx]))
+            self.advance()
+            return _node
+        else:
+            self.abort("Unknown data-type :" + str(_value))
+            return Num(0, 'int', _line)
+
+    def statement(self):
+        # the nodes of one statement, none for empty lines
+        if self.type == C_NEWLINE:
+            self._nl()
+            return []
+
+        elif self.keyword('declare'):
+            return self.var_declare()
+
+        elif self.keyword('let'):
+            return self.var_assign()
+
+        elif self.type == C_IDENTIFIRE:
+            return self.var_reassign()
+
+        elif self.keyword('if'):
+            return self.if_stmt()
+
+        elif self.keyword('while'):
+            return self.while_stmt()
+
+        elif self.keyword('print'):
+            return self.print_stmt()
+
+        elif self.keyword('get'):
+            return self.get_stmt()
+
+        else:
+            self.abort("Unexpected " + self.given())
+            return []
+
+'''
+
+# This is for debuging process only.
+
+test_data = """
+print "Enter 3 numbers:"
+get x,y,z as int
+
+if x>y and x>z then print x , 'is greater!' else if x<y and z<y then print y , 'is greater!' else print z , 'is greater!'
+
+let i = 10
+while i>0 repeat
+    print i
+    i = i - 1
+end
+print 'The End' !end ''
+"""
+
+lexer = Lexer(test_data)
+tokens = lexer.tokenizer()
+#print(tokens)
+
+program = Parser(tokens).parse()
+transpiler = Transpiler()
+CGenerator(transpiler).generate(program)
+transpiler.transpile()
+
+'''
+
+"""
+    * Fix bug in print statement
+    * Add function
+    * Warp up, clean up and refactore the code
+"""
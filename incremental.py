@@ -0,0 +1,340 @@
+# Incremental compilation for scripting language : Ethan
+#
+# An Incremental keeps the last version of one source cut into units: runs of top-level
+# statements whose text ends with a newline token, so the lexer can start afresh after
+# each of them. When the source changes, the units in front of and behind the edit whose
+# text is unchanged are kept and only the text between them is lexed and parsed again.
+# A kept unit behind the edit is parsed again too when a variable it uses or declares
+# doesn't stand as it did before it (declared since, or with another type).
+#
+# The C of every unit is kept as well and the program's C is spliced together from it.
+# The optimizer works across statements, so the optimized C of the units is first made
+# by optimizing copies of all their nodes as one program and writing the part each unit
+# got. After an edit only the units parsed again are optimized, on their own, when that
+# gives what optimizing the whole program would: no variable of theirs, or of the units
+# they replace, is in any other unit, and neither has a new variable of the optimizer or
+# an expression reading no variable, which it could share with another unit. Otherwise
+# the whole program is optimized again.
+
+import engine, optimizer
+from codegen import CGenerator, Transpiler
+from languages import DEFAULT
+from nodes import Program
+from symbols import SymbolTable, Symbol
+
+# how a name stands in a unit's needs when it isn't declared
+MISSING = object()
+
+class Recorder(SymbolTable):
+    # A SymbolTable that notes how every name it's asked about stood before the current
+    # unit, in needs.
+    def __init__(self):
+        super().__init__()
+        self.needs = {}
+
+    def note(self, name):
+        if name not in self.needs:
+            symbol = self.symbols.get(name)
+            self.needs[name] = MISSING if symbol is None else symbol.type
+
+    def __contains__(self, name):
+        self.note(name)
+        return name in self.symbols
+
+    def declare(self, name, type_=None, line=None, scope=0):
+        self.note(name)
+        return super().declare(name, type_, line, scope)
+
+    def lookup(self, name):
+        self.note(name)
+        return self.symbols.get(name)
+
+    def type_of(self, name):
+        self.note(name)
+        return super().type_of(name)
+
+    def set_type(self, name, type_):
+        self.note(name)
+        super().set_type(name, type_)
+
+    def accepts(self, name, value_type):
+        self.note(name)
+        return super().accepts(name, value_type)
+
+    def stands(self, needs):
+        # are all the names as needs has them
+        for name, type_ in needs.items():
+            symbol = self.symbols.get(name)
+            if (MISSING if symbol is None else symbol.type) != type_: return False
+        return True
+
+    def apply(self, effects):
+        for name, type_ in effects.items(): self.symbols[name] = Symbol(name, type_)
+
+class Lexer(engine.Lexer):
+    # keeps its error messages in messages instead of printing them
+    def __init__(self, text, language=DEFAULT):
+        super().__init__(text, language)
+        self.messages = []
+
+    def abort(self, message):
+        self.messages.append("Error: " + message)
+        self.error = True
+
+class Parser(engine.Parser):
+    # keeps its error messages in messages instead of printing them
+    def __init__(self, tokens):
+        self.messages = []
+        super().__init__(tokens)
+
+    def abort(self, message):
+        self.messages.append("Error: " + message)
+        self.error = True
+
+class Unit:
+    # start and end are offsets into the source; the nodes' line numbers are off by lines.
+    # needs has how each name the unit looked at stood before it, effects how the ones it
+    # changed stand after it. c is the unit's C as (options, headers, runtime, main), options
+    # being those of the CGenerator it was written with that change the C. names has every
+    # variable it declares, reads or writes. optimized is its optimized C, as c is, followed
+    # by the variables the optimizer found unused in it and whether it is tied to the rest of
+    # the program (see entangled).
+    __slots__ = ('start', 'end', 'lines', 'nodes', 'needs', 'effects', 'c', 'names', 'optimized')
+
+    def __init__(self, start, end, nodes, needs, effects):
+        self.start = start
+        self.end = end
+        self.lines = 0
+        self.nodes = nodes
+        self.needs = needs
+        self.effects = effects
+        self.c = None
+        self.names = optimizer.assigned(nodes) | optimizer.referenced(nodes, set())
+        self.optimized = None
+
+def shares(node):
+    # node has a subexpression reading no variable that the optimizer would compute once
+    if optimizer.worth_keeping(node) and optimizer.key(node) is not None and not optimizer.names_in(node, set()): return True
+    return any(shares(optimizer.get_slot(*child)) for child in optimizer.child_slots(node))
+
+def entangled(nodes, names):
+    # the optimized nodes of a unit whose variables are names may be tied to other units: they
+    # use a new variable of the optimizer, or have an expression reading no variable at the
+    # top level, where the optimizer looks for repeats across units
+    if not optimizer.assigned(nodes) | optimizer.referenced(nodes, set()) <= names: return True
+    return any(shares(optimizer.get_slot(*slot)) for node in nodes for slot in optimizer.statement_slots(node))
+
+class Incremental:
+    def __init__(self, lang=DEFAULT):
+        self.reset(lang)
+
+    def reset(self, lang):
+        self.lang = lang
+        self.text = ''
+        self.units = []
+        # units of the last update kept as they were and parsed again
+        self.kept = 0
+        self.parsed = 0
+        self.fresh = 0
+        self.ran_out = False
+        self.messages = []
+        # the units the optimized C was last made for, with the options it was written with
+        # and the optimizer's stats for the program they made; units optimized that time
+        self.optimized = []
+        self.options = None
+        self.stats = None
+        self.reoptimized = 0
+
+    def update(self, text):
+        # brings the units up to date with text; returns False after an error, leaving them
+        # as they were
+        print("Compiling started...")
+        old, units = self.text, self.units
+        front = 0
+        while front < len(units):
+            unit = units[front]
+            if unit.end > len(text) or text[unit.start:unit.end] != old[unit.start:unit.end]: break
+            # the last unit may not end with a newline, and then text may go on where it ended
+            if unit.end == len(old) and len(text) != len(old): break
+            front += 1
+        shift = len(text) - len(old)
+        start = units[front - 1].end if front else 0
+        back = len(units)
+        while back > front:
+            unit = units[back - 1]
+            if unit.start + shift < start or text[unit.start + shift:unit.end + shift] != old[unit.start:unit.end]: break
+            back -= 1
+
+        # what's between the kept units is parsed on its own; when that runs into its end
+        # mid-statement, more and more of the units behind it are taken in
+        more = 1
+        while True:
+            table = Recorder()
+            for unit in units[:front]: table.apply(unit.effects)
+            end = units[back].start + shift if back < len(units) else len(text)
+            parsed = self.parse(text, start, end, table)
+            if parsed is not None: break
+            if not self.ran_out or back == len(units):
+                for message in self.messages: print(message)
+                return False
+            back = min(len(units), back + more)
+            more *= 2
+
+        self.fresh = len(parsed)
+        moved = []
+        for unit in units[back:]:
+            if table.stands(unit.needs):
+                table.apply(unit.effects)
+                moved.append(unit)
+                parsed.append(unit)
+                continue
+            again = self.parse(text, unit.start + shift, unit.end + shift, table)
+            if again is None:
+                for message in self.messages: print(message)
+                return False
+            self.fresh += len(again)
+            parsed += again
+
+        lines = text.count('\n', 0, end) - old.count('\n', 0, end - shift)
+        for unit in moved:
+            unit.start += shift
+            unit.end += shift
+            unit.lines += lines
+        self.text = text
+        self.units = units[:front] + parsed
+        self.parsed = self.fresh
+        self.kept = len(self.units) - self.fresh
+        print("Compiling finished!")
+        return True
+
+    def parse(self, text, start, end, table):
+        # the units of text[start:end], which starts one, or None after an error; ran_out
+        # tells whether the error came at the end of the text, where more text could help,
+        # and messages has what went wrong
+        self.ran_out = False
+        lexer = Lexer(text[start:end], self.lang)
+        tokens = lexer.tokenize(text.count('\n', 0, start) + 1)
+        self.messages = lexer.messages
+        if lexer.error: return None
+        parser = Parser(tokens)
+        self.messages = parser.messages
+        parser.symbols = table
+        types, ends = tokens.types, tokens.ends
+        units = []
+        nodes = []
+        offset = 0
+        table.needs = {}
+        for _nodes in parser.statements():
+            nodes += _nodes
+            if parser.error: break
+            if types[parser.idx - 1] == engine.C_NEWLINE:
+                units.append(self.unit(start + offset, start + ends[parser.idx - 1], nodes, table))
+                offset = ends[parser.idx - 1]
+                nodes = []
+                table.needs = {}
+        if parser.error:
+            # text behind could be lexed differently (a string left open) and have a lexing
+            # error, which would have come first
+            last = len(types) - 2
+            clean = end == len(text) or last < 0 or (types[last] == engine.C_NEWLINE and ends[last] == end - start)
+            self.ran_out = parser.type == engine.C_EOF or not clean
+            return None
+        if offset < end - start:
+            # the text doesn't end with a newline: fine only at the end of the source
+            if end < len(text):
+                self.ran_out = True
+                return None
+            units.append(self.unit(start + offset, end, nodes, table))
+        return units
+
+    def unit(self, start, end, nodes, table):
+        effects = {}
+        for name, before in table.needs.items():
+            symbol = table.symbols.get(name)
+            if symbol is not None and symbol.type != before: effects[name] = symbol.type
+        return Unit(start, end, nodes, table.needs, effects)
+
+    def program(self, units=None):
+        # a Program of copies of the nodes of units (all of them by default), which the
+        # optimizer may change freely
+        body = []
+        for unit in self.units if units is None else units:
+            for node in unit.nodes: body.append(node.copy(unit.lines))
+        return Program(body)
+
+    def generate(self, generator, optimize=False):
+        # writes the program's C through generator from the C kept for each unit; with
+        # optimize, the optimized program's, and returns the optimizer's stats
+        stats = None
+        if generator.counters is not None:
+            # the counters are numbered through the whole program
+            program = self.program()
+            if optimize:
+                stats = optimizer.optimize(program)
+                self.reoptimized = len(self.units)
+            generator.generate(program)
+            return stats
+        options = (generator.stdout_buffer, generator.fast_input)
+        if optimize: stats = self.optimize(options)
+        generator.start()
+        for unit in self.units:
+            if optimize: c = unit.optimized
+            else:
+                if unit.c is None or unit.c[0] != options: unit.c = self.write(unit.nodes, options)
+                c = unit.c
+            generator.splice(*c[1:4])
+        generator.finish()
+        return stats
+
+    def write(self, nodes, options):
+        part = CGenerator(Transpiler(None), *options)
+        part.block(nodes)
+        return (options, list(part.headers), list(part.runtime), ''.join(part.transpiler.main))
+
+    def optimize(self, options):
+        # brings the units' optimized C up to date; returns the optimizer's stats
+        before, now = set(self.optimized), set(self.units)
+        removed = [unit for unit in self.optimized if unit not in now]
+        added = [unit for unit in self.units if unit not in before]
+        names = set()
+        for unit in removed + added: names |= unit.names
+        stats = None
+        if (self.stats is not None and options == self.options and not any(unit.optimized[5] for unit in removed)
+                and not any(name.startswith('_t') for name in names)
+                and all(unit.names.isdisjoint(names) for unit in self.units if unit in before)):
+            stats = self.optimize_units(added, options)
+            if any(unit.optimized[5] for unit in added): stats = None
+        if stats is None:
+            stats = self.optimize_units(self.units, options)
+            self.reoptimized = len(self.units)
+        else:
+            # what the optimizer did to the rest of the program is as it was
+            gone = optimizer.optimize(self.program(removed))
+            for name, count in stats.items():
+                if name != 'unused': stats[name] = self.stats[name] - gone[name] + count
+            stats['unused'] = [name for unit in self.units for name in unit.optimized[4]]
+            self.reoptimized = len(added)
+        self.optimized = list(self.units)
+        self.options = options
+        self.stats = stats
+        return dict(stats, unused=list(stats['unused']))
+
+    def optimize_units(self, units, options):
+        # optimizes copies of the nodes of units as one program and keeps the optimized C
+        # of each unit's part of it; returns the optimizer's stats
+        program = self.program(units)
+        stats = optimizer.optimize(program)
+        # the optimized statements stay in order and on the lines of the unit they came from
+        starts = [(unit.nodes[0].line + unit.lines, []) for unit in units if unit.nodes]
+        i = 0
+        for node in program.body:
+            while i + 1 < len(starts) and starts[i + 1][0] <= node.line: i += 1
+            starts[i][1].append(node)
+        parts = iter(nodes for _, nodes in starts)
+        unused, taken = stats['unused'], 0
+        for unit in units:
+            nodes = next(parts) if unit.nodes else []
+            first = taken
+            while taken < len(unused) and unused[taken] in unit.names: taken += 1
+            unit.optimized = self.write(nodes, options) + (unused[first:taken], entangled(nodes, unit.names))
+        return stats
@@ -0,0 +1,38 @@
+# Keyword packs of scripting language : Ethan
+#
+# A pack maps every keyword of a language to the (English) keyword the engine's Parser
+# knows it by, so one Lexer and Parser read every language. Supporting another language
+# is adding its pack here.
+
+PACKS = {
+    'en': {
+        # first bytes of a file written in the language, see Ethan.dt_language
+        'headers': ('#!English', '#!english'),
+        # what the Lexer takes as a name: a keyword or an identifire
+        'word': r'\w+',
+        'keywords': {
+            'declare': 'declare', 'as': 'as', 'let': 'let', 'imagine': 'let',
+            'now': 'now', 'if': 'if', 'then': 'then', 'else': 'else', 'end': 'end',
+            'while': 'while', 'repeat': 'repeat', 'and': 'and', 'or': 'or', 'not': 'not',
+            'print': 'print', 'get': 'get', 'separator': 'separator', 'int': 'int',
+            'long': 'long', 'float': 'float', 'double': 'double', 'exp': 'exp'
+        },
+    },
+    'bn': {
+        'headers': ('#!বাংলা',),
+        # \w leaves out the vowel signs
+        'word': r'[\u0980-\u09FF\w]+',
+        # spelled with the precomposed letters (U+09DC, U+09DF)
+        'keywords': {
+            'চলক': 'declare', 'যেন': 'as', 'ধরি': 'let', 'যদি': 'if', 'হয়': 'is',
+            'তবে': 'then', 'এছাড়া': 'else', 'শেষ': 'end', 'যতক্ষণ': 'while',
+            'ততক্ষণ': 'repeat', 'এবং': 'and', 'অথবা': 'or', 'নয়': 'not',
+            'দেখাও': 'print', 'নাও': 'get', 'পৃথককারী': 'separator',
+            'পূর্ণসংখ্যা': 'int', 'বড়_পূর্ণসংখ্যা': 'long', 'ভগ্নাংশ': 'float',
+            'বড়_ভগ্নাংশ': 'double', 'exp': 'exp'
+        },
+    },
+}
+
+# the language of a file without a header
+DEFAULT = 'en'
@@ -0,0 +1,222 @@
+# Syntax tree for scripting language : Ethan
+#
+# The parsers build it and codegen.CGenerator turns it into C. Every expression node
+# knows its Ethan type ('int', 'long', 'float', 'double' or 'exp') as soon as it's made.
+
+from semantics import LITERAL_CTYPES
+
+TYPE_RANK = {'int': 0, 'long': 1, 'float': 2, 'double': 3, 'exp': 4}
+
+def promote(a, b):
+    # type of an arithmetic expression mixing a and b: the wider of the two
+    return a if TYPE_RANK.get(a, -1) >= TYPE_RANK.get(b, -1) else b
+
+class Node:
+    # copy(lines) of every node gives a deep copy of it, with each line number moved by lines
+    __slots__ = ('line',)
+
+def copy_body(body, lines=0):
+    return [node.copy(lines) for node in body]
+
+# Statements
+
+class Program(Node):
+    __slots__ = ('body',)
+
+    def __init__(self, body, line=None):
+        self.body = body
+        self.line = line
+
+    def copy(self, lines=0):
+        return Program(copy_body(self.body, lines), self.line)
+
+class Declare(Node):
+    # declare a, b as int
+    __slots__ = ('names', 'type')
+
+    def __init__(self, names, type_, line=None):
+        self.names = names
+        self.type = type_
+        self.line = line
+
+    def copy(self, lines=0):
+        return Declare(list(self.names), self.type, self.line + lines)
+
+class Let(Node):
+    # let a = value; declares a with the type of value unless given another
+    __slots__ = ('name', 'value', 'type')
+
+    def __init__(self, name, value, line=None, type_=None):
+        self.name = name
+        self.value = value
+        self.type = type_ or value.type
+        self.line = line
+
+    def copy(self, lines=0):
+        return Let(self.name, self.value.copy(lines), self.line + lines, self.type)
+
+class Assign(Node):
+    # a = value
+    __slots__ = ('name', 'value')
+
+    def __init__(self, name, value, line=None):
+        self.name = name
+        self.value = value
+        self.line = line
+
+    def copy(self, lines=0):
+        return Assign(self.name, self.value.copy(lines), self.line + lines)
+
+class If(Node):
+    # orelse is None, a list of statements, or [If] for an 'else if'; else_line is the
+    # line of the 'else'
+    __slots__ = ('cond', 'body', 'orelse', 'else_line')
+
+    def __init__(self, cond, body, orelse=None, line=None, else_line=None):
+        self.cond = cond
+        self.body = body
+        self.orelse = orelse
+        self.line = line
+        self.else_line = else_line
+
+    def copy(self, lines=0):
+        orelse = None if self.orelse is None else copy_body(self.orelse, lines)
+        else_line = None if self.else_line is None else self.else_line + lines
+        return If(self.cond.copy(lines), copy_body(self.body, lines), orelse, self.line + lines, else_line)
+
+class While(Node):
+    __slots__ = ('cond', 'body')
+
+    def __init__(self, cond, body, line=None):
+        self.cond = cond
+        self.body = body
+        self.line = line
+
+    def copy(self, lines=0):
+        return While(self.cond.copy(lines), copy_body(self.body, lines), self.line + lines)
+
+class Print(Node):
+    # items are expressions and Str; separator goes between them, end after the last one
+    __slots__ = ('items', 'separator', 'end')
+
+    def __init__(self, items, separator=' ', end='\\n', line=None):
+        self.items = items
+        self.separator = separator
+        self.end = end
+        self.line = line
+
+    def copy(self, lines=0):
+        return Print(copy_body(self.items, lines), self.separator, self.end, self.line + lines)
+
+class Get(Node):
+    # get a, b as int; new lists the names this statement declares
+    __slots__ = ('names', 'type', 'new')
+
+    def __init__(self, names, type_, new=(), line=None):
+        self.names = names
+        self.type = type_
+        self.new = new
+        self.line = line
+
+    def copy(self, lines=0):
+        return Get(list(self.names), self.type, list(self.new), self.line + lines)
+
+# Expressions
+
+class Num(Node):
+    # ctype is the C type of the literal written for it, see semantics.LITERAL_CTYPES
+    __slots__ = ('value', 'type', 'ctype')
+
+    def __init__(self, value, type_, line=None, ctype=None):
+        self.value = value
+        self.type = type_
+        self.ctype = ctype or LITERAL_CTYPES[type_]
+        self.line = line
+
+    def copy(self, lines=0):
+        return Num(self.value, self.type, self.line + lines, self.ctype)
+
+class Str(Node):
+    __slots__ = ('value',)
+
+    def __init__(self, value, line=None):
+        self.value = value
+        self.line = line
+
+    def copy(self, lines=0):
+        return Str(self.value, self.line + lines)
+
+class Var(Node):
+    __slots__ = ('name', 'type')
+
+    def __init__(self, name, type_, line=None):
+        self.name = name
+        self.type = type_
+        self.line = line
+
+    def copy(self, lines=0):
+        return Var(self.name, self.type, self.line + lines)
+
+class Unary(Node):
+    __slots__ = ('op', 'operand', 'type')
+
+    def __init__(self, op, operand, line=None):
+        self.op = op
+        self.operand = operand
+        self.type = operand.type
+        self.line = line
+
+    def copy(self, lines=0):
+        return Unary(self.op, self.operand.copy(lines), self.line + lines)
+
+class BinOp(Node):
+    # + - * / %
+    __slots__ = ('op', 'left', 'right', 'type')
+
+    def __init__(self, op, left, right, line=None):
+        self.op = op
+        self.left = left
+        self.right = right
+        self.type = promote(left.type, right.type)
+        self.line = line
+
+    def copy(self, lines=0):
+        return BinOp(self.op, self.left.copy(lines), self.right.copy(lines), self.line + lines)
+
+# Conditions
+
+class Compare(Node):
+    # > >= < <= == !=
+    __slots__ = ('op', 'left', 'right')
+
+    def __init__(self, op, left, right, line=None):
+        self.op = op
+        self.left = left
+        self.right = right
+        self.line = line
+
+    def copy(self, lines=0):
+        return Compare(self.op, self.left.copy(lines), self.right.copy(lines), self.line + lines)
+
+class Logical(Node):
+    # 'and' / 'or'
+    __slots__ = ('op', 'left', 'right')
+
+    def __init__(self, op, left, right, line=None):
+        self.op = op
+        self.left = left
+        self.right = right
+        self.line = line
+
+    def copy(self, lines=0):
+        return Logical(self.op, self.left.copy(lines), self.right.copy(lines), self.line + lines)
+
+class Not(Node):
+    __slots__ = ('operand',)
+
+    def __init__(self, operand, line=None):
+        self.operand = operand
+        self.line = line
+
+    def copy(self, lines=0):
+        return Not(self.operand.copy(lines), self.line + lines)
@@ -0,0 +1,495 @@
+# Optimization passes over the syntax tree of scripting language : Ethan
+#
+# The passes rewrite a nodes.Program in place, between the Parser and codegen.CGenerator.
+# Values are computed with semantics.py, so an optimized program prints exactly what the
+# unoptimized one would.
+
+import math
+
+from nodes import Program, Declare, Let, Assign, If, While, Print, Get, Num, Str, Var, Unary, BinOp, Compare, Logical, Not
+from semantics import VAR_CTYPES, INT_LIMITS, common_ctype, convert, arith, negate
+
+# Ethan type of a new variable holding a value of each C type
+CTYPE_TYPES = {'int': 'int', 'long long': 'long', 'float': 'float', 'double': 'double'}
+
+COMPARISONS = {
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+}
+
+def assigned(body):
+    # names given a value anywhere in body, nested blocks included
+    names = set()
+    for node in body:
+        t = type(node)
+        if t is Let or t is Assign: names.add(node.name)
+        elif t is Declare or t is Get: names.update(node.names)
+        elif t is If:
+            names |= assigned(node.body)
+            if node.orelse: names |= assigned(node.orelse)
+        elif t is While: names |= assigned(node.body)
+    return names
+
+def names_in(node, names):
+    # adds the variables node reads to names
+    t = type(node)
+    if t is Var: names.add(node.name)
+    elif t is Unary or t is Not: names_in(node.operand, names)
+    elif t is BinOp or t is Compare or t is Logical:
+        names_in(node.left, names)
+        names_in(node.right, names)
+    return names
+
+def ctype_of(node):
+    # C type of an arithmetic expression; conditions are ints
+    t = type(node)
+    if t is Num: return node.ctype
+    if t is Var: return VAR_CTYPES[node.type]
+    if t is Unary: return ctype_of(node.operand)
+    if t is BinOp: return common_ctype(ctype_of(node.left), ctype_of(node.right))
+    return 'int'
+
+def key(node):
+    # equal keys for expressions computing the same value; None for conditions
+    t = type(node)
+    if t is Num: return ('n', node.ctype, node.value, math.copysign(1, node.value))
+    if t is Var: return ('v', node.name)
+    if t is Unary:
+        operand = key(node.operand)
+        return None if operand is None else ('u', node.op, operand)
+    if t is BinOp:
+        left, right = key(node.left), key(node.right)
+        return None if left is None or right is None else (node.op, left, right)
+    return None
+
+def size(node):
+    t = type(node)
+    if t is Unary or t is Not: return 1 + size(node.operand)
+    if t is BinOp or t is Compare or t is Logical: return 1 + size(node.left) + size(node.right)
+    return 1
+
+def trap_free(node):
+    # node can be evaluated anywhere: it has no integer division by a variable, 0 or -1
+    t = type(node)
+    if t is Unary or t is Not: return trap_free(node.operand)
+    if t is BinOp or t is Compare or t is Logical:
+        if t is BinOp and node.op in ('/', '%') and ctype_of(node) in INT_LIMITS:
+            if type(node.right) is not Num or node.right.value in (0, -1): return False
+        return trap_free(node.left) and trap_free(node.right)
+    return True
+
+def worth_keeping(node):
+    # an expression doing some arithmetic, not just reading a value
+    t = type(node)
+    return t is BinOp or (t is Unary and worth_keeping(node.operand))
+
+def get_slot(holder, slot):
+    return holder[slot] if type(slot) is int else getattr(holder, slot)
+
+def set_slot(holder, slot, node):
+    if type(slot) is int: holder[slot] = node
+    else: setattr(holder, slot, node)
+
+def child_slots(node):
+    # (holder, slot) of the expressions directly under node; the second one of a Logical
+    # is only evaluated when the first doesn't decide it
+    t = type(node)
+    if t is Unary or t is Not: return [(node, 'operand')]
+    if t is BinOp or t is Compare or t is Logical: return [(node, 'left'), (node, 'right')]
+    return []
+
+def statement_slots(node):
+    # (holder, slot) of the expressions a statement evaluates once each time it runs
+    t = type(node)
+    if t is Let or t is Assign: return [(node, 'value')]
+    if t is Print: return [(node.items, i) for i, item in enumerate(node.items) if type(item) is not Str]
+    if t is If: return [(node, 'cond')]
+    return []
+
+def same(a, b):
+    # (value, ctype) pairs holding the very same C value; 0.0 and -0.0 differ
+    return a[1] == b[1] and a[0] == b[0] and math.copysign(1, a[0]) == math.copysign(1, b[0])
+
+class ConstantFolder:
+    # Folds constant subexpressions and replaces reads of variables whose value is known
+    # at that point (last assigned from a constant) by that value.
+    def __init__(self):
+        self.folded = 0
+        self.propagated = 0
+        self.types = {}
+
+    def run(self, program):
+        self.block(program.body, {})
+        return program
+
+    def block(self, body, env):
+        # env maps a variable to its (value, ctype) where it's known
+        for node in body:
+            self.stmt(node, env)
+
+    def stmt(self, node, env):
+        t = type(node)
+        if t is Let or t is Assign:
+            if t is Let: self.types[node.name] = node.type
+            node.value = self.expr(node.value, env)
+            ctype = VAR_CTYPES.get(self.types.get(node.name))
+            value = convert(node.value.value, ctype) if ctype and type(node.value) is Num else None
+            if value is None: env.pop(node.name, None)
+            else: env[node.name] = (value, ctype)
+        elif t is Declare or t is Get:
+            for name in node.names:
+                if t is Declare or name in node.new: self.types[name] = node.type
+                env.pop(name, None)
+        elif t is Print:
+            node.items = [item if type(item) is Str else self.expr(item, env) for item in node.items]
+        elif t is If:
+            node.cond = self.cond(node.cond, env)
+            then_env = dict(env)
+            self.block(node.body, then_env)
+            else_env = dict(env)
+            if node.orelse: self.block(node.orelse, else_env)
+            # only what both branches agree on is known after the if; names neither one
+            # assigns are as they were
+            for name in assigned(node.body) | (assigned(node.orelse) if node.orelse else set()):
+                v = then_env.get(name)
+                if v is not None and name in else_env and same(v, else_env[name]): env[name] = v
+                else: env.pop(name, None)
+        elif t is While:
+            # anything the loop assigns may differ from one iteration to the next
+            for name in assigned(node.body): env.pop(name, None)
+            node.cond = self.cond(node.cond, env)
+            self.block(node.body, dict(env))
+
+    def expr(self, node, env):
+        t = type(node)
+        if t is Var:
+            known = env.get(node.name)
+            if known is None: return node
+            self.propagated += 1
+            return Num(known[0], node.type, node.line, known[1])
+        if t is Unary:
+            node.operand = self.expr(node.operand, env)
+            operand = node.operand
+            if type(operand) is Num:
+                value = operand.value if node.op == '+' else negate(operand.value, operand.ctype)
+                if value is not None: return self.fold(node, value, operand.ctype)
+            return node
+        if t is BinOp:
+            node.left = self.expr(node.left, env)
+            node.right = self.expr(node.right, env)
+            left, right = node.left, node.right
+            if type(left) is Num and type(right) is Num:
+                ctype = common_ctype(left.ctype, right.ctype)
+                a = convert(left.value, ctype)
+                b = convert(right.value, ctype)
+                value = arith(node.op, a, b, ctype) if a is not None and b is not None else None
+                if value is not None: return self.fold(node, value, ctype)
+            return node
+        return node
+
+    def cond(self, node, env):
+        # conditions fold to the int C gives them: 1 or 0
+        t = type(node)
+        if t is Compare:
+            node.left = self.expr(node.left, env)
+            node.right = self.expr(node.right, env)
+            left, right = node.left, node.right
+            if type(left) is Num and type(right) is Num:
+                ctype = common_ctype(left.ctype, right.ctype)
+                a = convert(left.value, ctype)
+                b = convert(right.value, ctype)
+                if a is not None and b is not None:
+                    return self.fold(node, int(COMPARISONS[node.op](a, b)), 'int')
+            return node
+        if t is Logical:
+            node.left = self.cond(node.left, env)
+            node.right = self.cond(node.right, env)
+            left, right = node.left, node.right
+            if type(left) is Num:
+                # 0 and x, 1 or x: x is never looked at
+                if bool(left.value) != (node.op == 'and'): return self.fold(node, int(bool(left.value)), 'int')
+                if type(right) is Num: return self.fold(node, int(bool(right.value)), 'int')
+            return node
+        if t is Not:
+            node.operand = self.cond(node.operand, env)
+            if type(node.operand) is Num: return self.fold(node, int(not node.operand.value), 'int')
+            return node
+        return self.expr(node, env)
+
+    def fold(self, node, value, ctype):
+        self.folded += 1
+        return Num(value, getattr(node, 'type', 'int'), node.line, ctype)
+
+def referenced(body, names):
+    # adds the variables body reads or writes to names
+    for node in body:
+        for holder, slot in statement_slots(node): names_in(get_slot(holder, slot), names)
+        t = type(node)
+        if t is Let or t is Assign: names.add(node.name)
+        elif t is Get: names.update(node.names)
+        elif t is If:
+            referenced(node.body, names)
+            if node.orelse: referenced(node.orelse, names)
+        elif t is While:
+            names_in(node.cond, names)
+            referenced(node.body, names)
+    return names
+
+def declares(body):
+    # body declares a variable of its own, so it can't be merged into the enclosing block
+    return any(type(node) is Let or type(node) is Declare or (type(node) is Get and node.new) for node in body)
+
+class DeadCodeEliminator:
+    # Removes what can't change what the program does: branches whose condition folded to
+    # a constant and loops that never run, stores of values nothing reads before the next
+    # store or the end of the program, then declarations of variables no longer used.
+    def __init__(self):
+        self.branches = 0
+        self.stores = 0
+        self.unused = []
+
+    def run(self, program):
+        program.body = self.prune(program.body)
+        self.live(program.body, set(), True)
+        self.drop_unused(program.body, referenced(program.body, set()))
+        return program
+
+    def prune(self, body):
+        out = []
+        for node in body:
+            t = type(node)
+            if t is If:
+                node.body = self.prune(node.body)
+                if node.orelse: node.orelse = self.prune(node.orelse)
+                if type(node.cond) is Num:
+                    if node.cond.value: taken, dropped = node.body, node.orelse
+                    else: taken, dropped = node.orelse, node.body
+                    if dropped is not None: self.branches += 1
+                    if not taken: continue
+                    if not declares(taken):
+                        out.extend(taken)
+                        continue
+                    # keeps its block, for the variables it declares
+                    node.cond = Num(1, 'int', node.line)
+                    node.body = taken
+                    node.orelse = None
+            elif t is While:
+                node.body = self.prune(node.body)
+                if type(node.cond) is Num and not node.cond.value:
+                    self.branches += 1
+                    continue
+            out.append(node)
+        return out
+
+    def live(self, body, live, sweep):
+        # returns the variables live before body given those live after it; with sweep,
+        # also removes the stores to variables that aren't live after them
+        live = set(live)
+        kept = []
+        for node in reversed(body):
+            t = type(node)
+            if t is Let or t is Assign:
+                # a store that could trap stays, so the program still stops there
+                if node.name not in live and trap_free(node.value):
+                    if sweep:
+                        self.stores += 1
+                        if t is Let: kept.append(Declare([node.name], node.type, node.line))
+                    continue
+                live.discard(node.name)
+                names_in(node.value, live)
+            elif t is Declare:
+                live.difference_update(node.names)
+            elif t is Print:
+                for item in node.items:
+                    if type(item) is not Str: names_in(item, live)
+            elif t is If:
+                after = live
+                live = self.live(node.body, after, sweep)
+                live |= self.live(node.orelse, after, sweep) if node.orelse else after
+                names_in(node.cond, live)
+            elif t is While:
+                # live at the top of the loop: what the condition, the rest of the program
+                # and another run of the body read
+                loop = names_in(node.cond, set(live))
+                while True:
+                    before = self.live(node.body, loop, False)
+                    if before <= loop: break
+                    loop |= before
+                if sweep: self.live(node.body, loop, True)
+                live = loop
+            # a get that fails leaves its variables as they were, so it doesn't end their lives
+            kept.append(node)
+        if sweep: body[:] = kept[::-1]
+        return live
+
+    def drop_unused(self, body, used):
+        i = 0
+        while i < len(body):
+            node = body[i]
+            t = type(node)
+            if t is Declare:
+                self.unused.extend(name for name in node.names if name not in used)
+                node.names = [name for name in node.names if name in used]
+                if not node.names:
+                    del body[i]
+                    continue
+            elif t is If:
+                self.drop_unused(node.body, used)
+                if node.orelse: self.drop_unused(node.orelse, used)
+            elif t is While:
+                self.drop_unused(node.body, used)
+            i += 1
+
+class LoopOptimizer:
+    # Moves expressions whose value doesn't change from one iteration of a while loop to the
+    # next in front of the loop (LICM), and computes a subexpression repeated in a block
+    # only once (CSE). Either way the value is kept in a new variable, declared with the C
+    # type of the expression so that nothing is rounded differently.
+    def __init__(self):
+        self.hoisted = 0
+        self.reused = 0
+        self.taken = set()
+        self.temps = set()
+        self.count = 0
+
+    def run(self, program):
+        self.taken = assigned(program.body)
+        program.body = self.block(program.body)
+        return program
+
+    def block(self, body):
+        # returns body with its loops optimized and its repeated subexpressions shared
+        out = []
+        for node in body:
+            t = type(node)
+            if t is If:
+                node.body = self.block(node.body)
+                if node.orelse: node.orelse = self.block(node.orelse)
+            elif t is While:
+                node.body = self.block(node.body)
+                out.extend(self.hoist(node))
+            out.append(node)
+        self.share(out)
+        return out
+
+    def temp(self, value):
+        # a new variable set to value: returns its Let and a Var reading it
+        while '_t%d' % self.count in self.taken: self.count += 1
+        name = '_t%d' % self.count
+        self.taken.add(name)
+        self.temps.add(name)
+        ctype = ctype_of(value)
+        type_ = value.type if VAR_CTYPES.get(value.type) == ctype else CTYPE_TYPES[ctype]
+        return Let(name, value, value.line, type_), Var(name, type_, value.line)
+
+    # LICM
+
+    def hoist(self, loop):
+        # returns the statements to put in front of loop, having taken them out of it
+        written = assigned(loop.body)
+        lets = []
+        # new variables of inner loops and blocks that are invariant here too move on out
+        self.lift(loop.body, written, lets)
+        found = {}
+        self.replace_invariant(loop, 'cond', written, found, lets)
+        self.invariant_in(loop.body, written, found, lets)
+        return lets
+
+    def lift(self, body, written, lets):
+        i = 0
+        while i < len(body):
+            node = body[i]
+            t = type(node)
+            if t is Let and node.name in self.temps and not names_in(node.value, set()) & written and trap_free(node.value):
+                lets.append(body.pop(i))
+                written.discard(node.name)
+                continue
+            if t is If:
+                self.lift(node.body, written, lets)
+                if node.orelse: self.lift(node.orelse, written, lets)
+            i += 1
+
+    def invariant_in(self, body, written, found, lets):
+        for node in body:
+            for holder, slot in statement_slots(node):
+                self.replace_invariant(holder, slot, written, found, lets)
+            if type(node) is If:
+                self.invariant_in(node.body, written, found, lets)
+                if node.orelse: self.invariant_in(node.orelse, written, found, lets)
+            # what an inner loop could take out of itself is already in front of it
+
+    def replace_invariant(self, holder, slot, written, found, lets):
+        # replaces the largest invariant subexpressions under holder[slot]; the loop may
+        # run no times at all, so only ones that can't trap are computed in front of it
+        node = get_slot(holder, slot)
+        k = key(node)
+        if k is not None and worth_keeping(node) and not names_in(node, set()) & written and trap_free(node):
+            var = found.get(k)
+            if var is None:
+                let, var = self.temp(node)
+                lets.append(let)
+                found[k] = var
+                self.hoisted += 1
+            set_slot(holder, slot, Var(var.name, var.type, node.line))
+            return
+        for child in child_slots(node):
+            self.replace_invariant(*child, written, found, lets)
+
+    # CSE
+
+    def share(self, body):
+        # a subexpression found again before any of its variables is written is kept in a
+        # new variable made just before the statement first computing it
+        while True:
+            best = None
+            for group in self.repeated(body):
+                if best is None or group[0] > best[0]: best = group
+            if best is None: return
+            _, index, slots = best
+            let, var = self.temp(get_slot(*slots[0]))
+            for holder, slot in slots: set_slot(holder, slot, Var(var.name, var.type, var.line))
+            body.insert(index, let)
+            self.reused += len(slots) - 1
+
+    def repeated(self, body):
+        # yields (size, index of the first statement, slots) for each expression computed
+        # more than once with the same value
+        open_ = {}
+        for i, node in enumerate(body):
+            for holder, slot in statement_slots(node):
+                self.occurrences(holder, slot, i, open_)
+            killed = assigned([node])
+            if not killed: continue
+            for k in [k for k, group in open_.items() if group[1] & killed]:
+                group = open_.pop(k)
+                if len(group[3]) > 1: yield group[0], group[2], group[3]
+        for group in open_.values():
+            if len(group[3]) > 1: yield group[0], group[2], group[3]
+
+    def occurrences(self, holder, slot, index, open_):
+        node = get_slot(holder, slot)
+        t = type(node)
+        for child in child_slots(node)[:1 if t is Logical else 2]:
+            self.occurrences(*child, index, open_)
+        if not worth_keeping(node): return
+        k = key(node)
+        if k is None: return
+        group = open_.get(k)
+        # size, variables read, first statement and slots
+        if group is None: open_[k] = (size(node), names_in(node, set()), index, [(holder, slot)])
+        else: group[3].append((holder, slot))
+
+def optimize(program):
+    # runs the passes over program; returns what they did, for reporting
+    folder = ConstantFolder()
+    folder.run(program)
+    dead = DeadCodeEliminator()
+    dead.run(program)
+    loops = LoopOptimizer()
+    loops.run(program)
+    return {'folded': folder.folded, 'propagated': folder.propagated, 'branches': dead.branches, 'stores': dead.stores,
+            'unused': dead.unused, 'hoisted': loops.hoisted, 'reused': loops.reused}
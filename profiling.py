@@ -0,0 +1,181 @@
+# Compile profiling for scripting language : Ethan
+#
+# A Profile records one compile: the time each stage takes (Ethan.load, Lexer.tokenize,
+# Parser.parse, optimize, CGenerator.generate, Transpiler.transpile and the C compiler),
+# what it counted (bytes, lines, tokens, statements, bytes of C) and how much it raised
+# the process's peak resident memory. A Profile made with memory also traces the memory
+# Python allocates: for each stage the peak of it while the stage ran and how far that was
+# above what the stage started with. Parsing is broken down further by statement kind,
+# the Parser methods below: every statement is an event of its own, and each kind gets its
+# count, its time with and without the statements nested in it, and its own tokens.
+#
+# write() exports it all as Chrome trace events (chrome://tracing or ui.perfetto.dev),
+# the stages on one track and the statements nested under the parse stage. Ethan makes a
+# Profile only with --profile or --profile-memory; without them, nothing here is imported.
+
+import contextlib, json, sys, threading, time, tracemalloc
+
+import engine
+
+try:
+    import resource
+except ImportError:
+    # not on Windows
+    resource = None
+
+# the Parser methods that parse each kind of statement
+STATEMENT_KINDS = ('var_declare', 'var_assign', 'var_reassign', 'if_stmt', 'while_stmt', 'print_stmt', 'get_stmt')
+# statement events kept in a trace; the kinds' totals count every statement
+MAX_EVENTS = 100000
+
+def peak_rss():
+    # the process's peak resident memory so far in KiB, None where it can't be told
+    if resource is None: return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+class Profile:
+    # Used by one thread at a time: another thread records into a Profile of its own, made
+    # with the same origin, which is merged in once the thread is done. tracemalloc's peak
+    # is the whole process's, so only one thread's Profile may be made with memory. Tracing
+    # every allocation makes the stages several times slower, so their times are skewed.
+    def __init__(self, name, origin=None, memory=False):
+        self.name = name
+        self.origin = time.perf_counter() if origin is None else origin
+        self.events = []
+        self.dropped = 0
+        self.memory = memory
+        if memory and not tracemalloc.is_tracing(): tracemalloc.start()
+        # stage name: its counts, with 'ms', 'rss_added_kib' and with memory 'peak_kib' and
+        # 'added_kib'
+        self.stages = {}
+        # statement kind: [count, seconds, and seconds and tokens without nested statements]
+        self.kinds = {}
+
+    def statements(self):
+        return sum(totals[0] for totals in self.kinds.values())
+
+    def us(self, t):
+        return round((t - self.origin) * 1e6, 3)
+
+    def event(self, name, cat, start, end, args):
+        self.events.append({'name': name, 'cat': cat, 'ph': 'X', 'ts': self.us(start), 'dur': round((end - start) * 1e6, 3), 'pid': 1, 'tid': threading.get_native_id(), 'args': args})
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        # times the stage run in the with block; it adds its counts to the dict yielded
+        counts = {}
+        rss = peak_rss()
+        if self.memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            end = time.perf_counter()
+            if rss is not None:
+                counts['rss_added_kib'] = peak_rss() - rss
+            if self.memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                counts['peak_kib'] = peak // 1024
+                counts['added_kib'] = (peak - before) // 1024
+                self.events.append({'name': 'peak memory', 'ph': 'C', 'ts': self.us(start), 'pid': 1, 'args': {'KiB': peak // 1024}})
+            self.event(name, 'stage', start, end, counts)
+            self.add_stage(name, dict(counts, ms=round((end - start) * 1000, 3)))
+
+    def add_stage(self, name, counts):
+        # a stage run again (a retried build) adds up; its memory is the larger of the runs'
+        old = self.stages.get(name)
+        if old is not None:
+            counts['ms'] = round(counts['ms'] + old['ms'], 3)
+            counts['rss_added_kib'] = counts.get('rss_added_kib', 0) + old.get('rss_added_kib', 0)
+            for key in ('peak_kib', 'added_kib'):
+                if key in old: counts[key] = max(counts.get(key, 0), old[key])
+        self.stages[name] = counts
+
+    def merge(self, other):
+        # adds what other, a Profile of another thread, recorded; its events stay on the
+        # thread's own track
+        self.events += other.events
+        self.dropped += other.dropped
+        for name, counts in other.stages.items(): self.add_stage(name, dict(counts))
+        for kind, totals in other.kinds.items():
+            mine = self.kinds.setdefault(kind, [0, 0.0, 0.0, 0])
+            for i, value in enumerate(totals): mine[i] += value
+
+    def statement(self, kind, start, end, inner, tokens, inner_tokens, line):
+        # a statement of kind parsed from start to end, inner seconds and inner_tokens of it
+        # spent on the statements nested in it
+        totals = self.kinds.get(kind)
+        if totals is None: totals = self.kinds[kind] = [0, 0.0, 0.0, 0]
+        totals[0] += 1
+        totals[1] += end - start
+        totals[2] += end - start - inner
+        totals[3] += tokens - inner_tokens
+        if len(self.events) < MAX_EVENTS: self.event(kind, 'statement', start, end, {'line': line, 'tokens': tokens})
+        else: self.dropped += 1
+
+    def summary(self):
+        kinds = {}
+        for kind, (count, seconds, own, tokens) in sorted(self.kinds.items(), key=lambda item: -item[1][2]):
+            kinds[kind] = {'count': count, 'ms': round(seconds * 1000, 3), 'self_ms': round(own * 1000, 3), 'tokens': tokens}
+        return {'file': self.name, 'stages': self.stages, 'statement_kinds': kinds, 'dropped_events': self.dropped, 'peak_rss_kib': peak_rss()}
+
+    def report(self):
+        print("Profile of " + self.name + ":")
+        for name, counts in self.stages.items():
+            rest = ', '.join('%s %s' % (key, value) for key, value in counts.items() if key not in ('ms', 'rss_added_kib', 'peak_kib', 'added_kib'))
+            memory = '+%d KiB RSS' % counts['rss_added_kib'] if 'rss_added_kib' in counts else ''
+            if 'peak_kib' in counts: memory = '%d KiB peak, +%d, ' % (counts['peak_kib'], counts['added_kib']) + memory
+            print("  %-10s %9.3f ms %34s  %s" % (name, counts['ms'], memory, rest))
+        peak = peak_rss()
+        if peak is not None: print("  peak resident memory %d KiB" % peak)
+        if self.memory: print("  (with allocations traced, which slows the stages down)")
+        for kind, totals in self.summary()['statement_kinds'].items():
+            print("  %-12s %7d x %9.3f ms (%.3f ms self), %d tokens" % (kind, totals['count'], totals['ms'], totals['self_ms'], totals['tokens']))
+
+    def write(self, path):
+        # writes the Chrome trace to path, returns False when it can't
+        trace = {
+            'traceEvents': [{'name': 'process_name', 'ph': 'M', 'pid': 1, 'args': {'name': 'Ethan ' + self.name}}] + self.events,
+            'displayTimeUnit': 'ms',
+            'otherData': self.summary(),
+        }
+        try:
+            with open(path, 'w', encoding='utf8') as f: json.dump(trace, f)
+        except OSError as e:
+            print("Warning: Cann't write the profile.\n\t" + str(e))
+            return False
+        return True
+
+class Parser(engine.Parser):
+    # an engine.Parser that records every statement it parses in profile
+    def __init__(self, tokens, profile):
+        self.profile = profile
+        # seconds and tokens of the statements nested in each one being parsed
+        self.inner = [[0.0, 0]]
+        super().__init__(tokens)
+
+def timed(kind):
+    # the Parser method kind, recording each statement it parses
+    method = getattr(engine.Parser, kind)
+
+    def parse(self):
+        self.inner.append([0.0, 0])
+        _idx = self.base + self.idx
+        _line = self.line
+        start = time.perf_counter()
+        _nodes = method(self)
+        end = time.perf_counter()
+        seconds, tokens = self.inner.pop()
+        outer = self.inner[-1]
+        outer[0] += end - start
+        _tokens = self.base + self.idx - _idx
+        outer[1] += _tokens
+        self.profile.statement(kind, start, end, seconds, _tokens, tokens, _line)
+        return _nodes
+    return parse
+
+for _kind in STATEMENT_KINDS: setattr(Parser, _kind, timed(_kind))
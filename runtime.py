@@ -0,0 +1,196 @@
+# C runtime pieces for programs generated from scripting language : Ethan
+#
+# codegen.CGenerator copies what a program needs into its C file, so the generated
+# programs stay single files that build with nothing but a C compiler.
+
+# Input reader used by 'get' with --fast-input instead of scanf. Input is taken in large
+# read() chunks and numbers are parsed by hand; reals that can't be converted exactly with
+# one multiplication or division (Clinger's fast path, which needs arithmetic done in the
+# type itself: FLT_EVAL_METHOD 0) are handed to strtod/strtof.
+# Like scanf, a get leaves its variable alone at the end of input or on a malformed number.
+READER = r'''#ifdef _WIN32
+#include <io.h>
+#define ethan_read _read
+#else
+#include <unistd.h>
+#define ethan_read read
+#endif
+#include <float.h>
+
+static char ethan_in[1 << 16];
+static size_t ethan_in_pos = 0, ethan_in_len = 0;
+static int ethan_in_eof = 0;
+
+static const double ethan_pow10[] = {1e0, 1e1, 1e2, 1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9, 1e10, 1e11,
+    1e12, 1e13, 1e14, 1e15, 1e16, 1e17, 1e18, 1e19, 1e20, 1e21, 1e22};
+static const float ethan_pow10f[] = {1e0f, 1e1f, 1e2f, 1e3f, 1e4f, 1e5f, 1e6f, 1e7f, 1e8f, 1e9f, 1e10f};
+
+static int ethan_peek(void) {
+    if (ethan_in_pos == ethan_in_len) {
+        long n;
+        if (ethan_in_eof) return EOF;
+        /* about to wait for input: let prompts out first */
+        fflush(stdout);
+        n = (long)ethan_read(0, ethan_in, sizeof ethan_in);
+        if (n <= 0) { ethan_in_eof = 1; return EOF; }
+        ethan_in_pos = 0;
+        ethan_in_len = (size_t)n;
+    }
+    return (unsigned char)ethan_in[ethan_in_pos];
+}
+
+static int ethan_skip_space(void) {
+    int c = ethan_peek();
+    while (c == ' ' || c == '\n' || c == '\t' || c == '\r' || c == '\v' || c == '\f') {
+        ethan_in_pos++;
+        c = ethan_peek();
+    }
+    return c;
+}
+
+static int ethan_get_integer(long long *v) {
+    unsigned long long n = 0;
+    int neg = 0, c = ethan_skip_space();
+    if (c == '-' || c == '+') {
+        neg = c == '-';
+        ethan_in_pos++;
+        c = ethan_peek();
+    }
+    if (c < '0' || c > '9') return 0;
+    do {
+        n = n * 10 + (unsigned)(c - '0');
+        ethan_in_pos++;
+        c = ethan_peek();
+    } while (c >= '0' && c <= '9');
+    *v = neg ? (long long)(0 - n) : (long long)n;
+    return 1;
+}
+
+static void ethan_get_int(int *v) {
+    long long n;
+    if (ethan_get_integer(&n)) *v = (int)n;
+}
+
+static void ethan_get_long(long long *v) {
+    ethan_get_integer(v);
+}
+
+/* appends c to tok when there's room, and moves past it */
+static int ethan_take(char *tok, size_t *n, size_t cap, int c) {
+    if (*n + 1 < cap) tok[(*n)++] = (char)c;
+    ethan_in_pos++;
+    return ethan_peek();
+}
+
+/* copies the longest prefix of the input that can start a real number as scanf reads it
+   (decimal, hexadecimal, inf or nan) into tok, leaving the rest for the next get */
+static size_t ethan_real_token(char *tok, size_t cap) {
+    size_t n = 0;
+    int c = ethan_skip_space(), hex = 0, dot = 0;
+    if (c == '-' || c == '+') c = ethan_take(tok, &n, cap, c);
+    if ((c | 32) == 'i' || (c | 32) == 'n') {
+        while ((c | 32) >= 'a' && (c | 32) <= 'z') c = ethan_take(tok, &n, cap, c);
+    } else {
+        if (c == '0') {
+            c = ethan_take(tok, &n, cap, c);
+            if ((c | 32) == 'x') { hex = 1; c = ethan_take(tok, &n, cap, c); }
+        }
+        while ((c >= '0' && c <= '9') || (hex && (c | 32) >= 'a' && (c | 32) <= 'f') || (c == '.' && !dot)) {
+            dot |= c == '.';
+            c = ethan_take(tok, &n, cap, c);
+        }
+        if ((c | 32) == (hex ? 'p' : 'e')) {
+            c = ethan_take(tok, &n, cap, c);
+            if (c == '-' || c == '+') c = ethan_take(tok, &n, cap, c);
+            while (c >= '0' && c <= '9') c = ethan_take(tok, &n, cap, c);
+        }
+    }
+    tok[n] = '\0';
+    return n;
+}
+
+/* splits a plain decimal into digits * 10^exp10; 0 when it has another form or too many digits */
+static int ethan_decimal(const char *s, int *neg, unsigned long long *digits, int *exp10) {
+    unsigned long long m = 0;
+    int count = 0, e = 0, seen = 0;
+    *neg = *s == '-';
+    if (*s == '-' || *s == '+') s++;
+    for (; *s >= '0' && *s <= '9'; s++, seen = 1) {
+        if (m || *s != '0') { if (++count > 19) return 0; m = m * 10 + (unsigned)(*s - '0'); }
+    }
+    if (*s == '.') {
+        for (s++; *s >= '0' && *s <= '9'; s++, seen = 1) {
+            if (m || *s != '0') { if (++count > 19) return 0; m = m * 10 + (unsigned)(*s - '0'); }
+            e--;
+        }
+    }
+    if (!seen) return 0;
+    if (*s == 'e' || *s == 'E') {
+        int eneg = 0, x = 0;
+        s++;
+        if (*s == '-' || *s == '+') eneg = *s++ == '-';
+        if (*s < '0' || *s > '9') return 0;
+        for (; *s >= '0' && *s <= '9'; s++) if (x < 10000) x = x * 10 + (*s - '0');
+        e += eneg ? -x : x;
+    }
+    if (*s) return 0;
+    *digits = m;
+    *exp10 = e;
+    return 1;
+}
+
+static void ethan_get_double(double *v) {
+    char tok[512];
+    unsigned long long m;
+    int neg, e;
+    if (!ethan_real_token(tok, sizeof tok)) return;
+    if (FLT_EVAL_METHOD == 0 && ethan_decimal(tok, &neg, &m, &e) && m <= (1ULL << 53) && e >= -22 && e <= 22) {
+        double d = (double)m;
+        d = e < 0 ? d / ethan_pow10[-e] : d * ethan_pow10[e];
+        *v = neg ? -d : d;
+    } else {
+        char *end;
+        double d = strtod(tok, &end);
+        if (end != tok) *v = d;
+    }
+}
+
+static void ethan_get_float(float *v) {
+    char tok[512];
+    unsigned long long m;
+    int neg, e;
+    if (!ethan_real_token(tok, sizeof tok)) return;
+    if (FLT_EVAL_METHOD == 0 && ethan_decimal(tok, &neg, &m, &e) && m <= (1ULL << 24) && e >= -10 && e <= 10) {
+        float f = (float)m;
+        f = e < 0 ? f / ethan_pow10f[-e] : f * ethan_pow10f[e];
+        *v = neg ? -f : f;
+    } else {
+        char *end;
+        float f = strtof(tok, &end);
+        if (end != tok) *v = f;
+    }
+}
+
+'''
+
+# Counters of --counters. codegen.CGenerator writes ethan_counts, one count for each kind
+# of statement run on each line, and the tables in front of this: the sites in line order,
+# with their line, kind and counter. At exit they're written to ETHAN_COUNTS_FILE as JSON,
+# {"line": {"kind": count, ...}, ...}.
+COUNTERS = r'''static void ethan_dump_counts(void) {
+    FILE *f = fopen(ETHAN_COUNTS_FILE, "w");
+    int i;
+    if (!f) { perror(ETHAN_COUNTS_FILE); return; }
+    fputc('{', f);
+    for (i = 0; i < ETHAN_COUNT_SITES; i++) {
+        if (i == 0 || ethan_count_lines[i] != ethan_count_lines[i - 1])
+            fprintf(f, "%s\n  \"%d\": {", i ? "}," : "", ethan_count_lines[i]);
+        else
+            fputs(", ", f);
+        fprintf(f, "\"%s\": %llu", ethan_count_kinds[i], ethan_counts[ethan_count_index[i]]);
+    }
+    fputs(ETHAN_COUNT_SITES ? "}\n}\n" : "}\n", f);
+    fclose(f);
+}
+
+'''
@@ -0,0 +1,67 @@
+# C arithmetic for scripting language : Ethan
+#
+# Evaluates expressions the way the generated C does on the usual 64 bit targets (32 bit
+# int, 64 bit long long, IEEE float and double), so values computed at compile time are the
+# ones the program would have computed. Anything C leaves undefined (overflow, division by
+# zero) or that can't be reproduced exactly gives None, and is then left to the program.
+
+import math, struct
+
+# C type of a variable of each Ethan type (codegen.C_TYPES spells them out)
+VAR_CTYPES = {'int': 'int', 'long': 'long long', 'float': 'float', 'double': 'double', 'exp': 'double'}
+# C type of a literal of each Ethan type; a literal without a suffix is never a float
+LITERAL_CTYPES = {'int': 'int', 'long': 'long long', 'float': 'double', 'double': 'double', 'exp': 'double'}
+
+CTYPE_RANK = {'int': 0, 'long long': 1, 'float': 2, 'double': 3}
+INT_LIMITS = {'int': (-2**31, 2**31 - 1), 'long long': (-2**63, 2**63 - 1)}
+
+def common_ctype(a, b):
+    # the usual arithmetic conversions
+    return a if CTYPE_RANK[a] >= CTYPE_RANK[b] else b
+
+def to_float32(x):
+    try: return struct.unpack('f', struct.pack('f', x))[0]
+    except OverflowError: return None
+
+def convert(value, ctype):
+    # value as it is after conversion to ctype
+    if value is None: return None
+    if ctype in INT_LIMITS:
+        if isinstance(value, float):
+            if not math.isfinite(value): return None
+            value = int(value) # truncates toward zero, like C
+        lo, hi = INT_LIMITS[ctype]
+        return value if lo <= value <= hi else None
+    if isinstance(value, int):
+        # int to float would be rounded twice past 2**53
+        if ctype == 'float' and abs(value) > 2**53: return None
+        value = float(value)
+    if ctype == 'float': value = to_float32(value)
+    return value if value is not None and math.isfinite(value) else None
+
+def c_divmod(a, b):
+    # integer division truncates toward zero, the remainder takes the sign of a
+    q = abs(a) // abs(b)
+    if (a < 0) != (b < 0): q = -q
+    return q, a - b * q
+
+def arith(op, a, b, ctype):
+    # a op b computed in ctype; a and b must already be ctype values
+    if ctype in INT_LIMITS:
+        if op in ('/', '%'):
+            if b == 0: return None
+            q, r = c_divmod(a, b)
+            result = q if op == '/' else r
+        elif op == '+': result = a + b
+        elif op == '-': result = a - b
+        else: result = a * b
+        return convert(result, ctype)
+    if op == '%' or (op == '/' and b == 0): return None
+    if op == '+': result = a + b
+    elif op == '-': result = a - b
+    elif op == '*': result = a * b
+    else: result = a / b
+    return convert(result, ctype)
+
+def negate(value, ctype):
+    return convert(-value, ctype)
@@ -0,0 +1,226 @@
+# Compile server for Ethan
+#
+#   python server.py [--socket PATH] [--memory-cache 64] [--no-cache]
+#
+# A long running process that takes compile requests from client.py over a Unix domain
+# socket. The transpiler is imported once and generated C files and executables are kept
+# in memory (in front of the usual cache on disk), so a request costs neither an
+# interpreter start nor a cold cache. Every connection is served by its own thread: the
+# transpiler holds the GIL, but C compilers run side by side.
+#
+# Requests and replies are one line of JSON each:
+#   {"action": "transpile" | "build" | "run", "file": absolute path, "opt_level": 2, "options": {...}}
+#       -> {"code": 0, "output": the compiler's messages, "seconds": 0.01, "exe": path or null}
+#   {"action": "stats"}     -> request counts, latencies and cache hit rates
+#   {"action": "shutdown"}  -> the final stats; the server stops after replying
+# "run" only builds: the client runs the executable itself. The last version of every
+# recently compiled file is kept as an incremental.Incremental, so an edited file is only
+# lexed and parsed again where it changed.
+
+import argparse, collections, contextlib, functools, io, json, os, socket, socketserver, sys, threading, time
+
+from cache import Cache, MemoryCache, CACHE_DIR, CACHE_SIZE, MEMORY_CACHE_SIZE
+from client import SOCKET_PATH
+from Ethan import Ethan, engine_fingerprint
+import engine # Ethan.exe imports it on first use; done here, requests find it warm
+from incremental import Incremental
+
+ACTIONS = ('transpile', 'build', 'run')
+OPTIONS = ('optimize', 'stdout_buffer', 'fast_input', 'counters')
+# latest request times kept per action for the percentiles
+LATENCY_SAMPLES = 1000
+# files whose last version is kept for incremental compiles
+INCREMENTAL_FILES = 64
+
+class ThreadOutput(io.TextIOBase):
+    # Stands in for sys.stdout: what a thread prints inside capture() goes to its own buffer,
+    # anything else to the real stdout.
+    def __init__(self, default):
+        self.default = default
+        self.local = threading.local()
+
+    def writable(self):
+        return True
+
+    def write(self, s):
+        return getattr(self.local, 'buffer', self.default).write(s)
+
+    def flush(self):
+        if not hasattr(self.local, 'buffer'): self.default.flush()
+
+    @contextlib.contextmanager
+    def capture(self):
+        self.local.buffer = io.StringIO()
+        try:
+            yield self.local.buffer
+        finally:
+            del self.local.buffer
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.active = 0
+        self.failed = 0
+        self.counts = collections.Counter()
+        self.latencies = collections.defaultdict(lambda: collections.deque(maxlen=LATENCY_SAMPLES))
+
+    @contextlib.contextmanager
+    def request(self):
+        with self.lock: self.active += 1
+        try: yield
+        finally:
+            with self.lock: self.active -= 1
+
+    def record(self, action, seconds, ok):
+        with self.lock:
+            self.counts[action] += 1
+            self.latencies[action].append(seconds)
+            if not ok: self.failed += 1
+
+    def report(self, cache):
+        with self.lock:
+            _report = {'uptime': round(time.time() - self.started, 3), 'requests': sum(self.counts.values()), 'failed': self.failed, 'active': self.active}
+            _actions = {}
+            for action, count in self.counts.items():
+                samples = sorted(self.latencies[action])
+                _actions[action] = {
+                    'count': count,
+                    'mean_ms': round(1000 * sum(samples) / len(samples), 3),
+                    'p50_ms': round(1000 * percentile(samples, 0.5), 3),
+                    'p95_ms': round(1000 * percentile(samples, 0.95), 3),
+                    'max_ms': round(1000 * samples[-1], 3),
+                }
+        _report['actions'] = _actions
+        if cache is not None:
+            lookups = cache.hits + cache.misses
+            disk_hits = cache.backing.hits if cache.backing is not None else 0
+            _report['cache'] = {
+                'lookups': lookups,
+                'memory_hits': cache.hits,
+                'disk_hits': disk_hits,
+                'hit_rate': round((cache.hits + disk_hits) / lookups, 4) if lookups else None,
+                'memory_entries': len(cache.entries),
+                'memory_bytes': cache.size,
+            }
+        return _report
+
+def percentile(samples, q):
+    # samples must be sorted
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+class Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            message = json.loads(self.rfile.readline())
+        except ValueError:
+            message = None
+        _reply = self.server.reply(message) if isinstance(message, dict) else {'code': 1, 'output': "Error: Malformed request.\n"}
+        self.wfile.write(json.dumps(_reply).encode('utf8') + b'\n')
+        if message == {'action': 'shutdown'}:
+            # shutdown() waits for serve_forever(), which runs in another thread
+            threading.Thread(target=self.server.shutdown).start()
+
+class CompileServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, cache, output):
+        super().__init__(path, Handler)
+        self.cache = cache
+        self.output = output
+        self.stats = Stats()
+        # two requests for one file would write the same .c and executable: file name ->
+        # [its Lock, requests using it], dropped once no request does
+        self.file_locks = {}
+        self.locks_lock = threading.Lock()
+        # file name -> Incremental, least recently compiled first
+        self.sessions = collections.OrderedDict()
+
+    def reply(self, message):
+        action = message.get('action')
+        if action in ('stats', 'shutdown'): return self.stats.report(self.cache)
+        if action not in ACTIONS or not isinstance(message.get('file'), str):
+            return {'code': 1, 'output': "Error: Unknown request.\n"}
+        with self.stats.request():
+            start = time.perf_counter()
+            with self.output.capture() as out:
+                # not print itself, so the build captures what the C compiler prints too
+                say = functools.partial(print, file=out)
+                try:
+                    _code, _exe = self.compile(message['file'], action, message.get('opt_level', 2), message.get('options') or {}, say)
+                except Exception as e:
+                    print("Error: " + type(e).__name__ + ": " + str(e))
+                    _code, _exe = 1, None
+            seconds = time.perf_counter() - start
+            self.stats.record(action, seconds, _code == 0)
+        return {'code': _code, 'output': out.getvalue(), 'seconds': seconds, 'exe': _exe}
+
+    def compile(self, file_name, action, opt_level, options, say=print):
+        # returns an exit code and, when it was built, the executable; the build's messages
+        # go to say
+        options = {name: options[name] for name in OPTIONS if name in options}
+        with self.locks_lock:
+            lock = self.file_locks.get(file_name)
+            if lock is None: lock = self.file_locks[file_name] = [threading.Lock(), 0]
+            lock[1] += 1
+            session = self.sessions.pop(file_name, None) or Incremental()
+            self.sessions[file_name] = session
+            while len(self.sessions) > INCREMENTAL_FILES: self.sessions.popitem(last=False)
+        try:
+            with lock[0]:
+                ethan = Ethan(file_name, opt_level, self.cache, incremental=session, **options)
+                if not ethan.execute(): return 1, None
+                if action == 'transpile': return 0, None
+                if not ethan.build(say): return 1, None
+                return 0, os.path.abspath(ethan.extra_paths + ethan.file_exe)
+        finally:
+            with self.locks_lock:
+                lock[1] -= 1
+                if not lock[1]: del self.file_locks[file_name]
+
+def listening(path):
+    # whether a server already answers on path
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog='Ethan server', description="Serve Ethan compile requests on a Unix domain socket.")
+    ap.add_argument('--socket', default=SOCKET_PATH, help="where to listen")
+    ap.add_argument('--memory-cache', type=int, default=MEMORY_CACHE_SIZE // (1024 * 1024), metavar='MIB', help="size of the in-memory cache")
+    ap.add_argument('--no-cache', action='store_true', help="always transpile and build from scratch")
+    ap.add_argument('--cache-dir', default=CACHE_DIR, help="where cached C files and executables are kept")
+    ap.add_argument('--cache-size', type=int, default=CACHE_SIZE // (1024 * 1024), help="cache size limit in MiB")
+    args = ap.parse_args(argv)
+    if not hasattr(socket, 'AF_UNIX'):
+        print("Error: Unix domain sockets aren't available here.")
+        return 1
+    if os.path.exists(args.socket):
+        if listening(args.socket):
+            print("Error: A server is already listening on " + args.socket)
+            return 1
+        os.remove(args.socket) # left behind by a server that didn't exit cleanly
+
+    cache = None if args.no_cache else MemoryCache(Cache(args.cache_dir, args.cache_size * 1024 * 1024), args.memory_cache * 1024 * 1024)
+    # done once here instead of in every request
+    engine_fingerprint()
+    output = ThreadOutput(sys.stdout)
+    sys.stdout = output
+    server = CompileServer(args.socket, cache, output)
+    print("Listening on " + args.socket)
+    try:
+        with server: server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sys.stdout = output.default
+        with contextlib.suppress(OSError): os.remove(args.socket)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,52 @@
+# Symbol table for scripting language : Ethan
+# Shared by the English and the Bangla transpilers.
+
+# Types a variable may have to take a value of the given expression type
+ASSIGNABLE = {
+    'int': ('int', 'long'),
+    'long': ('long',),
+    'float': ('float', 'double', 'exp'),
+    'double': ('double', 'exp'),
+    'exp': ('exp',),
+}
+
+class Symbol:
+    __slots__ = ('name', 'type', 'line', 'scope')
+
+    def __init__(self, name, type_=None, line=None, scope=0):
+        self.name = name
+        self.type = type_
+        self.line = line
+        self.scope = scope
+
+    def __repr__(self):
+        return f'{self.name}:{self.type}@{self.line}'
+
+class SymbolTable:
+    def __init__(self):
+        self.symbols = {}
+
+    def __contains__(self, name):
+        return name in self.symbols
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def declare(self, name, type_=None, line=None, scope=0):
+        symbol = self.symbols[name] = Symbol(name, type_, line, scope)
+        return symbol
+
+    def lookup(self, name):
+        return self.symbols.get(name)
+
+    def type_of(self, name):
+        symbol = self.symbols.get(name)
+        return symbol.type if symbol else None
+
+    def set_type(self, name, type_):
+        self.symbols[name].type = type_
+
+    def accepts(self, name, value_type):
+        # can the variable 'name' be assigned a value of type value_type
+        symbol = self.symbols.get(name)
+        return symbol is not None and symbol.type in ASSIGNABLE.get(value_type, ())
@@ -0,0 +1,29 @@
+# Tests of Ethan.py given more than one file
+#
+#   python -m pytest tests
+
+import os, subprocess, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def ethan(tmp_path, args, env=None):
+    # runs Ethan.py on two programs in tmp_path, returns its result
+    for name in ('a', 'b'): (tmp_path / (name + '.ethan')).write_text('print "%s"\n' % name, encoding='utf8')
+    files = [str(tmp_path / 'a.ethan'), str(tmp_path / 'b.ethan')]
+    return subprocess.run([sys.executable, os.path.join(ROOT, 'Ethan.py'), '--no-cache', '-j', '2'] + args + files, capture_output=True, text=True, cwd=tmp_path, env=dict(os.environ, **(env or {})))
+
+def test_compiler_messages(tmp_path):
+    # what the C compiler prints goes under its file's line, not to the terminal
+    cc = tmp_path / 'fake-cc'
+    cc.write_text("#!/bin/sh\necho 'fake.c:1: error: boom' >&2\nexit 1\n")
+    cc.chmod(0o755)
+    result = ethan(tmp_path, ['--build'], {'CC': str(cc)})
+    assert result.returncode == 1
+    assert 'boom' not in result.stderr
+    assert result.stdout.count('        fake.c:1: error: boom\n        Error: Building failed.\n') == 2
+
+def test_single_file_modes(tmp_path):
+    for mode in ('--run', '--interpret', '--tiered'):
+        result = ethan(tmp_path, [mode])
+        assert result.returncode == 2
+        assert 'take a single file' in result.stderr
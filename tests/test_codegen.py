@@ -0,0 +1,33 @@
+# Tests of the C that codegen.CGenerator writes
+#
+#   python -m pytest tests
+#
+# The programs are put through Ethan.py --run, so they're transpiled, built by the C
+# compiler and run the way a user would.
+
+import os, subprocess, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run(tmp_path, source, stdin=''):
+    # builds and runs source, returns what Ethan.py printed
+    path = tmp_path / 'program.ethan'
+    path.write_text(source, encoding='utf8')
+    result = subprocess.run([sys.executable, os.path.join(ROOT, 'Ethan.py'), '--run', '--no-cache', str(path)], input=stdin, capture_output=True, text=True, cwd=tmp_path)
+    assert result.returncode == 0, result.stdout + result.stderr
+    return result.stdout
+
+def test_minus_negated_product(tmp_path):
+    # a - -b * c must not be written as a--b*c, a decrement
+    output = run(tmp_path, 'get a, b, c as int\nlet d = a - -b * c\nprint d\n', '1 2 3\n')
+    assert '\n7\n' in output
+    with open(tmp_path / 'program.c', encoding='utf8') as f: assert '--' not in f.read()
+
+def test_print_format(tmp_path):
+    # a literal % goes into printf's format as %%, among arguments of each type
+    source = 'get x as int\nget r as double\nprint "100%" !end ""\nprint x\nprint "x%d", x, r, 7 * 6, "%s" !separator "%"\n'
+    output = run(tmp_path, source, '42 2.5\n')
+    assert '\n100%42\nx%d%42%2.500000%42%%s\n' in output
+    with open(tmp_path / 'program.c', encoding='utf8') as f: c = f.read()
+    assert 'fputs("100%", stdout);' in c
+    assert 'printf("x%%d%%%d%%%lf%%42%%%%s\\n", x, r);' in c
@@ -0,0 +1,41 @@
+# Tests of the counts a program built with --counters writes
+#
+#   python -m pytest tests
+
+import json, os, subprocess, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def counts(tmp_path, source, stdin=''):
+    # builds and runs source with --counters, returns its program.counts.json
+    path = tmp_path / 'program.ethan'
+    path.write_text(source, encoding='utf8')
+    result = subprocess.run([sys.executable, os.path.join(ROOT, 'Ethan.py'), '--run', '--counters', '--no-cache', str(path)], input=stdin, capture_output=True, text=True, cwd=tmp_path)
+    assert result.returncode == 0, result.stdout + result.stderr
+    with open(tmp_path / 'program.counts.json', encoding='utf8') as f: return json.load(f)
+
+def test_branch_lines(tmp_path):
+    # each branch is counted under its own line, an else under the line of the else
+    source = '\n'.join([
+        'get n as int',
+        'let i = 0',
+        'while i < n repeat',
+        '    if i < 2 then',
+        '        print i',
+        '    end',
+        '    else if i < 3 then',
+        '        print i',
+        '    end',
+        '    else',
+        '        print i',
+        '    end',
+        '    i = i + 1',
+        'end',
+        '',
+    ])
+    found = counts(tmp_path, source, '5\n')
+    assert found['1'] == {'get': 1}
+    assert found['3'] == {'while': 5}
+    assert found['4'] == {'if': 2}
+    assert found['7'] == {'else if': 1}
+    assert found['10'] == {'else': 2}
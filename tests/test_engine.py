@@ -0,0 +1,33 @@
+# Tests of the Lexer and Parser, engine.py
+#
+#   python -m pytest tests
+
+import contextlib, io, os, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import engine
+from codegen import CGenerator, Transpiler
+from generate import generate
+
+def parsed(tokens):
+    # the C of the program parsed from tokens, and the parser
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser = engine.Parser(tokens)
+        program = parser.parse()
+    transpiler = Transpiler(None)
+    CGenerator(transpiler).generate(program)
+    return ''.join(transpiler.header + transpiler.other + transpiler.main), parser
+
+def test_stream():
+    # parsed as it's lexed, a buffer at a time, the program is the one lexed whole
+    for lang in ('en', 'bn'):
+        source = generate(lang, 300)
+        whole, _ = parsed(engine.Lexer(source, lang).tokenize())
+        for size in (1, 7, 100):
+            c, parser = parsed(engine.Lexer(source, lang).stream(size=size))
+            assert c == whole
+            # only the last buffer is kept
+            assert parser.base > 0 and len(parser.buffer) < size + 100
@@ -0,0 +1,63 @@
+# Tests of incremental.Incremental
+#
+#   python -m pytest tests
+
+import contextlib, io, os, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import engine
+from codegen import CGenerator, Transpiler
+from incremental import Incremental
+from optimizer import optimize
+
+SOURCE = 'get a, b as int\nprint "sum", a + b\nlet i = 0\nwhile i < a repeat\n    i = i + 1\nend\nget c as int\nprint c, i\n'
+
+def c_of(generator_of, **options):
+    transpiler = Transpiler(None)
+    generator_of(CGenerator(transpiler, **options))
+    return ''.join(transpiler.header + transpiler.other + transpiler.main)
+
+def test_spliced_c_follows_the_generator_options():
+    # the units' C is written again when an option that changes it does, and with it
+    incremental = Incremental('en')
+    with contextlib.redirect_stdout(io.StringIO()):
+        for options in ({}, {'stdout_buffer': 4096}, {'fast_input': True}, {'stdout_buffer': 4096, 'fast_input': True}, {'counters': 'program.counts.json'}):
+            for source in (SOURCE, SOURCE + 'print 1\n'):
+                assert incremental.update(source)
+                program = engine.Parser(engine.Lexer(source, 'en').tokenize()).parse()
+                assert c_of(incremental.generate, **options) == c_of(lambda generator: generator.generate(program), **options)
+
+BASE = 'get n as int\nlet a = 2\nlet b = a * 3\nprint b\nlet c = 4\nprint c + 1, n * 2\nlet d = c\nprint d\n'
+
+def test_optimized_edits():
+    # after each edit the optimized C and stats are those of the program optimized whole;
+    # only the units parsed again are optimized when nothing else has their variables
+    one = BASE.replace('c + 1', 'c + 2')
+    two = one.replace('print b\n', 'print b\nlet v = 1\nlet x = 1\n')
+    edited = [
+        # (source, units optimized again, None for all of them)
+        (BASE, None),
+        (one, None),
+        (one.replace('print b\n', 'print b\nlet e = 5\nprint e * 7\nlet w = 1\n'), 3),
+        (two, 2),
+        (two.replace('let d', 'x = 2\nlet d'), None),
+        (two, None),
+        (two.replace('let c', 'let e = 5\nprint e * 7\nlet c'), 2),
+        (two, 0),
+        (two.replace('let c', 'print 2 / 0\nlet c'), None),
+        (two, None),
+        (two.replace('let c', 'print n * 2\nlet c'), None),
+    ]
+    incremental = Incremental('en')
+    with contextlib.redirect_stdout(io.StringIO()):
+        for source, again in edited:
+            assert incremental.update(source)
+            stats = []
+            got = c_of(lambda generator: stats.append(incremental.generate(generator, True)))
+            program = engine.Parser(engine.Lexer(source, 'en').tokenize()).parse()
+            expected = optimize(program)
+            assert got == c_of(lambda generator: generator.generate(program))
+            assert stats == [expected]
+            assert incremental.reoptimized == (len(incremental.units) if again is None else again)
@@ -0,0 +1,71 @@
+# Tests of what the generated programs read and print with --stdout-buffer and --fast-input
+#
+#   python -m pytest tests
+
+import os, select, subprocess, sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def build(tmp_path, source, *options):
+    # builds source with options, returns the executable's path
+    path = tmp_path / 'program.ethan'
+    path.write_text(source, encoding='utf8')
+    result = subprocess.run([sys.executable, os.path.join(ROOT, 'Ethan.py'), '--build', '--no-cache', *options, str(path)], capture_output=True, text=True, cwd=tmp_path)
+    assert result.returncode == 0, result.stdout + result.stderr
+    return str(tmp_path / ('program.exe' if os.name == 'nt' else 'program'))
+
+@pytest.mark.parametrize('options', [('--stdout-buffer', '64'), ('--fast-input',), ('--fast-input', '--stdout-buffer', '64')])
+def test_flush_before_get(tmp_path, options):
+    # the prompt is out before the program waits for its input
+    exe = build(tmp_path, 'print "n?"\nget n as int\nprint n * 2\n', *options)
+    with subprocess.Popen([exe], stdin=subprocess.PIPE, stdout=subprocess.PIPE) as program:
+        assert select.select([program.stdout], [], [], 10)[0], "no prompt"
+        assert program.stdout.read1(64) == b'n?\n'
+        assert program.communicate(b'21\n')[0] == b'42\n'
+
+# 2^180 in three factors: reals are printed with %f, and scaled by it a few of the last
+# bits show even in small ones
+SCALE = ' * 1152921504606846976.0' * 3
+NUMBERS = '\n'.join([
+    'get n as int',
+    'let i = 0',
+    'while i < n repeat',
+    '    get k as int',
+    '    get l as long',
+    '    get d as double',
+    '    get f as float',
+    '    print k, l, d, d' + SCALE + ', f, f' + SCALE,
+    '    i = i + 1',
+    'end',
+    '',
+])
+# an int, a long long, a double and a float on each line; the reals past 19 digits, 2^53
+# (2^24 for floats) or 10^22 (10^10), and the hexadecimal ones, go to strtod/strtof
+INPUT = '''12
+42 -9223372036854775808 0.1 0.1
+-17 9223372036854775807 1e300 3.4e38
++8 -5 1e-31 1e-30
+-2147483648 0 3.14159265358979323846264338327950288 2.718281828459045235360287
+2147483647 12 -2.5E-3 7e+2
+0 +77 1e22 1e10
+1 -1 1e23 1e11
+2 2 9007199254740993 16777217
+3 3 0x1.8p1 -0x1p-3
+4 4 1.7976931348623157e308 0.3e-10
+5 5 0.3 0.7
+-6 -6 123456.789e-15 -1.1
+'''
+
+def test_fast_input_values(tmp_path):
+    # every number --fast-input reads is the one scanf gives
+    outputs = []
+    for options in ((), ('--fast-input',)):
+        exe = build(tmp_path, NUMBERS, *options)
+        result = subprocess.run([exe], input=INPUT.encode(), capture_output=True)
+        assert result.returncode == 0
+        outputs.append(result.stdout)
+    assert outputs[0] == outputs[1]
+    assert outputs[0].startswith(b'42 -9223372036854775808 0.100000 ')
+    assert b'\n2 2 9007199254740992.000000 ' in outputs[0]
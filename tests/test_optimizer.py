@@ -0,0 +1,126 @@
+# Tests of the optimizer's passes, optimizer.py
+#
+#   python -m pytest tests
+#
+# Each program is run with and without --no-optimize; both must print the same, and the
+# C shows what the passes did.
+
+import os, subprocess, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# the last of Ethan.py's own lines before the program's output
+BEFORE_OUTPUT = ('Compiling finished!', 'Hoisted ', 'Building Completed!')
+
+def run(tmp_path, source, stdin='', mode='--run', optimize=True):
+    # builds and runs source, returns what the program printed, its exit code and its C
+    path = tmp_path / 'program.ethan'
+    path.write_text(source, encoding='utf8')
+    command = [sys.executable, os.path.join(ROOT, 'Ethan.py'), mode, '--no-cache', str(path)]
+    if not optimize: command.append('--no-optimize')
+    result = subprocess.run(command, input=stdin, capture_output=True, text=True, cwd=tmp_path)
+    lines = result.stdout.split('\n')
+    start = max(i for i, line in enumerate(lines) if line.startswith(BEFORE_OUTPUT)) + 1
+    end = max(i for i, line in enumerate(lines) if line.startswith('Executed!')) - 1
+    c = (tmp_path / 'program.c').read_text(encoding='utf8') if mode == '--run' else None
+    return '\n'.join(lines[start:end]) + '\n', result.returncode, c
+
+def both(tmp_path, source, stdin='', mode='--run'):
+    # the optimized program's output and C, checked to print what the unoptimized one does
+    output, code, c = run(tmp_path, source, stdin, mode)
+    assert run(tmp_path, source, stdin, mode, optimize=False)[:2] == (output, code)
+    return output, code, c
+
+def test_folding(tmp_path):
+    # values folded with the C type's arithmetic: float rounds 2^24 + 1 down, double doesn't
+    source = '\n'.join([
+        'declare l as long',
+        'declare f as float',
+        'declare d as double',
+        'l = 2147483647',
+        'l = l * 4 + 3',
+        'f = 16777216.0',
+        'f = f + 1',
+        'd = 16777216.0',
+        'd = d + 1',
+        'let i = 7 / 2 - 9 % 4 * -1',
+        'print i, l, f, d',
+        'print 1.0 / 3, -7 / 2, 7.5 / 2',
+        '',
+    ])
+    output, code, c = both(tmp_path, source)
+    assert (output, code) == ('4 8589934591 16777216.000000 16777217.000000\n0.333333 -3 3.750000\n', 0)
+    for expression in ('l*4', 'f+1', 'd+1', '7/2', '1.0/3'): assert expression not in c
+
+def test_dead_stores(tmp_path):
+    # x = 1 is overwritten on both branches; z = 5 is read when the loop doesn't run
+    source = '\n'.join([
+        'get n as int',
+        'let x = 1',
+        'if n > 0 then',
+        '    x = 3',
+        'end',
+        'else',
+        '    x = 4',
+        'end',
+        'print x',
+        'let z = 5',
+        'let i = 0',
+        'while i < n repeat',
+        '    z = i * 2',
+        '    i = i + 1',
+        'end',
+        'print z',
+        'x = 99',
+        '',
+    ])
+    assert both(tmp_path, source, '0\n')[:2] == ('4\n5\n', 0)
+    output, code, c = both(tmp_path, source, '2\n')
+    assert (output, code) == ('3\n2\n', 0)
+    assert 'x = 1' not in c and 'x = 99' not in c
+    assert 'int z = 5;' in c and 'z = i*2;' in c
+
+def test_get_kept(tmp_path):
+    # a get whose value is never read still takes its number from the input
+    output, code, c = both(tmp_path, 'get skipped as int\nget n as int\nprint n\n', '7 8\n')
+    assert (output, code) == ('8\n', 0)
+    assert '&skipped' in c
+
+def test_trapping_store_kept(tmp_path):
+    # q is never read, but dividing by n = 0 must still stop the program
+    output, code, _ = both(tmp_path, 'get n as int\nprint n\nlet q = 10 / n\n', '0\n', '--interpret')
+    assert output == '0\n\nError: Integer division by zero or overflow on line 3\n'
+    assert code != 0
+
+LOOP = '\n'.join([
+    'get n, k as int',
+    'get f as float',
+    'let _t0 = n',
+    'let i = 0',
+    'let s = 0',
+    'declare g as float',
+    'g = 0.0',
+    'while i < n repeat',
+    '    s = s + 100 / k',
+    '    s = s + (k * 3 + 1) * (k * 3 + 1) + _t0',
+    '    g = g + f * f + f * f',
+    '    i = i + 1',
+    'end',
+    'print s, g',
+    '',
+])
+
+def test_loop_temporaries(tmp_path):
+    # invariant and repeated expressions go in new variables of their C type, not in the
+    # program's own _t0
+    output, code, c = both(tmp_path, LOOP, '3 2 0.1\n')
+    assert (output, code) == ('306 0.060000\n', 0)
+    loop = c.index('while (')
+    for declaration in ('int _t1 = k*3+1;', 'float _t2 = f*f;', 'int _t3 = _t1*_t1;'): assert -1 < c.index(declaration) < loop
+    assert 'g = g+_t2+_t2;' in c[loop:]
+
+def test_division_not_hoisted(tmp_path):
+    # 100 / k would trap in front of a loop that doesn't run
+    output, code, c = both(tmp_path, LOOP, '0 0 0.1\n')
+    assert (output, code) == ('0 0.000000\n', 0)
+    assert 's = s+100/k;' in c[c.index('while ('):]
+    assert both(tmp_path, LOOP, '0 0 0.1\n', '--interpret')[:2] == ('0 0.000000\n', 0)
@@ -0,0 +1,37 @@
+# Tests of the memory --profile and --profile-memory record for each stage
+#
+#   python -m pytest tests
+
+import json, os, subprocess, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# a program whose parse stage keeps far more than the stages around it
+SOURCE = ''.join('let a%d = %d\nprint a%d + 1\n' % (i, i, i) for i in range(3000))
+
+def stages(tmp_path, option):
+    # compiles SOURCE with option, returns the stages of its program.trace.json
+    path = tmp_path / 'program.ethan'
+    path.write_text(SOURCE, encoding='utf8')
+    result = subprocess.run([sys.executable, os.path.join(ROOT, 'Ethan.py'), option, '--no-cache', str(path)], capture_output=True, text=True, cwd=tmp_path)
+    assert result.returncode == 0, result.stdout + result.stderr
+    with open(tmp_path / 'program.trace.json', encoding='utf8') as f: trace = json.load(f)
+    return trace['otherData']['stages']
+
+def test_stage_memory(tmp_path):
+    # each stage has its own peak and increase, not the process's peak so far
+    found = stages(tmp_path, '--profile-memory')
+    assert list(found) == ['load', 'lex', 'parse', 'optimize', 'codegen', 'transpile']
+    peaks = [counts['peak_kib'] for counts in found.values()]
+    added = [counts['added_kib'] for counts in found.values()]
+    assert len(set(peaks)) > 1 and len(set(added)) > 1
+    assert found['parse']['added_kib'] > 4 * max(found[name]['added_kib'] for name in ('load', 'lex', 'codegen', 'transpile'))
+    for counts in found.values(): assert counts['added_kib'] <= counts['peak_kib']
+
+def test_stage_rss(tmp_path):
+    # without tracing, each stage has what it added to the peak resident memory, which a
+    # program this small may leave where Python's start put it
+    found = stages(tmp_path, '--profile')
+    for counts in found.values(): assert 'peak_kib' not in counts
+    if sys.platform == 'win32': return
+    assert all(counts['rss_added_kib'] >= 0 for counts in found.values())
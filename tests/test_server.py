@@ -0,0 +1,29 @@
+# Tests of the compile server, server.py
+#
+#   python -m pytest tests
+
+import os, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import server
+
+def test_build_messages(tmp_path, monkeypatch):
+    # what the C compiler prints goes back to the client, and no lock is left behind
+    cc = tmp_path / 'fake-cc'
+    cc.write_text("#!/bin/sh\necho 'fake.c:1: error: boom' >&2\nexit 1\n")
+    cc.chmod(0o755)
+    monkeypatch.setattr(sys.modules['Ethan'], 'C_COMPILER', str(cc))
+    output = server.ThreadOutput(sys.stdout)
+    monkeypatch.setattr(sys, 'stdout', output)
+    path = tmp_path / 'program.ethan'
+    path.write_text('print 1\n', encoding='utf8')
+    compile_server = server.CompileServer(str(tmp_path / 'server.sock'), None, output)
+    try:
+        reply = compile_server.reply({'action': 'build', 'file': str(path)})
+    finally:
+        compile_server.server_close()
+    assert reply['code'] == 1
+    assert 'fake.c:1: error: boom\nError: Building failed.\n' in reply['output']
+    assert compile_server.file_locks == {}
@@ -0,0 +1,74 @@
+# Tests of the loop trip estimates of tiers.py
+#
+#   python -m pytest tests
+
+import os, sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import engine, tiers
+from optimizer import optimize
+
+def loop(start, cond, update):
+    return 'let i = %s\nwhile %s repeat\n    print i\n    %s\nend\n' % (start, cond, update)
+
+def work(source):
+    # statements a run executes by tiers' estimate, the same with and without the optimizer
+    program = engine.Parser(engine.Lexer(source, 'en').tokenize()).parse()
+    plain = tiers.statements(program.body)
+    optimize(program)
+    assert tiers.statements(program.body) == plain
+    return plain
+
+def iterations(source):
+    # the let, the while and two statements (the condition included) per iteration
+    return (work(source) - 2) / 3
+
+@pytest.mark.parametrize('source, trips', [
+    (loop(0, 'i < 5000000', 'i = i + 1'), 5000000),
+    (loop(0, 'i <= 10', 'i = i + 1'), 11),
+    (loop(0, 'i < 10', 'i = i + 3'), 4),
+    (loop(-5, '20 > i', 'i = 1 + i'), 25),
+    (loop(20, 'i < 10', 'i = i + 1'), 0),
+])
+def test_counting_up(source, trips):
+    assert iterations(source) == trips
+
+@pytest.mark.parametrize('source, trips', [
+    (loop(5000000, 'i > 0', 'i = i - 1'), 5000000),
+    (loop(10, 'i >= 1', 'i = i - 1'), 10),
+    (loop(100, 'i > -1', 'i = i + -10'), 11),
+    (loop(5, '0 < i', 'i = i - 2'), 3),
+])
+def test_counting_down(source, trips):
+    assert iterations(source) == trips
+
+@pytest.mark.parametrize('source, trips', [
+    (loop(3000000, 'i != 0', 'i = i - 2'), 1500000),
+    (loop(0, 'i != 12', 'i = i + 4'), 3),
+    # steps past the bound: not worked out
+    (loop(10, 'i != 0', 'i = i - 3'), tiers.UNKNOWN_TRIPS),
+])
+def test_not_equal(source, trips):
+    assert iterations(source) == trips
+
+@pytest.mark.parametrize('source, trips', [
+    # the start isn't known: the bound, unless it's 0 or 1
+    ('get i as int\nwhile i < 2000 repeat\n    print i\n    i = i + 1\nend\n', 2000),
+    ('get i as int\nwhile i > 0 repeat\n    print i\n    i = i - 1\nend\n', tiers.UNKNOWN_TRIPS),
+    # updated in a nested block
+    (loop(0, 'i < 50', 'if i > 3 then\n        i = i + 1\n    end\n    i = i + 1'), 50),
+    (loop(9, 'i != 1', 'i = i * 2'), tiers.UNKNOWN_TRIPS),
+])
+def test_not_worked_out(source, trips):
+    body = 3 if 'if' not in source else 5
+    assert (work(source) - 2) / body == trips
+
+def test_choose():
+    # a long loop counting down is built, as one counting up is
+    for source in (loop(0, 'i < 5000000', 'i = i + 1'), loop(5000000, 'i > 0', 'i = i - 1'), loop(5000000, 'i != 0', 'i = i - 1')):
+        assert tiers.choose(engine.Parser(engine.Lexer(source, 'en').tokenize()).parse()) == tiers.NATIVE
+    assert tiers.choose(engine.Parser(engine.Lexer(loop(10, 'i > 0', 'i = i - 1'), 'en').tokenize()).parse()) == tiers.INTERPRETED
@@ -0,0 +1,26 @@
+# Tests of the bytecode interpreter, vm.py
+#
+#   python -m pytest tests
+#
+# The expected outputs are those of the C program built from the same source.
+
+import contextlib, io, os, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import engine, vm
+
+def interpret(source, stdin, fast_input=False):
+    # what the program prints, run on stdin
+    with contextlib.redirect_stdout(io.StringIO()):
+        program = engine.Parser(engine.Lexer(source, 'en').tokenize()).parse()
+    out = io.BytesIO()
+    assert vm.compile_program(program).run(io.BytesIO(stdin), out, fast_input) == 0
+    return out.getvalue()
+
+def test_get_stops_at_a_malformed_number():
+    # scanf leaves b and the rest of the get alone once a fails; runtime.READER goes on
+    source = 'get a, b as int\nprint a, b\nget c as int\nprint c\n'
+    assert interpret(source, b'- 5 7\n') == b'0 0\n5\n'
+    assert interpret(source, b'- 5 7\n', fast_input=True) == b'0 5\n7\n'
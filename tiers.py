@@ -0,0 +1,113 @@
+# Tier policy for scripting language : Ethan
+#
+# Ethan.tiered runs a program on one of two tiers: the bytecode interpreter (vm.py), which
+# starts at once but executes a statement some hundred times slower than C does, and the
+# executable, which first costs a run of the C compiler. choose() estimates from the
+# program's loops how many statements a run of it executes and picks the tier that gives
+# the results first. A program that is interpreted is built in the background as well
+# when its loops are long enough for the executable to pay off on the next run, or when
+# it has been run before; from then on the executable is taken from the cache.
+
+import math
+
+from nodes import Let, Assign, If, While, Num, Var, Unary, BinOp, Compare
+from optimizer import assigned
+
+NATIVE, TIERED, INTERPRETED = 'native', 'tiered', 'interpreted'
+
+# statements the interpreter executes in about the time the C compiler takes to build a
+# small program
+NATIVE_STATEMENTS = 500000
+# statements from which a run is worth building the program for the next one
+BUILD_STATEMENTS = 10000
+# runs of the same source after which it's built whatever its loops
+BUILD_AFTER_RUNS = 1
+# iterations taken for a loop whose count can't be worked out
+UNKNOWN_TRIPS = 1000
+
+# the comparison as seen from the other side: 5 < i is i > 5
+FLIPPED = {'<': '>', '<=': '>=', '>': '<', '>=': '<=', '==': '==', '!=': '!='}
+
+def constant(node):
+    # the value of a number literal, negative ones included; None for anything else
+    if type(node) is Unary and node.op == '-':
+        value = constant(node.operand)
+        return None if value is None else -value
+    if type(node) is Num and math.isfinite(node.value): return node.value
+    return None
+
+def step(body, name):
+    # what the one statement of body (not of its nested blocks) updating name adds to it,
+    # as in i = i + 2 or i = i - 1; None when it's updated any other way
+    steps = [node for node in body if type(node) is Assign and node.name == name]
+    if len(steps) != 1 or name in assigned([node for node in body if type(node) is If or type(node) is While]): return None
+    value = steps[0].value
+    if type(value) is not BinOp or value.op not in ('+', '-'): return None
+    if type(value.left) is Var and value.left.name == name: by = constant(value.right)
+    elif type(value.right) is Var and value.right.name == name and value.op == '+': by = constant(value.left)
+    else: return None
+    if by is None: return None
+    return by if value.op == '+' else -by
+
+def count(start, by, op, bound):
+    # iterations of a loop on a variable going from start by by while it stands op bound;
+    # None when it doesn't end
+    if op == '!=':
+        if start == bound: return 0
+        steps = (bound - start) / by if by else -1
+        return int(steps) if steps > 0 and steps == int(steps) else None
+    if op == '==': return 0 if start != bound else (1 if by else None)
+    # counting down to a bound is counting up to its negation
+    if op == '>' or op == '>=': start, by, op, bound = -start, -by, FLIPPED[op], -bound
+    if start > bound or (start == bound and op == '<'): return 0
+    if by <= 0: return None
+    if op == '<': return math.ceil((bound - start) / by)
+    return math.floor((bound - start) / by) + 1
+
+def trips(loop, known=None):
+    # iterations of a while loop whose condition compares a variable with a constant, from
+    # the variable's value in front of the loop (known has those that are constant) and the
+    # step its update in the loop takes. Without them, the constant itself when its
+    # magnitude says anything, as for i < 1000 counting up from 0
+    cond = loop.cond
+    if type(cond) is not Compare: return UNKNOWN_TRIPS
+    if type(cond.left) is Var and constant(cond.right) is not None:
+        name, op, bound = cond.left.name, cond.op, constant(cond.right)
+    elif type(cond.right) is Var and constant(cond.left) is not None:
+        name, op, bound = cond.right.name, FLIPPED[cond.op], constant(cond.left)
+    else: return UNKNOWN_TRIPS
+    start, by = (known or {}).get(name), step(loop.body, name)
+    if start is not None and by is not None:
+        n = count(start, by, op, bound)
+        if n is not None: return n
+    if op == '==' or abs(bound) <= 1: return UNKNOWN_TRIPS
+    return int(abs(bound))
+
+def statements(body, known=None):
+    # statements a run of body executes, loop conditions included; an if counts both
+    # branches. known has the constant values of variables in front of body
+    known = {} if known is None else dict(known)
+    total = 0
+    for node in body:
+        total += 1
+        t = type(node)
+        if t is While:
+            inside = {name: value for name, value in known.items() if name not in assigned(node.body)}
+            total += trips(node, known) * (statements(node.body, inside) + 1)
+        elif t is If:
+            total += statements(node.body, known)
+            if node.orelse: total += statements(node.orelse, known)
+        if t is Let or t is Assign:
+            value = constant(node.value)
+            if value is None: known.pop(node.name, None)
+            else: known[node.name] = value
+        else:
+            for name in assigned([node]): known.pop(name, None)
+    return total
+
+def choose(program, runs=0):
+    # the tier for a run of program that has been run runs times before
+    work = statements(program.body)
+    if work >= NATIVE_STATEMENTS: return NATIVE
+    if work >= BUILD_STATEMENTS or runs >= BUILD_AFTER_RUNS: return TIERED
+    return INTERPRETED
@@ -0,0 +1,651 @@
+# Bytecode interpreter for scripting language : Ethan
+#
+# Runs a nodes.Program in-process, without a C compiler. compile_program() turns it into
+# Code: instructions packed in an array of ints, and a register file holding the
+# variables, the constants and the values of subexpressions. Every value is kept in the C
+# type the generated program keeps it in, and every operation is done the way the C does
+# it on the usual 64 bit targets: int and long long wrap around, float results are
+# rounded to single precision, conversions to integers truncate (and give the smallest
+# integer when out of range, like x86), reals divided by zero give infinities or NaNs,
+# and an integer division by zero stops the program with a Trap where the C gets SIGFPE.
+# get reads numbers the way scanf does, or runtime.READER with --fast-input.
+
+import io, math, operator, re, signal, struct, sys
+from array import array
+
+from nodes import Num, Str, Var, Unary, BinOp, Compare, Logical, Not
+from optimizer import ctype_of
+from semantics import VAR_CTYPES, INT_LIMITS, common_ctype, c_divmod
+
+# Instructions; their operands are registers, jump targets, or indexes into
+# CONVERSION_FUNCTIONS, Code.prints and Code.gets. execute() tests for them by these groups.
+(
+    JLT, JLE, JGT, JGE, JEQ, JNE,           # a b target: jump when a op b
+    JNLT, JNLE, JNGT, JNGE, JNEQ, JNNE,     # a b target: jump unless a op b (a NaN never compares)
+    JUMP,                                   # target
+    ADD_I, SUB_I, MOVE, MUL_I, DIV_I, MOD_I, # dst a b (MOVE: dst a)
+    ADD_D, SUB_D, MUL_D, DIV_D,
+    ADD_L, SUB_L, MUL_L, DIV_L, MOD_L,
+    ADD_F, SUB_F, MUL_F, DIV_F,
+    NEG_I, NEG_L, NEG_R,                    # dst a
+    CONVERT,                                # dst a conversion
+    JTRUE, JFALSE,                          # a target: jump when a is non-zero, or zero
+    PRINT, GET,                             # index
+    HALT,
+) = range(41)
+
+# words taken by each instruction, the opcode included
+SIZES = [4] * 12 + [2] + [4, 4, 3] + [4] * 16 + [3] * 3 + [4] + [3] * 2 + [2] * 2 + [1]
+
+ARITHMETIC = {
+    ('+', 'int'): ADD_I, ('-', 'int'): SUB_I, ('*', 'int'): MUL_I, ('/', 'int'): DIV_I, ('%', 'int'): MOD_I,
+    ('+', 'long long'): ADD_L, ('-', 'long long'): SUB_L, ('*', 'long long'): MUL_L, ('/', 'long long'): DIV_L, ('%', 'long long'): MOD_L,
+    ('+', 'float'): ADD_F, ('-', 'float'): SUB_F, ('*', 'float'): MUL_F, ('/', 'float'): DIV_F,
+    ('+', 'double'): ADD_D, ('-', 'double'): SUB_D, ('*', 'double'): MUL_D, ('/', 'double'): DIV_D,
+}
+NEGATE = {'int': NEG_I, 'long long': NEG_L, 'float': NEG_R, 'double': NEG_R}
+# the jumps taken when a comparison doesn't hold, and when it does
+COMPARE_JUMPS = {
+    '<': (JNLT, JLT), '<=': (JNLE, JLE), '>': (JNGT, JGT),
+    '>=': (JNGE, JGE), '==': (JNEQ, JEQ), '!=': (JNNE, JNE),
+}
+# the comparison of each conditional jump, and whether it jumps when that holds
+COMPARISONS = (operator.lt, operator.le, operator.gt, operator.ge, operator.eq, operator.ne) * 2
+JUMPS_WHEN = (True,) * 6 + (False,) * 6
+
+# printf conversions of print by Ethan type, as codegen.PRINTF_SPECIFIERS
+SPECIFIERS = {'int': b'%d', 'long': b'%d', 'float': b'%f', 'double': b'%f', 'exp': b'%E'}
+# C type a get reads, by Ethan type, as codegen.SCANF_SPECIFIERS
+GET_CTYPES = {'int': 'int', 'long': 'long long', 'float': 'float', 'double': 'double', 'exp': 'double'}
+# escape sequences in strings, which the source keeps as written for the C compiler
+ESCAPES = re.compile(rb'\\(?:([0-7]{1,3})|x([0-9a-fA-F]+)|(.))', re.S)
+ESCAPED = {b'n': b'\n', b't': b'\t', b'r': b'\r', b'a': b'\a', b'b': b'\b', b'f': b'\f', b'v': b'\v'}
+
+# what runtime.READER takes for a number
+SPACE = rb'[ \t\n\r\v\f]*'
+INTEGER = re.compile(SPACE + rb'([-+]?)([0-9]*)')
+REAL = re.compile(SPACE + rb'([-+]?(?:[iInN][a-zA-Z]*|0[xX][0-9a-fA-F]*(?:\.[0-9a-fA-F]*)?(?:[pP][-+]?[0-9]*)?|[0-9]*(?:\.[0-9]*)?(?:[eE][-+]?[0-9]*)?))')
+# the part of it strtod converts
+STRTOD = re.compile(rb'([-+]?)(?:(inf(?:inity)?)|(nan)|0x([0-9a-f]*)(?:\.([0-9a-f]*))?(?:p([-+]?[0-9]+))?|([0-9]*)(?:\.([0-9]*))?(?:e([-+]?[0-9]+))?)', re.I)
+# longest number runtime.READER keeps
+TOKEN_SIZE = 511
+READ_SIZE = 1 << 16
+
+INT_MIN, INT_MAX = INT_LIMITS['int']
+LONG_MIN, LONG_MAX = INT_LIMITS['long long']
+# what 0.0 / 0.0 gives on this machine (a NaN with its sign set on x86)
+DEFAULT_NAN = math.inf - math.inf
+_single = struct.Struct('f')
+
+class CompileError(Exception):
+    # the C compiler would reject the program
+    pass
+
+class Trap(Exception):
+    # the program would have been stopped by SIGFPE
+    signal = signal.SIGFPE
+
+    def __init__(self, line):
+        super().__init__("Integer division by zero or overflow on line " + str(line))
+        self.line = line
+
+# C arithmetic and conversions on the values of registers
+
+def single(x):
+    # x rounded to a float
+    try: return _single.unpack(_single.pack(x))[0]
+    except OverflowError: return math.copysign(math.inf, x)
+
+def single_of_ratio(n, d):
+    # n / d (both positive) rounded to the nearest float, ties to even
+    e = n.bit_length() - d.bit_length()
+    if (n << max(0, -e)) < (d << max(0, e)): e -= 1
+    # the value of the last bit a float keeps there
+    q = max(e, -126) - 23
+    if q >= 0: d <<= q
+    else: n <<= -q
+    m, rest = divmod(n, d)
+    if 2 * rest > d or (2 * rest == d and m & 1): m += 1
+    if m.bit_length() + q > 128: return math.inf
+    return math.ldexp(m, q)
+
+def double_of_ratio(n, d):
+    # n / d (both positive) rounded to the nearest double
+    try: return n / d
+    except OverflowError: return math.inf
+
+def wrap_int(x):
+    return (x - INT_MIN) % 2**32 + INT_MIN
+
+def wrap_long(x):
+    return (x - LONG_MIN) % 2**64 + LONG_MIN
+
+def real_to_int(x):
+    return int(x) if -2147483649.0 < x < 2147483648.0 else INT_MIN
+
+def real_to_long(x):
+    return int(x) if -9223372036854775808.0 <= x < 9223372036854775808.0 else LONG_MIN
+
+def integer_to_float(x):
+    if -2**24 <= x <= 2**24: return float(x)
+    return math.copysign(single_of_ratio(abs(x), 1), x)
+
+def divide_by_zero(a, b):
+    # a / b for reals when b is zero
+    if a != a: return a
+    if a == 0: return DEFAULT_NAN
+    return math.copysign(math.inf, a) * math.copysign(1.0, b)
+
+CONVERSION_FUNCTIONS = (wrap_int, real_to_int, real_to_long, integer_to_float, single, float)
+# index into CONVERSION_FUNCTIONS by (from, to) C type; None where the value stays as it is
+CONVERSIONS = {
+    ('long long', 'int'): 0, ('float', 'int'): 1, ('double', 'int'): 1,
+    ('int', 'long long'): None, ('float', 'long long'): 2, ('double', 'long long'): 2,
+    ('int', 'float'): 3, ('long long', 'float'): 3, ('double', 'float'): 4,
+    ('int', 'double'): 5, ('long long', 'double'): 5, ('float', 'double'): None,
+}
+
+def convert(value, from_, to):
+    k = CONVERSIONS[from_, to] if from_ != to else None
+    return value if k is None else CONVERSION_FUNCTIONS[k](value)
+
+def unescape(text):
+    # the bytes of a C string literal with this text
+    def escape(m):
+        if m.group(1): return bytes([int(m.group(1), 8) & 0xFF])
+        if m.group(2): return bytes([int(m.group(2), 16) & 0xFF])
+        return ESCAPED.get(m.group(3), m.group(3))
+    return ESCAPES.sub(escape, text.encode('utf8'))
+
+def c_format(specifier, value):
+    # printf's output for one value; glibc writes the sign of a NaN
+    if value != value:
+        text = b'-nan' if math.copysign(1, value) < 0 else b'nan'
+        return text.upper() if specifier == b'%E' else text
+    return specifier % value
+
+def strtod(token, single_precision):
+    # the value strtod (or strtof) reads from the start of token, None if it reads nothing
+    sign, inf, nan, high, low, binary, whole, fraction, decimal = STRTOD.match(token).groups()
+    if inf: value = math.inf
+    elif nan: value = math.nan
+    elif high is not None:
+        digits = high + (low or b'')
+        n = int(digits, 16) if digits else 0
+        e = int(binary or 0) - 4 * len(low or b'')
+        value = ratio(n, 2, e, single_precision)
+    else:
+        digits = (whole or b'') + (fraction or b'')
+        if not digits: return None
+        e = int(decimal or 0) - len(fraction or b'')
+        if single_precision: value = ratio(int(digits), 10, e, True)
+        else: value = float((whole or b'0') + b'.' + (fraction or b'0') + b'e' + (decimal or b'0'))
+    return -value if sign == b'-' else value
+
+def ratio(n, base, e, single_precision):
+    # n * base**e rounded to a float or double
+    if n == 0: return 0.0
+    # far outside the range of a double either way
+    magnitude = n.bit_length() + e * (4 if base == 10 else 1)
+    if magnitude > 4000: return math.inf
+    if magnitude < -4000: return 0.0
+    n, d = (n * base**e, 1) if e >= 0 else (n, base**-e)
+    return single_of_ratio(n, d) if single_precision else double_of_ratio(n, d)
+
+class Reader:
+    # get's input, taken from a binary stream in large blocks and read the way scanf reads
+    # it, or runtime.READER with fast_input; flush is called whenever it has to wait for more
+    def __init__(self, stream, flush=None, fast_input=False):
+        self.read = getattr(stream, 'read1', stream.read)
+        self.flush = flush
+        self.fast_input = fast_input
+        self.data = b''
+        self.pos = 0
+        self.eof = False
+
+    def match(self, pattern):
+        # pattern matched at pos, with more input taken in until it ends before the data does
+        while True:
+            m = pattern.match(self.data, self.pos)
+            if m.end() < len(self.data) or self.eof: return m
+            if self.flush: self.flush()
+            chunk = self.read(READ_SIZE)
+            if isinstance(chunk, str): chunk = chunk.encode('utf8')
+            if not chunk: self.eof = True
+            else:
+                self.data = self.data[self.pos:] + chunk
+                self.pos = 0
+
+    def integer(self):
+        # a long long, or None
+        m = self.match(INTEGER)
+        self.pos = m.end()
+        digits = m.group(2).lstrip(b'0') or m.group(2)
+        if not digits: return None
+        if self.fast_input:
+            # the reader's unsigned arithmetic wraps around; 10**64 is a multiple of 2**64
+            n = int(digits[-64:]) % 2**64
+            if m.group(1) == b'-': n = -n % 2**64
+            return n - 2**64 if n > LONG_MAX else n
+        # scanf converts with strtol, which saturates
+        n = int(digits) if len(digits) < 25 else LONG_MAX + 1
+        if m.group(1) == b'-': n = -n
+        return min(max(n, LONG_MIN), LONG_MAX)
+
+    def int(self):
+        n = self.integer()
+        return None if n is None else wrap_int(n)
+
+    def long(self):
+        return self.integer()
+
+    def real(self, single_precision):
+        m = self.match(REAL)
+        self.pos = m.end()
+        token = m.group(1)[:TOKEN_SIZE]
+        return strtod(token, single_precision) if token else None
+
+    def float(self):
+        return self.real(True)
+
+    def double(self):
+        return self.real(False)
+
+class Label:
+    # a place in the code; uses are the words that jump to it before it's placed
+    __slots__ = ('at', 'uses')
+
+    def __init__(self):
+        self.at = None
+        self.uses = []
+
+class Code:
+    # ops holds the instructions and lines the source line of each of their words.
+    # registers is what the register file starts with, prints has (format, registers,
+    # pieces, specifiers) for each print and gets (C type, [(register, conversion)]) for
+    # each get.
+    def __init__(self, ops, lines, registers, prints, gets):
+        self.ops = ops
+        self.lines = lines
+        self.registers = registers
+        self.prints = prints
+        self.gets = gets
+
+    def run(self, stdin=None, stdout=None, fast_input=False):
+        # runs the program on stdin and stdout (the process's by default), returns its exit
+        # code; raises Trap where the C program would be stopped. fast_input reads input
+        # as the program generated with it would.
+        if stdout is None:
+            sys.stdout.flush()
+            stdout = sys.stdout
+        stdout = getattr(stdout, 'buffer', stdout)
+        stdin = getattr(sys.stdin if stdin is None else stdin, 'buffer', stdin)
+        if isinstance(stdout, io.TextIOBase):
+            # output captured as text
+            write = lambda data: stdout.write(data.decode('utf8', 'replace'))
+        else:
+            write = stdout.write
+        try:
+            return execute(self, Reader(stdin, stdout.flush, fast_input), write)
+        finally:
+            stdout.flush()
+
+class Compiler:
+    def __init__(self):
+        self.ops = array('i')
+        self.lines = array('i')
+        self.line = 0
+        self.registers = []
+        # name -> (register, C type)
+        self.variables = {}
+        # the names the C would have in scope, and those the current block declared
+        self.visible = set()
+        self.declared = []
+        # (C type, repr of the value) -> register
+        self.constants = {}
+        # registers for the values of subexpressions, and how many the current statement uses
+        self.temps = []
+        self.used = 0
+        self.prints = []
+        self.gets = []
+
+    def compile(self, program):
+        self.block(program.body)
+        self.emit(HALT)
+        return Code(self.ops, self.lines, self.registers, self.prints, self.gets)
+
+    # Code
+
+    def emit(self, op, *args):
+        self.ops.append(op)
+        self.ops.extend(args)
+        self.lines.extend([self.line] * (1 + len(args)))
+
+    def jump(self, op, label, *args):
+        self.emit(op, *args, -1)
+        if label.at is None: label.uses.append(len(self.ops) - 1)
+        else: self.ops[-1] = label.at
+
+    def place(self, label):
+        label.at = len(self.ops)
+        for use in label.uses: self.ops[use] = label.at
+
+    # Registers
+
+    def register(self, value):
+        self.registers.append(value)
+        return len(self.registers) - 1
+
+    def constant(self, value, ctype):
+        _key = (ctype, repr(value))
+        if _key not in self.constants: self.constants[_key] = self.register(value)
+        return self.constants[_key]
+
+    def temp(self):
+        if self.used == len(self.temps): self.temps.append(self.register(0))
+        self.used += 1
+        return self.temps[self.used - 1]
+
+    def declare(self, name, type_):
+        ctype = VAR_CTYPES[type_]
+        if name not in self.variables:
+            # C leaves it undefined until it's assigned
+            self.variables[name] = (self.register(0 if ctype in INT_LIMITS else 0.0), ctype)
+        self.visible.add(name)
+        self.declared.append(name)
+        return self.variables[name][0]
+
+    def variable(self, name):
+        if name not in self.visible:
+            raise CompileError("'" + name + "' is used on line " + str(self.line) + " outside the block it was declared in.")
+        return self.variables[name]
+
+    # Statements
+
+    def block(self, body):
+        # a C block: what it declares is out of scope after it
+        declared, self.declared = self.declared, []
+        for node in body:
+            self.used = 0
+            self.line = node.line or self.line
+            getattr(self, 'stmt_' + type(node).__name__)(node)
+        self.visible.difference_update(self.declared)
+        self.declared = declared
+
+    def stmt_Declare(self, node):
+        for name in node.names: self.declare(name, node.type)
+
+    def stmt_Let(self, node):
+        # the variable is in scope in its own initializer
+        register = self.declare(node.name, node.type)
+        self.value(node.value, VAR_CTYPES[node.type], register)
+
+    def stmt_Assign(self, node):
+        register, ctype = self.variable(node.name)
+        self.value(node.value, ctype, register)
+
+    def stmt_If(self, node):
+        orelse = Label()
+        self.branch(node.cond, orelse, False)
+        self.block(node.body)
+        if node.orelse is None:
+            self.place(orelse)
+            return
+        end = Label()
+        self.jump(JUMP, end)
+        self.place(orelse)
+        self.block(node.orelse)
+        self.place(end)
+
+    def stmt_While(self, node):
+        # the condition goes after the body, so each round takes one jump
+        body, test = Label(), Label()
+        self.jump(JUMP, test)
+        self.place(body)
+        self.block(node.body)
+        self.place(test)
+        self.line = node.line or self.line
+        self.branch(node.cond, body, True)
+
+    def stmt_Print(self, node):
+        # as codegen.stmt_Print: one printf format for the whole print
+        pieces = [b'']
+        args = []
+        specifiers = []
+        last = len(node.items) - 1
+        for i, item in enumerate(node.items):
+            if type(item) is Str:
+                pieces[-1] += unescape(item.value)
+            elif type(item) is Num and item.ctype in INT_LIMITS:
+                pieces[-1] += str(item.value).encode()
+            else:
+                specifiers.append(SPECIFIERS[item.type])
+                args.append(self.expr(item))
+                pieces.append(b'')
+            pieces[-1] += unescape(node.separator if i < last else node.end)
+        if not args:
+            if pieces[0]: self.emit(PRINT, self.add_print((pieces[0], (), None, None)))
+            return
+        _format = b''.join(piece.replace(b'%', b'%%') + specifier for piece, specifier in zip(pieces, specifiers)) + pieces[-1].replace(b'%', b'%%')
+        # only reals can be NaNs, which need c_format
+        reals = any(specifier != b'%d' for specifier in specifiers)
+        self.emit(PRINT, self.add_print((_format, tuple(args), pieces, specifiers if reals else None)))
+
+    def add_print(self, entry):
+        self.prints.append(entry)
+        return len(self.prints) - 1
+
+    def stmt_Get(self, node):
+        for name in node.new: self.declare(name, node.type)
+        ctype = GET_CTYPES[node.type]
+        targets = []
+        for name in node.names:
+            register, var_ctype = self.variable(name)
+            # a variable of another type gets the value converted (the C's scanf would
+            # store it as the wrong type)
+            k = CONVERSIONS[ctype, var_ctype] if ctype != var_ctype else None
+            targets.append((register, None if k is None else CONVERSION_FUNCTIONS[k]))
+        self.gets.append((ctype, targets))
+        self.emit(GET, len(self.gets) - 1)
+
+    # Expressions
+
+    def expr(self, node, dst=None):
+        # a register with the value of node in its own C type, computed into dst if given
+        t = type(node)
+        if t is Num: return self.move(self.constant(node.value, node.ctype), dst)
+        if t is Var: return self.move(self.variable(node.name)[0], dst)
+        if t is Unary:
+            if node.op == '+': return self.expr(node.operand, dst)
+            operand = self.expr(node.operand)
+            dst = self.temp() if dst is None else dst
+            self.emit(NEGATE[ctype_of(node)], dst, operand)
+            return dst
+        if t is BinOp:
+            ctype = ctype_of(node)
+            if (node.op, ctype) not in ARITHMETIC:
+                raise CompileError("Invalid operands to " + node.op + " on line " + str(self.line) + ": " + node.left.type + " and " + node.right.type)
+            left = self.value(node.left, ctype)
+            right = self.value(node.right, ctype)
+            dst = self.temp() if dst is None else dst
+            self.emit(ARITHMETIC[node.op, ctype], dst, left, right)
+            return dst
+        # a condition's truth value, 1 or 0
+        result = self.temp()
+        end = Label()
+        self.emit(MOVE, result, self.constant(1, 'int'))
+        self.branch(node, end, True)
+        self.emit(MOVE, result, self.constant(0, 'int'))
+        self.place(end)
+        return self.move(result, dst)
+
+    def value(self, node, ctype, dst=None):
+        # a register with the value of node converted to ctype
+        from_ = ctype_of(node)
+        if from_ == ctype: return self.expr(node, dst)
+        if type(node) is Num: return self.move(self.constant(convert(node.value, from_, ctype), ctype), dst)
+        k = CONVERSIONS[from_, ctype]
+        if k is None: return self.expr(node, dst)
+        src = self.expr(node)
+        dst = self.temp() if dst is None else dst
+        self.emit(CONVERT, dst, src, k)
+        return dst
+
+    def move(self, src, dst):
+        if dst is None or dst == src: return src
+        self.emit(MOVE, dst, src)
+        return dst
+
+    def branch(self, node, target, when):
+        # jumps to target when the condition node is true (when True) or false
+        t = type(node)
+        if t is Compare:
+            ctype = common_ctype(ctype_of(node.left), ctype_of(node.right))
+            left = self.value(node.left, ctype)
+            right = self.value(node.right, ctype)
+            self.jump(COMPARE_JUMPS[node.op][when], target, left, right)
+        elif t is Logical:
+            if (node.op == 'or') == when:
+                # either side decides
+                self.branch(node.left, target, when)
+                self.branch(node.right, target, when)
+            else:
+                # the left side may decide the other way
+                skip = Label()
+                self.branch(node.left, skip, not when)
+                self.branch(node.right, target, when)
+                self.place(skip)
+        elif t is Not:
+            self.branch(node.operand, target, not when)
+        else:
+            self.jump(JTRUE if when else JFALSE, target, self.expr(node))
+
+def compile_program(program):
+    # the Code of a nodes.Program; raises CompileError where the C compiler would fail
+    return Compiler().compile(program)
+
+def formatted(entry, values):
+    # the output of a print with a NaN among its values
+    _format, args, pieces, specifiers = entry
+    parts = []
+    for piece, specifier, value in zip(pieces, specifiers, values):
+        parts.append(piece)
+        parts.append(c_format(specifier, value))
+    parts.append(pieces[-1])
+    return b''.join(parts)
+
+def decode(code):
+    # the instructions as (op, a, b, c) tuples, jumps going to the index of their target,
+    # and the line of each
+    ops = code.ops
+    starts = []
+    pc = 0
+    while pc < len(ops):
+        starts.append(pc)
+        pc += SIZES[ops[pc]]
+    index = {start: i for i, start in enumerate(starts)}
+    program = []
+    for start in starts:
+        op = ops[start]
+        operands = ops[start + 1:start + SIZES[op]].tolist()
+        if op <= JUMP or op in (JTRUE, JFALSE): operands[-1] = index[operands[-1]]
+        program.append(tuple([op] + operands + [0] * (4 - SIZES[op])))
+    return program, [code.lines[start] for start in starts]
+
+def execute(code, reader, write):
+    # the dispatch loop; returns the exit code
+    program, lines = decode(code)
+    r = list(code.registers)
+    prints = code.prints
+    gets = [(getattr(reader, {'long long': 'long'}.get(ctype, ctype)), targets) for ctype, targets in code.gets]
+    scanf = not reader.fast_input
+    comparisons = COMPARISONS
+    jumps_when = JUMPS_WHEN
+    conversions = CONVERSION_FUNCTIONS
+    pack = _single.pack
+    unpack = _single.unpack
+    pc = 0
+    while True:
+        op, a, b, c = program[pc]
+        pc += 1
+        # tested in groups, the commonest first in each
+        if op <= MOD_I:
+            if op < JUMP:
+                if comparisons[op](r[a], r[b]) is jumps_when[op]: pc = c
+            elif op == ADD_I:
+                x = r[b] + r[c]
+                r[a] = x if -2147483648 <= x <= 2147483647 else wrap_int(x)
+            elif op == JUMP:
+                pc = a
+            elif op == SUB_I:
+                x = r[b] - r[c]
+                r[a] = x if -2147483648 <= x <= 2147483647 else wrap_int(x)
+            elif op == MOVE:
+                r[a] = r[b]
+            elif op == MUL_I:
+                x = r[b] * r[c]
+                r[a] = x if -2147483648 <= x <= 2147483647 else wrap_int(x)
+            else:
+                x = r[b]
+                y = r[c]
+                if x >= 0 and y > 0: r[a] = x // y if op == DIV_I else x % y
+                elif y == 0 or (y == -1 and x == -2147483648): raise Trap(lines[pc - 1])
+                else: r[a] = c_divmod(x, y)[op == MOD_I]
+        elif op <= DIV_D:
+            if op == ADD_D: r[a] = r[b] + r[c]
+            elif op == MUL_D: r[a] = r[b] * r[c]
+            elif op == SUB_D: r[a] = r[b] - r[c]
+            else:
+                y = r[c]
+                r[a] = r[b] / y if y else divide_by_zero(r[b], y)
+        elif op <= MOD_L:
+            if op == ADD_L: x = r[b] + r[c]
+            elif op == SUB_L: x = r[b] - r[c]
+            elif op == MUL_L: x = r[b] * r[c]
+            else:
+                x = r[b]
+                y = r[c]
+                if y == 0 or (y == -1 and x == -9223372036854775808): raise Trap(lines[pc - 1])
+                x = c_divmod(x, y)[op == MOD_L]
+            r[a] = x if -9223372036854775808 <= x <= 9223372036854775807 else wrap_long(x)
+        elif op <= DIV_F:
+            x = r[b]
+            y = r[c]
+            if op == ADD_F: x += y
+            elif op == MUL_F: x *= y
+            elif op == SUB_F: x -= y
+            else: x = x / y if y else divide_by_zero(x, y)
+            try: r[a] = unpack(pack(x))[0]
+            except OverflowError: r[a] = math.copysign(math.inf, x)
+        elif op == CONVERT:
+            r[a] = conversions[c](r[b])
+        elif op == PRINT:
+            entry = prints[a]
+            args = entry[1]
+            if not args:
+                write(entry[0])
+            else:
+                values = tuple([r[i] for i in args])
+                if entry[3] is not None and any(v != v for v in values): write(formatted(entry, values))
+                else: write(entry[0] % values)
+        elif op == NEG_I:
+            x = -r[b]
+            r[a] = x if x != 2147483648 else -2147483648
+        elif op == NEG_R:
+            r[a] = -r[b]
+        elif op == NEG_L:
+            x = -r[b]
+            r[a] = x if x != 9223372036854775808 else -9223372036854775808
+        elif op == JTRUE:
+            if r[a]: pc = b
+        elif op == JFALSE:
+            if not r[a]: pc = b
+        elif op == GET:
+            read, targets = gets[a]
+            for register, conversion in targets:
+                value = read()
+                if value is not None: r[register] = value if conversion is None else conversion(value)
+                # scanf gives up on the rest at the first value it can't convert
+                elif scanf: break
+        else:
+            return 0